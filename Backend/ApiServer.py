@@ -0,0 +1,251 @@
+"""
+Local text-query API server for Jarvis.
+
+Headless mode only listens through SpeechRecognition(). This server accepts
+text queries over HTTP on localhost and runs them through the same pipeline
+as MainExecution: FirstLayerDMMStream feeding the concurrent intent dispatcher with
+ChatBot / RealtimeSearchEngine / Automation / image generation. Requests are
+served on separate threads, and answers are streamed back while the model
+generates them.
+
+USAGE:
+    python -m Backend.ApiServer [--host 127.0.0.1] [--port 8765] [--stand-ins] [--allow-automation]
+
+    --stand-ins         use the offline Groq/Cohere/search stand-ins (no keys or network);
+                        they are installed before any backend is imported
+    --allow-automation  execute automation and image tasks (open/close/play, system
+                        shutdown, ...). Without it they are only reported (dry run).
+
+SECURITY:
+    Any web page open in the user's browser can send requests to localhost, so
+    POST /query only accepts Content-Type: application/json (which a page
+    cannot send cross-origin without a CORS preflight this server never
+    answers) and refuses every request carrying an Origin header with 403.
+    Set API_SERVER_TOKEN in config.py to also require the header
+    "Authorization: Bearer <token>".
+
+ENDPOINTS:
+    GET  /health   {"status": "ok"}
+    GET  /trace    p50/p95/p99 latency per pipeline stage (see Backend.Tracing)
+    GET  /trace/spans  the trace ring buffer as JSON lines
+    GET  /router   model routing stats and the latest decisions (see Backend.ModelRouter)
+    POST /query    body {"query": "..."}; the response is a stream of JSON lines
+                   (application/x-ndjson), one event per line:
+                   {"event": "decision", "tasks": [...]}
+                   {"event": "token", "text": "..."}      answer text as generated
+                   {"event": "intent", "kind": ..., "ok": ..., "error": ..., "elapsed": ...}
+                   {"event": "done", "answer": "...", "elapsed": ..., "turn": ...}
+"""
+
+import app_paths  # Must be imported before backend modules to set up correct file paths
+import argparse
+import asyncio
+import hmac
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import config  # Import centralized configuration
+from Backend.Dispatcher import DispatchDecision, DispatchDecisionStream
+from Backend import Tracing
+from Backend import ModelRouter
+
+DefaultPort = 8765
+Token = getattr(config, "API_SERVER_TOKEN", "")
+
+
+def RunQuery(Query, Emit, DryRun=True):
+    """Run one text query through the assistant pipeline, reporting progress through Emit(event)."""
+    # Imported here, not at the top, so --stand-ins can patch the client libraries first.
+    from Backend.Model import FirstLayerDMMStream
+    from Backend.Chatbot import ChatBotStream
+    from Backend.RealtimeSearchEngine import RealtimeSearchEngineStream
+    from Backend.Automation import Automation
+    from Backend.ImageGeneration import SubmitImageJobs
+
+    started = time.perf_counter()
+    answer = []
+    Turn = Tracing.StartTurn()
+    Tracing.Mark("query_received")
+
+    def Answering(StreamResponder):
+        def Handler(Question):
+            for chunk in StreamResponder(Question):
+                answer.append(chunk)
+                Emit({"event": "token", "text": chunk})
+            return "".join(answer)
+        return Handler
+
+    def RunAutomation(Commands):
+        if not DryRun:
+            asyncio.run(Automation(list(Commands)))
+        return Commands
+
+    def QueueImages(Prompts):
+        if DryRun:
+            return Prompts
+        return [job.id for job in SubmitImageJobs(Prompts)]
+
+    Handlers = {
+        "general": Answering(ChatBotStream),
+        "realtime": Answering(RealtimeSearchEngineStream),
+        "automation": RunAutomation,
+        "image": QueueImages,
+        "exit": lambda _: "exit is ignored by the API server",
+    }
+
+    def DecisionTasks():
+        with Tracing.Span("dmm"):
+            for Task in FirstLayerDMMStream(Query):
+                Tracing.Mark("first_task")
+                yield Task
+
+    def OnDecision(Decision):
+        Emit({"event": "decision", "tasks": Decision})
+
+    with Tracing.Span("dispatch"):
+        # Automation and image tasks start while the rest of the decision is generated.
+        Results = asyncio.run(DispatchDecisionStream(DecisionTasks(), Handlers, OnDecision=OnDecision))
+        if not Results:
+            # Nothing recognisable in the decision: answer the raw query, like MainExecution.
+            Results = asyncio.run(DispatchDecision([f"general {Query}"], Handlers))
+
+    for Result in Results:
+        Emit({"event": "intent", "kind": Result.kind, "ok": Result.ok, "error": Result.error,
+              "elapsed": round(Result.elapsed, 4)})
+
+    Emit({"event": "done", "answer": "".join(answer).strip(), "elapsed": round(time.perf_counter() - started, 4),
+          "turn": Turn})
+
+
+class QueryRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Needed for chunked streaming responses.
+    server_version = "JarvisAPI/1.0"
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/trace":
+            self._send_json(200, Tracing.Summary())
+        elif self.path == "/router":
+            self._send_json(200, {"stats": ModelRouter.GetStats(), "decisions": ModelRouter.GetDecisions()})
+        elif self.path == "/trace/spans":
+            data = "".join(json.dumps(record) + "\n" for record in Tracing.Records()).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _refusal(self):
+        """(status, error) if this POST must be refused, else None."""
+        if self.headers.get("Origin") is not None:
+            return 403, "requests from web pages are not accepted"
+        if Token:
+            given = self.headers.get("Authorization", "")
+            if not hmac.compare_digest(given.encode("utf-8"), f"Bearer {Token}".encode("utf-8")):
+                return 401, "missing or wrong API token"
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            return 415, "Content-Type must be application/json"
+        return None
+
+    def do_POST(self):
+        if self.path != "/query":
+            self._send_json(404, {"error": "not found"})
+            return
+        refusal = self._refusal()
+        if refusal is not None:
+            self.close_connection = True  # The unread body must not be parsed as the next request.
+            self._send_json(refusal[0], {"error": refusal[1]})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            Query = str(json.loads(self.rfile.read(length) or b"{}").get("query", "")).strip()
+        except (ValueError, AttributeError):
+            self._send_json(400, {"error": "body must be JSON like {\"query\": \"...\"}"})
+            return
+        if not Query:
+            self._send_json(400, {"error": "query is empty"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        write_lock = threading.Lock()  # Intents emit from several worker threads.
+        connected = [True]
+
+        def Emit(event):
+            data = (json.dumps(event) + "\n").encode("utf-8")
+            with write_lock:
+                if not connected[0]:
+                    return  # Client went away; keep running so the turn is still saved.
+                try:
+                    self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                    self.wfile.flush()
+                except OSError:
+                    connected[0] = False
+
+        try:
+            RunQuery(Query, Emit, DryRun=self.server.dry_run)
+        except Exception as e:
+            print(f"[API] Error while answering '{Query}': {e}")
+            Emit({"event": "error", "error": str(e)})
+
+        with write_lock:
+            if connected[0]:
+                try:
+                    self.wfile.write(b"0\r\n\r\n")  # End of chunked body.
+                except OSError:
+                    pass
+
+    def log_message(self, format, *args):
+        print(f"[API] {self.address_string()} {format % args}")
+
+
+def Serve(host="127.0.0.1", port=DefaultPort, dry_run=True):
+    """Serve text queries until interrupted; automation and image tasks only run with dry_run=False."""
+    server = ThreadingHTTPServer((host, port), QueryRequestHandler)
+    server.daemon_threads = True
+    server.dry_run = dry_run
+    print(f"[API] Jarvis text API listening on http://{host}:{port} (POST /query)")
+    if dry_run:
+        print("[API] Automation and image tasks are reported, not executed (--allow-automation runs them)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[API] Shutting down...")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Jarvis local text-query API server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=DefaultPort)
+    parser.add_argument("--stand-ins", action="store_true",
+                        help="Use offline stand-in LLM clients instead of Groq/Cohere")
+    parser.add_argument("--allow-automation", action="store_true",
+                        help="Execute automation and image tasks instead of only reporting them")
+    args = parser.parse_args()
+
+    if args.stand_ins:
+        # Before any backend import: the backends build their clients when imported.
+        from Backend.StandIns import InstallLibraryStandIns
+        InstallLibraryStandIns()
+        print("[API] Using offline stand-in LLM clients")
+
+    Serve(args.host, args.port, dry_run=not args.allow_automation)
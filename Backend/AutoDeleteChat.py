@@ -4,21 +4,16 @@ Deletes chat messages older than 7 days when enabled in preferences.
 """
 
 import json
-import os
 from datetime import datetime, timedelta
 import app_paths  # Import for correct file paths
+from Backend import ChatLog  # Append-only chat log store
+from Backend import Settings  # Cached profile and preferences
 
-CHATLOG_PATH = app_paths.get_data_path("ChatLog.json")
-PREFERENCES_PATH = app_paths.get_data_path("Preferences.json")
 LAST_CLEANUP_PATH = app_paths.get_data_path("LastCleanup.json")
 
 def load_preferences():
     """Load user preferences."""
-    try:
-        with open(PREFERENCES_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {"auto_delete_chat": False}
+    return Settings.Preferences.Get()
 
 def should_run_cleanup():
     """Check if we should run cleanup (once per day)."""
@@ -43,7 +38,7 @@ def save_cleanup_timestamp():
         print(f"Error saving cleanup timestamp: {e}")
 
 def delete_old_messages():
-    """Delete chat messages older than 7 days from ChatLog.json"""
+    """Delete chat messages older than 7 days from the chat log"""
     try:
         # Load preferences
         prefs = load_preferences()
@@ -57,15 +52,7 @@ def delete_old_messages():
             return
         
         # Load chat log
-        if not os.path.exists(CHATLOG_PATH):
-            return
-        
-        with open(CHATLOG_PATH, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            if not content:
-                save_cleanup_timestamp()
-                return
-            messages = json.loads(content)
+        messages = ChatLog.All()
         
         if not messages:
             save_cleanup_timestamp()
@@ -100,9 +87,9 @@ def delete_old_messages():
         elif not has_timestamps:
             cleaned_messages = messages
         
-        # Save cleaned messages
-        with open(CHATLOG_PATH, "w", encoding="utf-8") as f:
-            json.dump(cleaned_messages, f, indent=4)
+        # Save cleaned messages (only rewrite the log if something was removed)
+        if len(cleaned_messages) != len(messages):
+            ChatLog.Replace(cleaned_messages)
         
         # Save cleanup timestamp
         save_cleanup_timestamp()
@@ -120,14 +107,7 @@ def add_timestamps_to_messages():
     Called when saving new messages to ensure future messages have timestamps.
     """
     try:
-        if not os.path.exists(CHATLOG_PATH):
-            return
-        
-        with open(CHATLOG_PATH, "r", encoding="utf-8") as f:
-            content = f.read().strip()
-            if not content:
-                return
-            messages = json.loads(content)
+        messages = ChatLog.All()
         
         if not messages:
             return
@@ -140,8 +120,7 @@ def add_timestamps_to_messages():
                 modified = True
         
         if modified:
-            with open(CHATLOG_PATH, "w", encoding="utf-8") as f:
-                json.dump(messages, f, indent=4)
+            ChatLog.Replace(messages)
     
     except Exception as e:
         print(f"[Auto-Delete] Timestamp addition error: {e}")
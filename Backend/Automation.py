@@ -4,7 +4,8 @@ from webbrowser import open as webopen  # Import web browser functionality.
 # pywhatkit is lazy-imported to avoid its internet check at import time.
 from bs4 import BeautifulSoup  # Import BeautifulSoup for parsing HTML content.
 from rich import print  # Import rich for styled console output.
-from groq import Groq  # Import Groq for AI chat functionalities.
+from Backend import LLMProvider  # Shared, rate-limited Groq client for AI content writing.
+from Backend import ModelRouter  # Picks the content-writing model.
 import webbrowser  # Import webbrowser for opening URLs.
 import subprocess  # Import subprocess for interacting with system processes.
 import requests  # Import requests for making HTTP requests.
@@ -13,8 +14,8 @@ import asyncio  # Import asyncio for asynchronous programming.
 import datetime  # Import datetime for timestamps.
 import os  # Import os for operating system functionalities.
 
-# Import TextToSpeech for verbal acknowledgments
-from Backend.TextToSpeech import TextToSpeech
+# Import SpeakLater for verbal acknowledgments (queued, so commands start at once)
+from Backend.TextToSpeech import SpeakLater
 import config  # Import centralized configuration
 
 # Load configuration from config.py
@@ -29,8 +30,8 @@ classes = ["zCubwf", "hgKElc", "LTKOO sY7ric", "Z0LcW", "gsrt vk_bk FzvWSD YwPhn
 # Define a user-agent for making web requests.
 useragent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.75 Safari/537.36"
 
-# Initialize the Groq client with the API key.
-client = Groq(api_key=GroqAPIKey)
+# Content writing is user-requested: full priority on the shared Groq client.
+client = LLMProvider.Client(LLMProvider.INTERACTIVE)
 
 # Initialize professional responses for user interactions.
 professional_responses = [
@@ -73,7 +74,7 @@ def Content(Topic):
         messages.append({"role": "user", "content": f"{prompt}"})  # Add the user's prompt to messages.
 
         completion = client.chat.completions.create(
-            model="llama-3.3-70b-versatile",  # Use the versatile model for high-quality content generation.
+            model=ModelRouter.Route(prompt, "content")[0],  # Usually the versatile model, unless it is too slow right now.
             messages=systemChatBot + messages,  # Include system instructions and chat history.
             max_tokens=2048,  # Limit the maximum tokens in the response.
             temperature=0.7,  # Adjust response randomness.
@@ -359,7 +360,7 @@ async def TranslateAndExecute(commands: list[str]):
                 app_name = command.removeprefix("open ").strip()
                 acknowledgment = f"Ok sir, I will open {app_name}."
                 print(f"[AUTOMATION] Processing open command: '{command}'")  # Debug: Show command being processed
-                TextToSpeech(acknowledgment)  # Speak acknowledgment
+                SpeakLater(acknowledgment)  # Speak acknowledgment without waiting for it
                 fun = asyncio.to_thread(OpenApp, app_name)  # Schedule app opening.
                 funcs.append(fun)
 
@@ -372,35 +373,35 @@ async def TranslateAndExecute(commands: list[str]):
         elif command.startswith("close "):  # Handle "close" commands.
             app_name = command.removeprefix("close ").strip()
             acknowledgment = f"Ok sir, closing {app_name}."
-            TextToSpeech(acknowledgment)  # Speak acknowledgment
+            SpeakLater(acknowledgment)  # Speak acknowledgment without waiting for it
             fun = asyncio.to_thread(CloseApp, app_name)  # Schedule app closing.
             funcs.append(fun)
 
         elif command.startswith("play "):  # Handel "play" commands.
             video_query = command.removeprefix("play ").strip()
             acknowledgment = f"Ok sir, playing {video_query} on YouTube."
-            TextToSpeech(acknowledgment)  # Speak acknowledgment
+            SpeakLater(acknowledgment)  # Speak acknowledgment without waiting for it
             fun = asyncio.to_thread(PlayYouTube, video_query)  # Schedule YouTube playback.
             funcs.append(fun)
 
         elif command.startswith("content "):  # Handel "content" commands.
             content_request = command.removeprefix("content ").strip()
             acknowledgment = f"Ok sir, I'll write {content_request} for you."
-            TextToSpeech(acknowledgment)  # Speak acknowledgment
+            SpeakLater(acknowledgment)  # Speak acknowledgment without waiting for it
             fun = asyncio.to_thread(Content, content_request)  # Schedule content creation.
             funcs.append(fun)
 
         elif command.startswith("google search "):  # Handle "google search" commands.
             search_query = command.removeprefix("google search ").strip()
             acknowledgment = f"Ok sir, searching Google for {search_query}."
-            TextToSpeech(acknowledgment)  # Speak acknowledgment
+            SpeakLater(acknowledgment)  # Speak acknowledgment without waiting for it
             fun = asyncio.to_thread(GoogleSearch, search_query)  # Schedule Google search.
             funcs.append(fun)
 
         elif command.startswith("youtube search "): # Handle "youtube search" commands.
             search_query = command.removeprefix("youtube search ").strip()
             acknowledgment = f"Ok sir, searching YouTube for {search_query}."
-            TextToSpeech(acknowledgment)  # Speak acknowledgment
+            SpeakLater(acknowledgment)  # Speak acknowledgment without waiting for it
             fun = asyncio.to_thread(YouTubeSearch, search_query)  # Schedule YouTube search.
             funcs.append(fun)
 
@@ -422,13 +423,13 @@ async def TranslateAndExecute(commands: list[str]):
             else:
                 acknowledgment = f"Ok sir, executing {system_action} command."
             
-            TextToSpeech(acknowledgment)  # Speak acknowledgment
+            SpeakLater(acknowledgment)  # Speak acknowledgment without waiting for it
             fun = asyncio.to_thread(System, system_action)  # Schedule system command.
             funcs.append(fun)
 
         elif command == "skip ads":  # Handle "skip ads" command.
             acknowledgment = f"Ok sir, I'll skip the ads for you."
-            TextToSpeech(acknowledgment)  # Speak acknowledgment
+            SpeakLater(acknowledgment)  # Speak acknowledgment without waiting for it
             fun = asyncio.to_thread(SkipYouTubeAds)  # Schedule YouTube ad skipping.
             funcs.append(fun)
 
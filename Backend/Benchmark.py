@@ -0,0 +1,250 @@
+"""
+Offline end-to-end benchmark for the Jarvis voice pipeline.
+
+Replays a corpus of queries through Main.MainExecution with every remote or
+hardware dependency replaced by a deterministic stand-in (Backend.StandIns):
+the Groq client, cohere.Client, edge_tts.Communicate, pygame's mixer, Google
+search and the Selenium speech-recognition browser. Each stand-in has a
+configurable latency, so runs are repeatable and need no API keys,
+microphone, speakers or browser.
+
+Per-stage timings come from Backend.Tracing. Results are written as JSON
+(one file per run, Data/Benchmark-<timestamp>.json by default) so runs can be
+compared to catch regressions. Automation, image and exit tasks are recorded
+but not executed. The chat log and LearningMemory.json are reset before every
+turn and restored when the run ends. The FirstLayerDMM decision cache starts
+empty, so repeated rounds (--repeat) show its effect.
+
+USAGE:
+    python -m Backend.Benchmark [--corpus queries.txt] [--repeat 3] [--out results.json]
+                                [--llm-first-token 0.3] [--llm-token 0.01]
+                                [--dmm-first-token 0.2] [--dmm-token 0.005]
+                                [--stt 0.2] [--tts 0.15] [--search 0.3] [--playback-cps 0]
+                                [--llm-rpm 0] [--voice-short]
+
+The corpus is a text file with one query per line (blank lines and lines
+starting with # are skipped). Without --corpus a built-in mix is used.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# Built-in corpus: a mix of the decision kinds FirstLayerDMM produces.
+DefaultCorpus = [
+    "How are you today?",
+    "What is python programming language?",
+    "Tell me a fun fact about space.",
+    "What is today's news?",
+    "Who is the current prime minister of India?",
+    "Open chrome.",
+    "Play let her go.",
+    "Open notepad and tell me a joke.",
+    "Generate image of a lion in the snow.",
+    "Write a sick leave letter.",
+]
+
+# Data files the pipeline writes; restored after the run.
+SandboxedFiles = ["ChatLog.jsonl", "ChatLog.idx", "ChatSummary.json", "LearningMemory.json", "LearningQueue.jsonl",
+                  "LearningQueue.failed.jsonl", "DecisionCache.json", "DecisionLog.jsonl"]
+
+
+def LoadCorpus(path=None):
+    if path is None:
+        return list(DefaultCorpus)
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith("#")]
+
+
+def _snapshot(paths):
+    saved = {}
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                saved[path] = f.read()
+        except FileNotFoundError:
+            saved[path] = None
+    return saved
+
+
+def _restore(saved):
+    for path, data in saved.items():
+        if data is None:
+            if os.path.exists(path):
+                os.remove(path)
+        else:
+            with open(path, "wb") as f:
+                f.write(data)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _turn_timings(records):
+    """Collapse one turn's trace records into {"stages": {name: ms}, "marks": {name: ms}}."""
+    stages, marks = {}, {}
+    for record in records:
+        if record["kind"] == "span":
+            stages[record["name"]] = round(stages.get(record["name"], 0.0) + record["duration_ms"], 3)
+        elif record.get("offset_ms") is not None and record["name"] != "query_received":
+            marks[record["name"]] = record["offset_ms"]
+    return {"stages": stages, "marks": marks}
+
+
+def RunBenchmark(Corpus, Repeat=1, RequestsPerMinute=0, VoiceShort=False, **Latencies):
+    """
+    Install the stand-ins, import Main in headless mode and replay the corpus
+    `Repeat` times. RequestsPerMinute sets the shared Groq rate limit (0 = off);
+    VoiceShort turns on Main's short spoken answers (Backend.VoiceAnswer).
+    Returns the results dictionary.
+    """
+    from Backend.StandIns import InstallLibraryStandIns
+    Driver = InstallLibraryStandIns(**Latencies)
+
+    sys.argv = [sys.argv[0], "--headless"]  # Main parses its arguments on import.
+    import app_paths
+    import Main
+    from Backend import ContextBuilder, LLMProvider, ModelRouter, Registry, Resilience, Tracing
+    LLMProvider.SetRateLimit(RequestsPerMinute)
+    Main.VoiceShortAnswers = VoiceShort
+    Registry.WarmUp().join()  # Keep backend import time out of the first turn.
+
+    # Record automation, image and exit tasks instead of performing them.
+    Executed = []
+    for kind in ("automation", "image", "exit"):
+        Main.IntentHandlers[kind] = lambda payload, kind=kind: Executed.append((kind, payload)) or payload
+
+    Saved = _snapshot([app_paths.get_data_path(name) for name in SandboxedFiles])
+    Model = Registry.Get("model")
+    Learning = Registry.Get("learning")
+    if Model.Cache is not None:
+        Model.Cache.Clear()  # Start cold; the user's cache file is restored afterwards.
+    Turns = []
+    Started = time.perf_counter()
+    try:
+        for Round in range(Repeat):
+            for Query in Corpus:
+                _restore({path: data for path, data in Saved.items()
+                          if not path.endswith("DecisionCache.json")})  # Same chat history and learnings every turn.
+                del Executed[:]
+                Driver.Say(Query)
+
+                Error = None
+                try:
+                    Main.MainExecution()
+                except Exception as e:
+                    Error = f"{type(e).__name__}: {e}"
+                Turn = Tracing.CurrentTurn()
+
+                Timings = _turn_timings(Tracing.Records(Turn))
+                Turns.append({
+                    "round": Round,
+                    "query": Query,
+                    "turn_ms": Timings["stages"].get("turn"),
+                    "after_stt_ms": round(Timings["stages"].get("turn", 0.0) - Timings["stages"].get("stt", 0.0), 3),
+                    "stages": Timings["stages"],
+                    "marks": Timings["marks"],
+                    "executed": [list(item) for item in Executed],
+                    "error": Error,
+                })
+    finally:
+        Learning.flush_learning_queue(30)  # Finish background learning before its files are restored.
+        Model.FlushDecisionCache()  # Likewise for decision cache writes still waiting for their timer.
+        _restore(Saved)
+    Wall = time.perf_counter() - Started
+
+    EndToEnd = [Turn["after_stt_ms"] for Turn in Turns if Turn["error"] is None]
+    return {
+        "benchmark": "jarvis-pipeline",
+        "version": 1,
+        "started": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "latencies": Latencies,
+        "repeat": Repeat,
+        "requests_per_minute": RequestsPerMinute,
+        "voice_short_answers": VoiceShort,
+        "llm_limiter": LLMProvider.GetStats(),
+        "llm_resilience": Resilience.GetStats(),
+        "model_router": ModelRouter.GetStats(),
+        "decisions": Model.GetDecisionStats(),
+        "decision_cache": Model.GetDecisionCacheStats(),
+        "context_tokens": ContextBuilder.GetUsage(),
+        "learning_queue": Learning.get_learning_queue_stats(),
+        "voice_answers": Registry.Get("voice").GetVoiceAnswerStats() if VoiceShort else None,
+        "summary": {
+            "turns": len(Turns),
+            "errors": sum(1 for Turn in Turns if Turn["error"]),
+            "wall_seconds": round(Wall, 3),
+            "turns_per_minute": round(len(Turns) / Wall * 60, 2) if Wall else None,
+            "end_to_end_ms": {
+                "p50": Tracing.Percentile(EndToEnd, 50),
+                "p95": Tracing.Percentile(EndToEnd, 95),
+                "p99": Tracing.Percentile(EndToEnd, 99),
+                "max": max(EndToEnd) if EndToEnd else None,
+            },
+            "stages": Tracing.Summary(),
+        },
+        "turns": Turns,
+    }
+
+
+def PrintSummary(Results):
+    Summary = Results["summary"]
+    print("\n" + "=" * 70)
+    print(f"JARVIS BENCHMARK  {Summary['turns']} turns, {Summary['errors']} errors, "
+          f"{Summary['wall_seconds']}s ({Summary['turns_per_minute']} turns/min)")
+    EndToEnd = Summary["end_to_end_ms"]
+    print(f"end-to-end after STT: p50 {EndToEnd['p50']} ms  p95 {EndToEnd['p95']} ms  p99 {EndToEnd['p99']} ms")
+    print(f"{'stage':<18}{'count':>7}{'p50 ms':>11}{'p95 ms':>11}{'p99 ms':>11}")
+    for name, stats in Summary["stages"].items():
+        print(f"{name:<18}{stats['count']:>7}{stats['p50']:>11.1f}{stats['p95']:>11.1f}{stats['p99']:>11.1f}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline Jarvis pipeline benchmark")
+    parser.add_argument("--corpus", help="Text file with one query per line (default: built-in mix)")
+    parser.add_argument("--repeat", type=int, default=1, help="How many times to replay the corpus")
+    parser.add_argument("--out", help="Results file (default: Data/Benchmark-<timestamp>.json)")
+    parser.add_argument("--llm-first-token", type=float, default=0.3, help="Groq time to first token (s)")
+    parser.add_argument("--llm-token", type=float, default=0.01, help="Groq time per further token (s)")
+    parser.add_argument("--dmm-first-token", type=float, default=0.2, help="Cohere time to first token (s)")
+    parser.add_argument("--dmm-token", type=float, default=0.005, help="Cohere time per further token (s)")
+    parser.add_argument("--stt", type=float, default=0.2, help="Speech recognition delay per command (s)")
+    parser.add_argument("--tts", type=float, default=0.15, help="edge-tts synthesis time per call (s)")
+    parser.add_argument("--search", type=float, default=0.3, help="Google search time (s)")
+    parser.add_argument("--llm-rpm", type=int, default=0,
+                        help="Shared Groq rate limit in requests/minute (default 0 = unlimited)")
+    parser.add_argument("--playback-cps", type=float, default=0.0,
+                        help="Simulated speaking rate in characters/second (0 = instant playback)")
+    parser.add_argument("--voice-short", action="store_true",
+                        help="Speak short summaries while the detailed answer is generated (VOICE_SHORT_ANSWERS)")
+    args = parser.parse_args()
+
+    Results = RunBenchmark(
+        LoadCorpus(args.corpus), Repeat=args.repeat, RequestsPerMinute=args.llm_rpm, VoiceShort=args.voice_short,
+        llm_first_token=args.llm_first_token, llm_token=args.llm_token,
+        dmm_first_token=args.dmm_first_token, dmm_token=args.dmm_token,
+        stt_latency=args.stt, tts_latency=args.tts, search_latency=args.search,
+        playback_cps=args.playback_cps,
+    )
+
+    import app_paths
+    OutPath = args.out or app_paths.get_data_path(f"Benchmark-{datetime.datetime.now():%Y%m%d-%H%M%S}.json")
+    with open(OutPath, "w", encoding="utf-8") as f:
+        json.dump(Results, f, indent=4)
+
+    PrintSummary(Results)
+    print(f"Results written to {OutPath}")
@@ -0,0 +1,235 @@
+"""
+Append-only chat log store for Jarvis.
+
+ChatLog.json used to be loaded whole, extended by two messages and dumped
+again with indent=4 on every turn, so saving a turn cost O(history). The
+conversation now lives in Data/ChatLog.jsonl, one message object per line,
+and is only ever appended to. A sidecar offset index (Data/ChatLog.idx,
+one 8-byte little-endian start offset per message) lets Tail(n) and
+Read(start, stop) seek straight to the messages they need.
+
+Appending a turn is one write to each file, whatever the length of the
+history. Rewrites (auto-delete, "delete chat history") build new files and
+swap them in with os.replace. A torn last line from a crash is ignored and
+overwritten by the next append, and an index that is missing or behind the
+log is rebuilt from the log.
+
+The first time the store opens, an existing Data/ChatLog.json is imported
+and renamed to ChatLog.json.migrated.
+
+USAGE:
+    from Backend import ChatLog
+    ChatLog.Append([{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello"}])
+    recent = ChatLog.Tail(20)
+    everything = ChatLog.All()
+
+    python -m Backend.ChatLog      # message count and file sizes
+"""
+
+import json
+import os
+import threading
+from array import array
+import app_paths  # Import for correct file paths
+
+LOG_PATH = app_paths.get_data_path("ChatLog.jsonl")
+INDEX_PATH = app_paths.get_data_path("ChatLog.idx")
+LEGACY_PATH = app_paths.get_data_path("ChatLog.json")
+
+
+def _encode(message):
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+class ChatLogStore:
+    """JSONL message log with a persisted offset index."""
+
+    def __init__(self, path=LOG_PATH, index_path=INDEX_PATH, legacy_path=LEGACY_PATH):
+        self.path = path
+        self.index_path = index_path
+        self.legacy_path = legacy_path
+        self.offsets = array("Q")  # Start offset of every complete message line.
+        self.end = 0  # Offset just past the last complete line.
+        self.signature = None  # (size, mtime_ns) of the log when the index was last synced.
+        self.lock = threading.RLock()
+        with self.lock:
+            self._migrate()
+            self._sync()
+
+    # ------------------------------------------------------------ index upkeep
+
+    def _migrate(self):
+        """Import the legacy ChatLog.json once."""
+        if os.path.exists(self.path) or not self.legacy_path or not os.path.exists(self.legacy_path):
+            return
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                content = f.read()
+            messages = json.loads(content) if content.strip() else []
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not import {self.legacy_path}: {e}")
+            return
+        self._write_all(messages)
+        os.replace(self.legacy_path, self.legacy_path + ".migrated")
+        print(f"[INFO] Imported {len(messages)} chat messages into {self.path}")
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _sync(self):
+        """Bring the in-memory index up to date if the log changed behind our back."""
+        signature = self._stat()
+        if signature is not None and signature == self.signature:
+            return
+        if signature is None:
+            open(self.path, "ab").close()
+            signature = self._stat()
+
+        # Start from the saved index, keeping only offsets that still fit in the log.
+        offsets = array("Q")
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+            offsets.frombytes(data[:len(data) - len(data) % offsets.itemsize])
+        except FileNotFoundError:
+            pass
+        size = signature[0]
+        while offsets and offsets[-1] >= size:
+            offsets.pop()
+
+        # Re-scan from the last indexed message: it may have been torn or followed by unindexed lines.
+        rebuilt = False
+        with open(self.path, "rb") as f:
+            position = offsets.pop() if offsets else 0
+            if position:
+                f.seek(position - 1)
+                if f.read(1) != b"\n":
+                    offsets, position = array("Q"), 0  # The index belongs to another log: rebuild it.
+                    rebuilt = True
+            f.seek(position)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Torn last line; the next append overwrites it.
+                offsets.append(position)
+                position += len(line)
+
+        self.offsets = offsets
+        self.end = position
+        self._save_index(force=rebuilt)
+        self.signature = self._stat()
+
+    def _save_index(self, force=False):
+        try:
+            saved = os.path.getsize(self.index_path)
+        except OSError:
+            saved = -1
+        if force or saved != len(self.offsets) * self.offsets.itemsize:
+            with open(self.index_path, "wb") as f:
+                self.offsets.tofile(f)
+
+    def _write_all(self, messages):
+        """Replace the log and its index with `messages`."""
+        offsets = array("Q")
+        position = 0
+        with open(self.path + ".tmp", "wb") as f:
+            for message in messages:
+                line = _encode(message)
+                offsets.append(position)
+                f.write(line)
+                position += len(line)
+        with open(self.index_path + ".tmp", "wb") as f:
+            offsets.tofile(f)
+        os.replace(self.path + ".tmp", self.path)
+        os.replace(self.index_path + ".tmp", self.index_path)
+        self.offsets = offsets
+        self.end = position
+        self.signature = self._stat()
+
+    # ------------------------------------------------------------ repository API
+
+    def Append(self, messages):
+        """Append messages to the log; costs the same however long the history is."""
+        lines = [_encode(message) for message in messages]
+        with self.lock:
+            self._sync()
+            new_offsets = array("Q")
+            position = self.end
+            for line in lines:
+                new_offsets.append(position)
+                position += len(line)
+            with open(self.path, "r+b") as f:
+                f.seek(self.end)
+                f.write(b"".join(lines))
+                f.truncate()  # Drop a torn line left behind by a crash.
+            with open(self.index_path, "ab") as f:
+                new_offsets.tofile(f)
+            self.offsets.extend(new_offsets)
+            self.end = position
+            self.signature = self._stat()
+
+    def Count(self):
+        with self.lock:
+            self._sync()
+            return len(self.offsets)
+
+    def Read(self, start=0, stop=None):
+        """Messages start..stop (slice semantics, negative indexes allowed)."""
+        with self.lock:
+            self._sync()
+            indexes = range(len(self.offsets))[start:stop]
+            if not indexes:
+                return []
+            first = self.offsets[indexes[0]]
+            last = self.offsets[indexes[-1] + 1] if indexes[-1] + 1 < len(self.offsets) else self.end
+            with open(self.path, "rb") as f:
+                f.seek(first)
+                data = f.read(last - first)
+        messages = []
+        for line in data.splitlines():
+            try:
+                messages.append(json.loads(line))
+            except ValueError:
+                continue  # Skip a corrupted line rather than losing the history.
+        return messages
+
+    def Tail(self, count):
+        """The last `count` messages."""
+        return self.Read(-count) if count > 0 else []
+
+    def All(self):
+        return self.Read()
+
+    def Replace(self, messages):
+        """Rewrite the whole log (auto-delete and clearing history)."""
+        with self.lock:
+            self._write_all(list(messages))
+
+    def Clear(self):
+        self.Replace([])
+
+    def Stats(self):
+        with self.lock:
+            self._sync()
+            return {"messages": len(self.offsets), "log_bytes": self.end,
+                    "index_bytes": len(self.offsets) * self.offsets.itemsize}
+
+
+# The assistant's chat log, shared by Chatbot, RealtimeSearchEngine, AutoDeleteChat, Main and the GUI.
+Store = ChatLogStore()
+
+Append = Store.Append
+Count = Store.Count
+Read = Store.Read
+Tail = Store.Tail
+All = Store.All
+Replace = Store.Replace
+Clear = Store.Clear
+Stats = Store.Stats
+
+
+if __name__ == "__main__":
+    print(json.dumps(Stats(), indent=4))
@@ -1,58 +1,25 @@
-from groq import Groq  # Importing the Groq library to use its API.
-from json import load, dump  # Importing function to read and write JSON files.
+import asyncio  # Importing asyncio for the async streaming variant.
 import datetime  # Importing the datetime module for real-time date and time information.
+import time  # Importing time to measure first-token latency.
 import os  # Importing os for file path handling.
-from Backend.LearningSystem import learn_from_conversation, get_relevant_learnings  # Import learning system
+from Backend import LLMProvider  # Shared, rate-limited Groq client
+from Backend import ModelRouter  # Latency-aware model choice per query
+from Backend import Tracing  # Per-stage latency tracing
+from Backend import ChatLog  # Append-only chat log store
+from Backend.ContextBuilder import BuildContext  # Token-budgeted prompt assembly
+from Backend import Settings  # Cached profile and preferences
+from Backend.TokenStream import AnswerCleaner, CloseAsyncStream  # Incremental answer clean-up
+from Backend.LearningSystem import queue_conversation, get_relevant_learnings  # Import learning system
 import config  # Import centralized configuration
-import app_paths  # Import for correct file paths
 
 # Load configuration from config.py
 Username = config.USERNAME
 Assistantname = config.ASSISTANT_NAME
 GroqAPIKey = config.GROQ_API_KEY
 
-# Initialize the Groq client the provided API key.
-client = Groq(api_key=GroqAPIKey)
-
-# Path to the user profile JSON.
-PROFILE_PATH = app_paths.get_data_path("Profile.json")
-PREFERENCES_PATH = app_paths.get_data_path("Preferences.json")
-CHATLOG_PATH = app_paths.get_data_path("ChatLog.json")
-
-def _load_profile_context():
-    """Read the user's profile and return a string for the system prompt."""
-    try:
-        with open(PROFILE_PATH, "r", encoding="utf-8") as f:
-            profile = load(f)
-        
-        # Also load preferences for languages
-        try:
-            with open(PREFERENCES_PATH, "r", encoding="utf-8") as f:
-                prefs = load(f)
-        except Exception:
-            prefs = {}
-        
-        parts = []
-        field_map = {
-            "name": "Name", "email": "Email", "age": "Age", "gender": "Gender",
-            "location": "Location", "occupation": "Occupation",
-            "hobbies": "Hobbies"
-        }
-        for key, label in field_map.items():
-            val = profile.get(key, "").strip()
-            if val:
-                parts.append(f"{label}: {val}")
-        
-        # Add languages from preferences
-        languages = prefs.get("languages", "").strip()
-        if languages:
-            parts.append(f"Languages: {languages}")
-        
-        if parts:
-            return "\n*** Here is the user's profile information, use it to personalise your responses: ***\n" + "\n".join(parts) + "\n"
-        return ""
-    except Exception:
-        return ""
+# The answer the user is waiting for: full priority on the shared Groq client.
+client = LLMProvider.Client(LLMProvider.INTERACTIVE)
+async_client = LLMProvider.Client(LLMProvider.INTERACTIVE, is_async=True)
 
 # initialize an empty list to store chat messages.
 messages = []
@@ -76,19 +43,6 @@ SystemChatBot = [
     {"role": "system", "content": System}
 ]
 
-# Attempt to load the chat log from a Json file.
-try:
-    with open(CHATLOG_PATH, "r") as f:
-        content = f.read()
-        if content.strip():
-            messages = load(open(CHATLOG_PATH, "r"))  # Load existing messages from the chat log.
-        else:
-            messages = []
-except FileNotFoundError:
-    # If the file doesn't exist, create an empty JSON file to stor chat logs.
-    with open(CHATLOG_PATH, "w") as f:
-        dump([], f)  
-
 # Function to get real-time date and time information.
 def RealtimeInformation():
     current_date_time = datetime.datetime.now()  # Get the current date time.
@@ -113,75 +67,148 @@ def AnswerModifier(Answer):
     modified_answer = '\n'.join(non_empty_lines)  #Jion the cleaned lines back together.
     return modified_answer
 
-# Main chatbot function to handle user queries.
-def ChatBot(Query):
-    """ This function sends the user's query to the chatbot and returns the AI's response. """
-
-    try:
-        # Load the existing chat log from the JSON file.
-        with open (CHATLOG_PATH, "r") as f:
-            messages = load(f) 
+# Function to append a finished exchange to the chat log and learn from it.
+def SaveChatTurn(Query, Answer, AskedAt=None):
+    """Save the user's query and the AI's answer to the chat log, then learn from them."""
 
-        # Append the user's query to the messags list with timestamp.
-        messages.append({
+    # Append both messages; the rest of the log is never rewritten.
+    ChatLog.Append([
+        {
             "role": "user",
             "content": f"{Query}",
-            "timestamp": datetime.datetime.now().isoformat()
-        })
-
-        # Make a request to the Groq API for a response.
-        profile_ctx = _load_profile_context()
-        learned_ctx = get_relevant_learnings()  # Get learned facts from previous conversations
-        system_messages = SystemChatBot + [{"role": "system", "content": RealtimeInformation() + profile_ctx + learned_ctx}]
-        
-        # Strip timestamps from messages before sending to API (API doesn't support timestamp field)
-        api_messages = [{"role": msg["role"], "content": msg["content"]} for msg in messages]
-        
-        Completion = client.chat.completions.create(
-            model="llama-3.1-8b-instant",  # Fast model for quick responses.
-            messages=system_messages + api_messages,
-            max_tokens=512,  # Limit the maximum token in the response.
-            temperature=0.5,  # Lower temperature for faster, more focused responses.
-            top_p=1,  # Use nucleus sampling to control diversity.
-            stream=True,  # Enable streaming response.      
-            stop=None  # Allow the model to determine when to stop.
-        )
-
-        Answer = ""  #  Initialize an empty string to store the AI's response.
-
-        # Process the streamed response chunks.
-        for chunk in Completion:
-            if chunk.choices[0].delta.content:  # Check if there's content in the current chunk.
-                Answer += chunk.choices [0].delta.content  # Append the content to the answer.
-
-        Answer = Answer.replace("</s>", "")  # Clean up any unwanted tokens from the response.
-
-        # Append the chatbot's response to the messages list with timestamp.
-        messages.append({
+            "timestamp": AskedAt or datetime.datetime.now().isoformat()
+        },
+        {
             "role": "assistant",
             "content": Answer,
             "timestamp": datetime.datetime.now().isoformat()
-        })
-
-        # Save the updated chat log to the JSON file.
-        with open(CHATLOG_PATH, "w") as f:
-            dump (messages, f, indent=4)
+        },
+    ])
 
-        # Automatically learn from this conversation
+    # Queue this conversation for background learning (returns immediately)
+    try:
+        with Tracing.Span("learning"):
+            queue_conversation(Query, Answer)
+    except Exception as learning_error:
+        print(f"Learning error: {learning_error}")  # Don't fail if learning fails
+
+# Build the messages for one chatbot request.
+def ChatBotMessages(Query):
+    """System prompt, recent history within the token budget, and the user's query."""
+    profile_ctx = Settings.ProfileContext()  # Rebuilt only when Profile.json or Preferences.json changes
+    learned_ctx = get_relevant_learnings()  # Get learned facts from previous conversations
+    system_messages = SystemChatBot + [{"role": "system", "content": RealtimeInformation() + profile_ctx + learned_ctx}]
+
+    # Recent chat history that fits the token budget, followed by the user's query.
+    return BuildContext(system_messages, Query, Name="chatbot")
+
+# Request parameters shared by the sync and async streams (the model is picked per query by ModelRouter).
+ChatParameters = dict(
+    max_tokens=512,  # Limit the maximum token in the response.
+    temperature=0.5,  # Lower temperature for faster, more focused responses.
+    top_p=1,  # Use nucleus sampling to control diversity.
+    stream=True,  # Enable streaming response.
+    stop=None  # Allow the model to determine when to stop.
+)
+
+# Streaming chatbot function: yields the answer while Groq generates it.
+def ChatBotStream(Query, save=True):
+    """
+    Send the user's query to the chatbot and yield the AI's response chunk by chunk,
+    already cleaned like AnswerModifier (no "</s>", no blank lines).
+    The full exchange is saved to the chat log once the stream is exhausted, unless
+    `save` is False (speculative answers are saved by the caller if they are used).
+    """
+    AskedAt = datetime.datetime.now().isoformat()
+    messages, usage = ChatBotMessages(Query)
+    ChatModel, _ = ModelRouter.Route(Query, "general")  # Small model for chit-chat, large for demanding questions.
+
+    Answer = ""  #  Initialize an empty string to store the AI's response.
+    Cleaner = AnswerCleaner()
+
+    with Tracing.Span("groq_completion", model=ChatModel, prompt_tokens=usage["total_tokens"],
+                      history_messages=usage["history_messages"]) as Trace:
+        Started = LastChunk = time.perf_counter()
+        Completion = client.chat.completions.create(model=ChatModel, messages=messages, **ChatParameters)
+
+        # Process the streamed response chunks and hand each one to the caller.
         try:
-            learn_from_conversation(Query, Answer)
-        except Exception as learning_error:
-            print(f"Learning error: {learning_error}")  # Don't fail if learning fails
+            for chunk in Completion:
+                LastChunk = time.perf_counter()  # Time spent by the caller between chunks is not Groq's.
+                if chunk.choices[0].delta.content:  # Check if there's content in the current chunk.
+                    if not Answer:
+                        Tracing.Mark("first_token")
+                        Trace["first_token_ms"] = round((time.perf_counter() - Started) * 1000, 3)
+                    Answer += chunk.choices [0].delta.content  # Append the content to the answer.
+                    Text = Cleaner.feed(chunk.choices[0].delta.content)
+                    if Text:
+                        yield Text
+            Text = Cleaner.finish()
+            if Text:
+                yield Text
+        finally:
+            # Close the HTTP stream early if the caller stops reading (e.g. a cancelled speculation).
+            if hasattr(Completion, "close"):
+                Completion.close()
+            Trace["duration_ms"] = round((LastChunk - Started) * 1000, 3)
+
+    Answer = Answer.replace("</s>", "")  # Clean up any unwanted tokens from the response.
+
+    if save:
+        SaveChatTurn(Query, Answer, AskedAt)
+
+# Async streaming chatbot function: the same answer through the shared async Groq client.
+async def ChatBotAsyncStream(Query, save=True):
+    """Async-iterator variant of ChatBotStream, for callers running an event loop."""
+    AskedAt = datetime.datetime.now().isoformat()
+    messages, usage = await asyncio.to_thread(ChatBotMessages, Query)
+    ChatModel, _ = ModelRouter.Route(Query, "general")
+
+    Answer = ""
+    Cleaner = AnswerCleaner()
+
+    with Tracing.Span("groq_completion", model=ChatModel, prompt_tokens=usage["total_tokens"],
+                      history_messages=usage["history_messages"], mode="async") as Trace:
+        Started = LastChunk = time.perf_counter()
+        Completion = await async_client.chat.completions.create(model=ChatModel, messages=messages, **ChatParameters)
+        try:
+            async for chunk in Completion:
+                LastChunk = time.perf_counter()
+                if chunk.choices[0].delta.content:
+                    if not Answer:
+                        Tracing.Mark("first_token")
+                        Trace["first_token_ms"] = round((time.perf_counter() - Started) * 1000, 3)
+                    Answer += chunk.choices[0].delta.content
+                    Text = Cleaner.feed(chunk.choices[0].delta.content)
+                    if Text:
+                        yield Text
+            Text = Cleaner.finish()
+            if Text:
+                yield Text
+        finally:
+            await CloseAsyncStream(Completion)
+            Trace["duration_ms"] = round((LastChunk - Started) * 1000, 3)
+
+    if save:
+        await asyncio.to_thread(SaveChatTurn, Query, Answer.replace("</s>", ""), AskedAt)
+
+# Spoken and shown when every retry and fallback model has failed.
+UnavailableAnswer = "Sorry, I can't reach my language model right now. Please try again in a moment."
+
+# Main chatbot function to handle user queries.
+def ChatBot(Query):
+    """ This function sends the user's query to the chatbot and returns the AI's response. """
+
+    try:
+        Answer = "".join(ChatBotStream(Query))  # Collect the whole streamed answer.
 
         # Return the formatted response.
         return AnswerModifier(Answer=Answer)
 
     except Exception as e:
-        # Handle errors by printing the exception and resetting the chat log.
+        # Retries and failover already happened in Backend.Resilience; never discard the chat log here.
         print(f"Error: {e}")
-        with open(CHATLOG_PATH, "w") as f:
-            dump([], f, indent=4)
-        return ChatBot(Query)  # Retry the query after resetting the chat log.
+        return UnavailableAnswer
 
 # Main program entry point.
 if __name__ == "__main__":
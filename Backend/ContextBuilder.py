@@ -0,0 +1,114 @@
+"""
+Token-budgeted prompt assembly for the Groq chat and realtime calls.
+
+ChatBot and RealtimeSearchEngine used to send the whole chat log with every
+request, so prompts (and time to first token) grew with the history until
+they no longer fit the model's context. BuildContext() instead keeps the
+system messages and the new query, and fills what is left of the budget
+with the most recent chat log turns, newest first. It reads the log
+backwards a page at a time (Backend.ChatLog), so the cost depends on the
+budget, not on how long the history is. When Backend.Summarizer has rolled
+older turns into a summary, the summary is sent as a system message and
+only the turns after it are taken from the log.
+
+Token counts come from an offline estimator (no tokenizer download, no API
+call): about one token per 4 characters of English or per word-like piece,
+whichever is larger, plus a few tokens of per-message framing. It slightly
+over-counts on purpose so a full budget stays inside the real limit.
+
+Each request's usage is attached to its trace span and kept per caller:
+
+    messages, usage = BuildContext(system_messages, Query, Name="chatbot")
+    GetUsage()  # {"chatbot": {"total_tokens": ..., "history_messages": ..., ...}}
+
+CONFIG (config.py, optional):
+    CONTEXT_TOKEN_BUDGET   prompt budget in estimated tokens (default 4000)
+"""
+
+import math
+import re
+import threading
+import config  # Import centralized configuration
+from Backend import ChatLog  # Append-only chat log store
+from Backend import Summarizer  # Running summary of older chat history
+
+TokenBudget = getattr(config, "CONTEXT_TOKEN_BUDGET", 4000)
+
+MessageOverhead = 4  # Role and separator tokens the chat template adds per message.
+PageSize = 32  # Chat log messages read per backwards step.
+
+_Pieces = re.compile(r"\w+|[^\w\s]")
+
+_usage_lock = threading.Lock()
+_usage = {}
+
+
+def EstimateTokens(text):
+    """Offline token estimate for a piece of text."""
+    if not text:
+        return 0
+    return max(math.ceil(len(text) / 4), math.ceil(len(_Pieces.findall(text)) * 0.75))
+
+
+def MessageTokens(message):
+    return EstimateTokens(message.get("content", "")) + MessageOverhead
+
+
+def RecentHistory(budget, store=ChatLog, floor=0):
+    """The most recent chat log messages from index `floor` on (timestamps stripped) that fit in `budget` tokens."""
+    history = []
+    used = 0
+    stop = store.Count()
+    while stop > floor and used < budget:
+        start = max(floor, stop - PageSize)
+        page = store.Read(start, stop)
+        for message in reversed(page):
+            tokens = MessageTokens(message)
+            if used + tokens > budget:
+                stop = 0
+                break
+            history.append({"role": message["role"], "content": message["content"]})
+            used += tokens
+        else:
+            stop = start
+
+    history.reverse()
+    # Start on a user message so the model never sees an answer without its question.
+    while history and history[0]["role"] != "user":
+        used -= MessageTokens(history.pop(0))
+    return history, used
+
+
+def BuildContext(SystemMessages, Query, Budget=None, Name="chat"):
+    """
+    Return (messages, usage): SystemMessages, the summary of older history
+    (if any), as much recent history as fits in the budget, then the Query.
+    """
+    budget = Budget or TokenBudget
+    summary, covered = Summarizer.Current()
+    if summary:
+        SystemMessages = list(SystemMessages) + [
+            {"role": "system", "content": f"Summary of the earlier conversation with the user:\n{summary}"}]
+    query_message = {"role": "user", "content": f"{Query}"}
+    fixed = sum(MessageTokens(message) for message in SystemMessages) + MessageTokens(query_message)
+
+    history, history_tokens = RecentHistory(max(0, budget - fixed), floor=covered)
+
+    usage = {
+        "budget": budget,
+        "system_tokens": fixed - MessageTokens(query_message),
+        "query_tokens": MessageTokens(query_message),
+        "summary_messages": covered,
+        "history_tokens": history_tokens,
+        "history_messages": len(history),
+        "total_tokens": fixed + history_tokens,
+    }
+    with _usage_lock:
+        _usage[Name] = usage
+    return list(SystemMessages) + history + [query_message], usage
+
+
+def GetUsage():
+    """Token usage of the latest request built for each caller name."""
+    with _usage_lock:
+        return {name: dict(usage) for name, usage in _usage.items()}
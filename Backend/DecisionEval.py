@@ -0,0 +1,169 @@
+"""
+Batch accuracy and latency evaluation for the Decision-Making Model.
+
+Changes to the `preamble` and `ChatHistory` in Model.py used to be checked
+by typing queries into Model.py's interactive loop one at a time. This
+module classifies a whole labelled file with Model.ClassifyBatch (bounded
+concurrency) and reports:
+
+- accuracy by category and exact task-list matches
+- a confusion matrix (expected category -> predicted category -> count)
+- per-category precision, recall and support
+- classification latency percentiles (p50/p95/p99/max) and throughput
+- the misclassified queries
+
+Categories are the Model.funcs keyword of a single-task decision, or
+"multi" for decisions with several tasks (see IntentModel.Label).
+
+USAGE:
+    python -m Backend.DecisionEval labelled.jsonl [--concurrency 8] [--pipeline]
+                                   [--preamble new_preamble.txt] [--limit 200]
+                                   [--stand-ins] [--out report.json]
+
+    --pipeline   classify with FirstLayerDMM (fast path, cache and local model
+                 included) instead of the remote Cohere model alone; the
+                 evaluated queries are not added to the decision log
+    --preamble   evaluate with this preamble text instead of Model.preamble
+    --stand-ins  use the offline Cohere stand-in (no key or network)
+
+LABELLED FILES:
+    .jsonl  one {"q": query, "d": [task, ...]} object per line, the format of
+            Data/DecisionLog.jsonl, so the log itself can be replayed
+    other   one "query<TAB>task, task" line per example; blank lines and
+            lines starting with # are skipped
+"""
+
+import argparse
+import json
+import time
+from Backend import IntentModel, Tracing
+from Backend import Model
+
+MaxMistakes = 50  # Misclassified examples kept in the report.
+
+
+def LoadLabelled(path):
+    """Return [(query, expected task list)] from a labelled file."""
+    examples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if path.endswith(".jsonl"):
+                entry = json.loads(line)
+                examples.append((entry["q"], list(entry["d"])))
+            else:
+                query, separator, tasks = line.partition("\t")
+                if not separator:
+                    raise ValueError(f"{path}:{number}: expected 'query<TAB>task, task'")
+                examples.append((query.strip(), [t.strip() for t in tasks.split(",") if t.strip()]))
+    return examples
+
+
+def Evaluate(examples, concurrency=8, classify=None):
+    """Classify `examples` concurrently and return the accuracy/latency report."""
+    started = time.perf_counter()
+    answers = Model.ClassifyBatch([query for query, _ in examples], concurrency, classify)
+    wall = time.perf_counter() - started
+
+    confusion = {}
+    mistakes = []
+    correct = exact = errors = 0
+    latencies = []
+    for (query, expected), (predicted, seconds, error) in zip(examples, answers):
+        latencies.append(round(seconds * 1000, 3))
+        if error:
+            errors += 1
+        expected_label = IntentModel.Label(expected) or "unknown"
+        predicted_label = "error" if error else IntentModel.Label(predicted) or "none"
+        row = confusion.setdefault(expected_label, {})
+        row[predicted_label] = row.get(predicted_label, 0) + 1
+        correct += expected_label == predicted_label
+        exact += sorted(expected) == sorted(predicted)
+        if expected_label != predicted_label and len(mistakes) < MaxMistakes:
+            mistakes.append({"query": query, "expected": expected, "predicted": predicted, "error": error})
+
+    labels = sorted(set(confusion) | {p for row in confusion.values() for p in row})
+    per_category = {}
+    for label in labels:
+        support = sum(confusion.get(label, {}).values())
+        predicted = sum(row.get(label, 0) for row in confusion.values())
+        hits = confusion.get(label, {}).get(label, 0)
+        per_category[label] = {
+            "support": support,
+            "predicted": predicted,
+            "precision": round(hits / predicted, 4) if predicted else None,
+            "recall": round(hits / support, 4) if support else None,
+        }
+
+    total = len(examples)
+    return {
+        "examples": total,
+        "errors": errors,
+        "concurrency": concurrency,
+        "accuracy": round(correct / total, 4) if total else None,
+        "exact_match": round(exact / total, 4) if total else None,
+        "latency_ms": {
+            "p50": Tracing.Percentile(latencies, 50),
+            "p95": Tracing.Percentile(latencies, 95),
+            "p99": Tracing.Percentile(latencies, 99),
+            "max": max(latencies) if latencies else None,
+        },
+        "wall_seconds": round(wall, 3),
+        "queries_per_second": round(total / wall, 2) if wall else None,
+        "per_category": per_category,
+        "confusion": confusion,
+        "mistakes": mistakes,
+    }
+
+
+def PrintReport(report):
+    print(f"{report['examples']} examples, {report['errors']} errors, accuracy {report['accuracy']}, "
+          f"exact match {report['exact_match']}, {report['queries_per_second']} queries/s")
+    latency = report["latency_ms"]
+    print(f"latency: p50 {latency['p50']} ms  p95 {latency['p95']} ms  p99 {latency['p99']} ms  max {latency['max']} ms")
+
+    labels = list(report["per_category"])
+    width = max([len(label) for label in labels] + [8]) + 2
+    print("\nconfusion (rows: expected, columns: predicted)")
+    print(" " * width + "".join(f"{label[:width - 2]:>{width}}" for label in labels))
+    for expected in labels:
+        row = report["confusion"].get(expected, {})
+        print(f"{expected:<{width}}" + "".join(f"{row.get(predicted, 0):>{width}}" for predicted in labels))
+
+    print(f"\n{'category':<{width}}{'support':>9}{'precision':>11}{'recall':>9}")
+    for label, stats in report["per_category"].items():
+        precision = "-" if stats["precision"] is None else f"{stats['precision']:.3f}"
+        recall = "-" if stats["recall"] is None else f"{stats['recall']:.3f}"
+        print(f"{label:<{width}}{stats['support']:>9}{precision:>11}{recall:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the Jarvis decision model on a labelled file")
+    parser.add_argument("labelled", help="Labelled queries (.jsonl like Data/DecisionLog.jsonl, or query<TAB>tasks)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Queries classified at the same time")
+    parser.add_argument("--pipeline", action="store_true", help="Use FirstLayerDMM instead of Cohere alone")
+    parser.add_argument("--preamble", help="File with a preamble to evaluate instead of Model.preamble")
+    parser.add_argument("--limit", type=int, help="Only evaluate the first N examples")
+    parser.add_argument("--stand-ins", action="store_true", help="Use the offline Cohere stand-in")
+    parser.add_argument("--out", help="Also write the full report as JSON to this file")
+    args = parser.parse_args()
+
+    if args.stand_ins:
+        from Backend.StandIns import InstallStandIns
+        InstallStandIns()
+    if args.preamble:
+        with open(args.preamble, "r", encoding="utf-8") as f:
+            Model.preamble = f.read()
+
+    if args.pipeline:
+        Model.LogDecisions = False  # Keep evaluation queries out of the intent model's training data.
+
+    Examples = LoadLabelled(args.labelled)[:args.limit]
+    Report = Evaluate(Examples, args.concurrency, Model.FirstLayerDMM if args.pipeline else None)
+    PrintReport(Report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(Report, f, indent=4)
+        print(f"\nReport written to {args.out}")
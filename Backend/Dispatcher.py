@@ -0,0 +1,225 @@
+"""
+Concurrent dispatcher for multi-intent decisions.
+
+FirstLayerDMM can return several tasks for a single query, for example
+["open chrome", "general tell me about gandhi", "generate image lion"].
+DispatchDecision groups those tasks into independent intents and runs them
+concurrently in an asyncio TaskGroup, each under its own timeout, so a
+compound command takes about as long as its slowest intent.
+
+INTENTS:
+- general     general queries merged into one ChatBot question
+- realtime    realtime (plus any general) queries merged into one search
+- automation  open/close/play/system/... commands, run as one Automation batch
+- image       every "generate image" prompt, queued together on the image worker
+- exit        run last, after every other intent has finished
+
+The caller supplies one blocking handler per intent kind; handlers run on a
+long-lived worker pool. A failing or timed-out intent is reported in its
+IntentResult and never cancels its siblings. Python cannot kill a thread,
+so a timed-out handler keeps running in the background; the dispatcher just
+stops waiting for it (the pool is not asyncio's default executor, so
+asyncio.run() does not block on it either).
+
+DispatchDecisionStream takes the decision as an iterator of tasks instead
+(Model.FirstLayerDMMStream). Automation commands and image prompts start the
+moment their task arrives, while Cohere is still writing the rest; general
+and realtime questions are merged and asked once the decision is complete,
+and exit still runs last. Automation commands still run one after another in
+decision order ("close notepad, open notepad" must not race), each starting
+as soon as both its task has arrived and the previous command has finished.
+"""
+
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import config  # Import centralized configuration
+
+# Task prefixes handled by Backend.Automation.
+AutomationFuncs = ["open", "close", "play", "system", "content", "google search", "youtube search", "skip ads"]
+
+# Per-intent timeouts in seconds (override with INTENT_TIMEOUTS in config.py).
+DefaultTimeouts = {"general": 120, "realtime": 120, "automation": 60, "image": 60, "exit": 30}
+DefaultTimeouts.update(getattr(config, "INTENT_TIMEOUTS", {}))
+
+
+# Intent kinds that start as soon as their task arrives in a streamed decision.
+StreamedKinds = ("automation", "image")
+# Streamed intent kinds whose tasks depend on each other's order, so they run one at a time.
+OrderedKinds = ("automation",)
+
+# Worker threads for intent handlers, shared by every dispatch.
+_IntentExecutor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="intent")
+
+
+@dataclass
+class Intent:
+    kind: str
+    payload: object  # Query string, command list or image prompt list.
+
+
+@dataclass
+class IntentResult:
+    kind: str
+    payload: object
+    ok: bool
+    value: object = None
+    error: str = ""
+    elapsed: float = 0.0
+
+
+def GroupDecision(Decision):
+    """Turn FirstLayerDMM's task list into independent intents."""
+    general = [" ".join(task.split()[1:]) for task in Decision if task.startswith("general")]
+    realtime = [" ".join(task.split()[1:]) for task in Decision if task.startswith("realtime")]
+
+    intents = []
+    if realtime:
+        # Realtime search answers general questions too, so ask once.
+        intents.append(Intent("realtime", " and ".join(general + realtime)))
+    elif general:
+        intents.append(Intent("general", " and ".join(general)))
+
+    commands = [task for task in Decision if any(task.startswith(func) for func in AutomationFuncs)]
+    if commands:
+        intents.append(Intent("automation", commands))
+
+    prompts = [task.removeprefix("generate image").strip() for task in Decision if task.startswith("generate image")]
+    if prompts:
+        intents.append(Intent("image", prompts))
+
+    if any(task.startswith("exit") for task in Decision):
+        intents.append(Intent("exit", None))
+
+    return intents
+
+
+async def _RunIntent(intent, handler, timeout):
+    started = time.perf_counter()
+    try:
+        async with asyncio.timeout(timeout):
+            call = functools.partial(contextvars.copy_context().run, handler, intent.payload)
+            value = await asyncio.get_running_loop().run_in_executor(_IntentExecutor, call)
+        return IntentResult(intent.kind, intent.payload, True, value, elapsed=time.perf_counter() - started)
+    except TimeoutError:
+        print(f"[DISPATCH] '{intent.kind}' timed out after {timeout}s")
+        return IntentResult(intent.kind, intent.payload, False, error="timeout", elapsed=time.perf_counter() - started)
+    except Exception as e:
+        print(f"[DISPATCH] '{intent.kind}' failed: {e}")
+        return IntentResult(intent.kind, intent.payload, False, error=str(e), elapsed=time.perf_counter() - started)
+
+
+async def _RunAfter(previous, intent, handler, timeout):
+    """_RunIntent once `previous` (an earlier intent's task, or None) has finished; its timeout starts then."""
+    if previous is not None:
+        await asyncio.wait({previous})
+    return await _RunIntent(intent, handler, timeout)
+
+
+async def DispatchDecision(Decision, Handlers, Timeouts=None):
+    """
+    Run every intent in `Decision` concurrently and return their IntentResults.
+
+    Handlers maps an intent kind to a blocking callable taking the intent's
+    payload. Intents without a handler are skipped.
+    """
+    timeouts = dict(DefaultTimeouts, **(Timeouts or {}))
+    intents = [intent for intent in GroupDecision(Decision) if intent.kind in Handlers]
+    concurrent = [intent for intent in intents if intent.kind != "exit"]
+
+    async with asyncio.TaskGroup() as group:
+        tasks = [
+            group.create_task(_RunIntent(intent, Handlers[intent.kind], timeouts[intent.kind]))
+            for intent in concurrent
+        ]
+    results = [task.result() for task in tasks]
+
+    # Exit only after everything else has finished.
+    for intent in intents:
+        if intent.kind == "exit":
+            results.append(await _RunIntent(intent, Handlers["exit"], timeouts["exit"]))
+
+    return results
+
+
+async def _IterateTasks(Tasks):
+    """Iterate an async or blocking iterable of tasks without blocking the event loop."""
+    if hasattr(Tasks, "__aiter__"):
+        async for task in Tasks:
+            yield task
+        return
+
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    done = object()
+    failure = []
+
+    def pump():
+        try:
+            for task in Tasks:
+                loop.call_soon_threadsafe(queue.put_nowait, task)
+        except Exception as e:
+            failure.append(e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    loop.run_in_executor(_IntentExecutor, functools.partial(contextvars.copy_context().run, pump))
+    while (task := await queue.get()) is not done:
+        yield task
+    if failure:
+        raise failure[0]
+
+
+async def DispatchDecisionStream(Tasks, Handlers, Timeouts=None, OnDecision=None):
+    """
+    Like DispatchDecision, but for a decision that is still being generated.
+
+    Tasks is an iterable or async iterable of FirstLayerDMM task strings.
+    Automation and image intents are started per task as they arrive
+    (automation ones in order, each after the previous has finished). Once
+    the stream ends, OnDecision(decision) is called with the complete task
+    list and may return replacement Handlers for the remaining intents. If
+    the stream fails part-way, the tasks received so far are still run.
+    """
+    timeouts = dict(DefaultTimeouts, **(Timeouts or {}))
+    decision = []
+    tasks = []
+    last = {}  # Ordered kind -> its latest started task.
+
+    def start(group, intent, handlers):
+        if intent.kind in OrderedKinds:
+            task = group.create_task(_RunAfter(last.get(intent.kind), intent, handlers[intent.kind],
+                                               timeouts[intent.kind]))
+            last[intent.kind] = task
+        else:
+            task = group.create_task(_RunIntent(intent, handlers[intent.kind], timeouts[intent.kind]))
+        tasks.append(task)
+
+    async with asyncio.TaskGroup() as group:
+        try:
+            async for task in _IterateTasks(Tasks):
+                decision.append(task)
+                for intent in GroupDecision([task]):
+                    if intent.kind in StreamedKinds and intent.kind in Handlers:
+                        start(group, intent, Handlers)
+        except Exception as e:
+            print(f"[DISPATCH] Decision stream failed after {len(decision)} tasks: {e}")
+
+        if OnDecision is not None:
+            Handlers = OnDecision(list(decision)) or Handlers
+
+        intents = [intent for intent in GroupDecision(decision) if intent.kind in Handlers]
+        for intent in intents:
+            if intent.kind not in StreamedKinds and intent.kind != "exit":
+                start(group, intent, Handlers)
+    results = [task.result() for task in tasks]
+
+    # Exit only after everything else has finished.
+    for intent in intents:
+        if intent.kind == "exit":
+            results.append(await _RunIntent(intent, Handlers["exit"], timeouts["exit"]))
+
+    return results
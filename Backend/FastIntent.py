@@ -0,0 +1,213 @@
+"""
+Local fast-path intent classifier for Jarvis.
+
+Commands such as "open chrome", "close notepad", "mute", "skip ads" or
+"play let her go by passenger" are fully determined by their wording, yet every one used
+to cost a remote Cohere call in Model.FirstLayerDMM. ClassifyFast() matches
+them against local rules in well under a millisecond and returns the same
+task strings the Decision-Making Model produces (see Model.funcs).
+
+Each clause of the query ("open chrome and play despacito" has two) must
+match a rule, otherwise the whole query goes to Cohere: a fast answer is only
+given when every part of it is certain. The result carries a confidence score:
+
+- 1.0   fixed phrases ("skip the ad", "mute", "shutdown my pc", "bye")
+- 0.95  verb + an argument the rules can vouch for: "open"/"close" with a
+        known app (KnownApps, plus FASTPATH_KNOWN_APPS in config.py) or a
+        website, "play" with an argument marked as a title ("<song> by
+        <artist>", "the song <song>", "<song> song", "<song> on youtube")
+        and no words that make it a sentence or a description ("play it
+        again", "play something relaxing"), and the explicit
+        "google search <topic>" / "youtube search <topic>"
+- 0.6   verb + any other argument ("quit smoking", "launch the missiles",
+        "play the next one"): the wording fits, but only Cohere can tell a
+        command from a sentence. Cohere's answer is cached, so a song asked
+        for this way again is still decided locally
+- 0.0   no rule matched / not every clause matched (use Cohere)
+
+FirstLayerDMM uses the fast result when its confidence is at least
+FASTPATH_MIN_CONFIDENCE (config.py, default 0.9; set it above 1 to disable).
+"""
+
+import re
+from dataclasses import dataclass, field
+import config  # Import centralized configuration
+
+# Fixed phrases (after normalization) mapped to their task.
+_Phrases = {
+    "skip ads": ["skip ad", "skip ads", "skip the ad", "skip the ads", "skip this ad", "skip advertisement",
+                 "skip the advertisement", "skip this advertisement"],
+    "system mute": ["mute", "system mute", "mute the volume", "mute volume", "mute the sound", "mute sound"],
+    "system unmute": ["unmute", "system unmute", "unmute the volume", "unmute volume", "unmute the sound", "unmute sound"],
+    "system volume up": ["volume up", "system volume up", "increase volume", "increase the volume", "turn up the volume",
+                         "turn the volume up"],
+    "system volume down": ["volume down", "system volume down", "decrease volume", "decrease the volume", "turn down the volume",
+                           "turn the volume down", "lower the volume"],
+    "exit": ["bye", "goodbye", "good bye", "bye bye", "exit", "see you later"],
+}
+
+# "<verb> my pc" style system tasks: (pattern, task).
+_Device = r"(?:(?:my|the|this) )?(?:pc|computer|laptop|system)"
+_SystemRules = [
+    (rf"(?:shutdown|shut down) {_Device}", "system shutdown"),
+    (rf"(?:restart|reboot) {_Device}", "system restart"),
+    (rf"lock {_Device}|lock (?:my |the )?screen", "system lock"),
+    (rf"put {_Device} to sleep|sleep {_Device}", "system sleep"),
+    (rf"hibernate {_Device}", "system hibernate"),
+    (r"log ?off|log out|sign out", "system log off"),
+]
+
+# Verb + argument rules: (pattern, task template, kind). The argument is capped
+# at six words so sentences that merely start with a verb go to Cohere; the kind
+# decides what evidence the argument needs for a confident answer.
+_Argument = r"([a-z0-9][a-z0-9 .'&+-]*?)"
+_ArgumentRules = [
+    (rf"(?:google search|search google for|search on google for|search google) {_Argument}", "google search {}",
+     "topic"),
+    (rf"(?:youtube search|search youtube for|search on youtube for|search youtube) {_Argument}", "youtube search {}",
+     "topic"),
+    (rf"(?:open|launch) {_Argument}", "open {}", "app"),
+    (rf"(?:close|quit) {_Argument}", "close {}", "app"),
+    (rf"play {_Argument}(?: on youtube)?", "play {}", "song"),
+]
+
+# Apps "open" and "close" are trusted with; anything else is checked by Cohere.
+KnownApps = {
+    "chrome", "google chrome", "firefox", "edge", "microsoft edge", "brave", "opera", "notepad", "notepad++",
+    "calculator", "calendar", "camera", "clock", "paint", "settings", "control panel", "task manager",
+    "file explorer", "explorer", "command prompt", "cmd", "powershell", "terminal", "word", "excel",
+    "powerpoint", "outlook", "onenote", "teams", "microsoft teams", "vs code", "vscode", "visual studio code",
+    "visual studio", "spotify", "vlc", "discord", "slack", "zoom", "skype", "steam", "obs", "telegram",
+    "whatsapp", "signal", "youtube", "facebook", "instagram", "twitter", "linkedin", "reddit", "netflix",
+    "amazon", "gmail", "google", "github", "chatgpt", "maps", "photos", "store", "microsoft store",
+} | {app.lower() for app in getattr(config, "FASTPATH_KNOWN_APPS", ())}
+
+# Websites, recognised the way Automation.OpenApp recognises them.
+_Website = re.compile(r"(?:https?://|www\.)\S+|\S+\.(?:com|org|net|io|ai)\b")
+
+# Words that make "play ..." a sentence or a description rather than a song name ("play it again",
+# "play along", "play something relaxing", "play the next one").
+_PlayStopWords = {"it", "again", "along", "around", "outside", "with", "games", "chess", "cards", "football",
+                  "cricket", "dead", "fair", "back", "the piano", "the guitar", "something", "anything", "some",
+                  "next", "previous", "another", "random", "same", "more"}
+
+# "play" clauses whose wording marks the argument as a title.
+_TitleClause = re.compile(r"play (?:the )?song .+|play .+ (?:song|by .+|on youtube)")
+
+FreeArgumentConfidence = 0.6
+
+_PhraseTasks = {phrase: task for task, phrases in _Phrases.items() for phrase in phrases}
+_CompiledSystem = [(re.compile(pattern), task) for pattern, task in _SystemRules]
+_CompiledArgument = [(re.compile(pattern), template, kind) for pattern, template, kind in _ArgumentRules]
+
+# Words around a command that do not change its meaning.
+_Prefixes = re.compile(r"^(?:(?:hey |ok |okay )?jarvis,? |please |can you |could you |would you |will you |"
+                       r"i want you to |go ahead and |now )+")
+_Suffixes = re.compile(r"(?: please| for me| now| jarvis| right now)+$")
+
+# Arguments that are not things to open/close/play.
+_VagueArguments = {"it", "this", "that", "them", "something", "anything", "the", "a", "an", "up", "music", "a song"}
+
+# Words that mean the clause is a question or a conversation, not an app or song name.
+_ConversationalWords = {"me", "you", "us", "my", "your", "yourself", "what", "who", "how", "why", "when", "where",
+                        "which", "tell", "is", "are", "do", "does", "can", "game", "about"}
+
+MaxArgumentWords = 6
+
+
+@dataclass
+class FastDecision:
+    """A local classification: Cohere-style task strings and how sure the rules are."""
+    tasks: list = field(default_factory=list)
+    confidence: float = 0.0
+
+
+def Normalize(query):
+    """Lower-case, drop punctuation and politeness words that do not change the command."""
+    text = query.lower().strip()
+    text = re.sub(r"[?!;:\"]+|\.(?!\w)", " ", text)  # Keep the dots of "github.com".
+    text = re.sub(r"\s+", " ", text).strip()
+    text = _Prefixes.sub("", text)
+    text = _Suffixes.sub("", text)
+    return text.strip(" ,")
+
+
+def _argument_ok(argument):
+    words = argument.split()
+    return (0 < len(words) <= MaxArgumentWords and argument not in _VagueArguments
+            and not _ConversationalWords.intersection(words))
+
+
+def _argument_confidence(argument, kind, clause):
+    """How sure a verb + argument match is, given what the argument (and the clause around it) looks like."""
+    if kind == "topic":
+        return 0.95  # "google search ..." leaves no doubt about the intent.
+    if kind == "app":
+        return 0.95 if argument in KnownApps or _Website.fullmatch(argument) else FreeArgumentConfidence
+    words = argument.split()
+    if _PlayStopWords.intersection(words) or any(phrase in argument for phrase in _PlayStopWords if " " in phrase):
+        return FreeArgumentConfidence
+    return 0.95 if _TitleClause.fullmatch(clause) else FreeArgumentConfidence
+
+
+def _classify_clause(clause):
+    """Return (task, confidence) for a single clause, or (None, 0.0)."""
+    if clause in _PhraseTasks:
+        return _PhraseTasks[clause], 1.0
+
+    for pattern, task in _CompiledSystem:
+        if pattern.fullmatch(clause):
+            return task, 1.0
+
+    for pattern, template, kind in _CompiledArgument:
+        match = pattern.fullmatch(clause)
+        if match and _argument_ok(match.group(1).strip()):
+            argument = match.group(1).strip()
+            return template.format(argument), _argument_confidence(argument, kind, clause)
+
+    return None, 0.0
+
+
+def _clauses(text):
+    """Split "open chrome, firefox and play despacito" into command clauses."""
+    parts = [p.strip() for p in re.split(r",| and then | and | then ", text) if p.strip()]
+    clauses = []
+    for part in parts:
+        verb = part.split()[0]
+        known = (part in _PhraseTasks or verb in ("open", "launch", "close", "quit", "play", "google", "youtube",
+                                                   "search", "skip", "mute", "unmute", "volume", "increase",
+                                                   "decrease", "turn", "lower", "shutdown", "shut", "restart",
+                                                   "reboot", "lock", "put", "sleep", "hibernate", "log", "sign"))
+        if clauses and not known:
+            previous = clauses[-1]
+            if previous.startswith("play "):
+                clauses[-1] = f"{previous} and {part}"  # "play rock and roll" is one song.
+                continue
+            if previous.split()[0] in ("open", "launch", "close", "quit"):
+                part = f"{previous.split()[0]} {part}"  # "open chrome and firefox"
+        clauses.append(part)
+    return clauses
+
+
+def ClassifyFast(query):
+    """
+    Classify `query` with local rules. Returns a FastDecision whose tasks use
+    the same format as FirstLayerDMM; confidence 0.0 means "ask Cohere".
+    """
+    text = Normalize(query)
+    if not text:
+        return FastDecision()
+
+    tasks = []
+    confidence = 1.0
+    for clause in _clauses(text):
+        task, score = _classify_clause(clause)
+        if task is None:
+            return FastDecision()
+        tasks.append(task)
+        confidence = min(confidence, score)
+
+    if "exit" in tasks and len(tasks) > 1:
+        return FastDecision()  # "bye" mixed with commands is unusual enough to ask Cohere.
+
+    return FastDecision(tasks, confidence)
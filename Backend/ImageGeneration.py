@@ -1,11 +1,17 @@
 import asyncio
+import itertools
+import threading
+import datetime
+from dataclasses import dataclass, field, asdict
 from random import randint
 from PIL import Image
 import requests
 import os
+import sys
 from time import sleep
 import config  # Import configuration file with hardcoded settings
 import app_paths  # Import for correct file paths
+from Backend import MessageBus  # Per-job status updates
 
 # Function to open display images based on a given prompt
 def open_images(prompt):
@@ -32,9 +38,12 @@ def open_images(prompt):
 API_URL = "https://router.huggingface.co/hf-inference/models/stabilityai/stable-diffusion-xl-base-1.0"
 headers = {"Authorization": f"Bearer {config.HUGGINGFACE_API_KEY}"}
 
+# Shared HTTP session so the worker reuses its connections to Hugging Face
+session = requests.Session()
+
 # Async function to send a query to the Hugging Face API
 async def query(payload):
-    response = await asyncio.to_thread(requests.post, API_URL, headers=headers, json=payload)
+    response = await asyncio.to_thread(session.post, API_URL, headers=headers, json=payload)
     return response.content
 
 # Async function to generate images based on the given prompt
@@ -53,41 +62,152 @@ async def generate_images(prompt: str):
     image_bytes_list = await asyncio.gather(*tasks)
 
     # Save the generated images to files 
+    saved = []
     for i, image_bytes in enumerate(image_bytes_list):
         # Check if the response is a valid image (not an error message)
         if image_bytes[:3] == b'{"e' or len(image_bytes) < 1000:
             print(f"Error from API for image {i+1}: {image_bytes.decode('utf-8', errors='ignore')}")
             continue
-        with open(app_paths.get_data_path(f"{prompt.replace(' ', '_')}{i+1}.jpg"), "wb") as f:
+        image_path = app_paths.get_data_path(f"{prompt.replace(' ', '_')}{i+1}.jpg")
+        with open(image_path, "wb") as f:
             f.write(image_bytes)
+        saved.append(image_path)
+    return saved
 
 # Wrapper function to generate and open images
 def GenerateImages(prompt: str):
     asyncio.run(generate_images(prompt))  # Run the async image generation
     open_images(prompt)  # Open the generated images
 
-# Main loop to monitor for image generation requests
-while True:
+# ===================================================================
+#  Persistent image-generation worker
+# ===================================================================
+# Main.py used to start this file as a new Python process for every request and
+# hand it the prompt through ImageGeneration.data. The worker below lives in the
+# assistant's process instead: an asyncio service on a daemon thread pulls jobs
+# from a queue, so requests skip interpreter startup, the PIL/requests imports
+# and the file poll, and a decision can queue several prompts at once.
+# Every status change is published on MessageBus.IMAGE_JOBS as a dict.
+
+# Number of prompts generated at the same time (set IMAGE_WORKERS in config.py).
+ImageWorkers = getattr(config, "IMAGE_WORKERS", 2)
+# Finished jobs kept for GetImageJob() after their final status was published (set IMAGE_JOBS_KEPT in config.py).
+KeptFinishedJobs = getattr(config, "IMAGE_JOBS_KEPT", 20)
+
+@dataclass
+class ImageJob:
+    id: int
+    prompt: str
+    status: str = "queued"  # queued -> running -> done / failed
+    images: list = field(default_factory=list)
+    error: str = ""
+    submitted: str = field(default_factory=lambda: datetime.datetime.now().isoformat())
+    finished: str = ""
+
+_jobs = {}  # Job id -> ImageJob, oldest first
+_jobs_lock = threading.Lock()
+_job_ids = itertools.count(1)
+_worker_lock = threading.Lock()
+_worker_loop = None
+_job_queue = None
+
+def _publish_job(job):
+    MessageBus.publish(MessageBus.IMAGE_JOBS, asdict(job))
+
+def _evict_finished_jobs():
+    # Keep only the newest finished jobs; queued and running ones always stay.
+    with _jobs_lock:
+        finished = [job_id for job_id, job in _jobs.items() if job.status in ("done", "failed")]
+        for job_id in finished[:max(0, len(finished) - KeptFinishedJobs)]:
+            del _jobs[job_id]
+
+async def _image_worker():
+    while True:
+        job = await _job_queue.get()
+        job.status = "running"
+        _publish_job(job)
+        try:
+            job.images = await generate_images(job.prompt)
+            if job.images:
+                job.status = "done"
+                await asyncio.to_thread(open_images, job.prompt)
+            else:
+                job.status = "failed"
+                job.error = "no valid images returned"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        job.finished = datetime.datetime.now().isoformat()
+        _publish_job(job)
+        _evict_finished_jobs()
+        _job_queue.task_done()
+
+def _run_worker_loop(ready):
+    global _worker_loop, _job_queue
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    _job_queue = asyncio.Queue()
+    for _ in range(ImageWorkers):
+        _worker_loop.create_task(_image_worker())
+    ready.set()
+    _worker_loop.run_forever()
+
+def StartImageWorker():
+    """Start the background image worker if it is not already running."""
+    with _worker_lock:
+        if _worker_loop is not None:
+            return
+        ready = threading.Event()
+        threading.Thread(target=_run_worker_loop, args=(ready,), daemon=True, name="image-worker").start()
+        ready.wait()
+
+def SubmitImageJob(prompt: str):
+    """Queue one prompt for generation and return its ImageJob immediately."""
+    StartImageWorker()
+    job = ImageJob(id=next(_job_ids), prompt=prompt)
+    with _jobs_lock:
+        _jobs[job.id] = job
+    _publish_job(job)
+    _worker_loop.call_soon_threadsafe(_job_queue.put_nowait, job)
+    return job
+
+def SubmitImageJobs(prompts):
+    """Queue several prompts (e.g. every "generate image" task of one decision)."""
+    return [SubmitImageJob(prompt) for prompt in prompts]
+
+def GetImageJob(job_id):
+    """The job with this id, or None once it has finished and been evicted."""
+    with _jobs_lock:
+        return _jobs.get(job_id)
+
+# Standalone use: a prompt on the command line, or the legacy ImageGeneration.data poll.
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        GenerateImages(prompt=" ".join(sys.argv[1:]))
+        sys.exit(0)
+
+    # Main loop to monitor for image generation requests
+    while True:
 
-    try:
-        # Read the status and prompt from the data file 
-        with open(r"Frontend\files\ImageGeneration.data", "r") as f:
-            Data: str = f.read()
+        try:
+            # Read the status and prompt from the data file 
+            with open(r"Frontend\files\ImageGeneration.data", "r") as f:
+                Data: str = f.read()
 
-        Prompt, Status = Data.split(",")
+            Prompt, Status = Data.split(",")
 
-        # If the status indicates an image generation request
-        if Status == "True":
-            print("Generation Images...")
-            ImageStatus = GenerateImages(prompt=Prompt)
+            # If the status indicates an image generation request
+            if Status == "True":
+                print("Generation Images...")
+                ImageStatus = GenerateImages(prompt=Prompt)
 
-            # Reset the statua in the file after generating images
-            with open(r"Frontend\Files\ImageGeneration.data", "w") as f:
-                f.write("False,False")
-                break  # Exit the loop after processing the request
+                # Reset the statua in the file after generating images
+                with open(r"Frontend\Files\ImageGeneration.data", "w") as f:
+                    f.write("False,False")
+                    break  # Exit the loop after processing the request
 
-        else:
-            sleep(1)  # Wait for 1 second before checking again
+            else:
+                sleep(1)  # Wait for 1 second before checking again
 
-    except:
-        pass
+        except:
+            pass
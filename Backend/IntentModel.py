@@ -0,0 +1,345 @@
+"""
+Offline-trained local intent model for Jarvis.
+
+Every remote FirstLayerDMM decision is appended to Data/DecisionLog.jsonl as
+a (query, decision) pair. From that log (plus the few-shot ChatHistory in
+Model.py) this module trains a hashed n-gram linear classifier in NumPy over
+the Model.funcs categories and saves it to Data/IntentModel.npz.
+
+Serving hashes the query's word uni/bigrams and character trigrams into a
+fixed number of buckets and sums the matching weight rows: tens of
+microseconds, no network, no preamble. FirstLayerDMM asks the model after
+the fast-path rules and the decision cache, and uses its answer when the
+predicted class is one whose task text is the query itself (general,
+realtime, exit, skip ads) with at least INTENT_MODEL_MIN_CONFIDENCE
+probability (config.py, default 0.9). Everything else still goes to Cohere,
+which keeps producing new training pairs.
+
+A softmax can only choose between the categories it was trained on, so a
+model that never saw "generate image ..." or "reminder ..." would confidently
+call them general or realtime. The model therefore serves nothing until the
+training data has at least INTENT_MODEL_MIN_EXAMPLES examples (default 5) of
+every Model.funcs category, and it declines queries whose n-grams it mostly
+never saw in training (less than INTENT_MODEL_MIN_KNOWN of them, default 0.5).
+
+NumPy is optional and not in Requirements.txt: install it (pip install numpy)
+to train and serve the model. Without it decisions are still logged for later
+training, but nothing is served locally.
+
+USAGE:
+    python -m Backend.IntentModel train [--epochs 12] [--buckets 65536]
+    python -m Backend.IntentModel eval  [--holdout 0.2] [--remote 20]
+
+`eval` trains on part of the log, then reports accuracy, per-category
+precision/recall and serving latency on the held-out part; --remote N also
+re-classifies N held-out queries with Cohere to compare latency.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+import app_paths  # Import for correct file paths
+import config  # Import centralized configuration
+
+try:
+    import numpy as np
+except ImportError:  # The local model needs NumPy; the decision log does not.
+    np = None
+Available = np is not None
+
+LOG_PATH = app_paths.get_data_path("DecisionLog.jsonl")
+MODEL_PATH = app_paths.get_data_path("IntentModel.npz")
+
+DefaultBuckets = 1 << 16
+MinConfidence = getattr(config, "INTENT_MODEL_MIN_CONFIDENCE", 0.9)
+MinExamples = getattr(config, "INTENT_MODEL_MIN_EXAMPLES", 5)
+MinKnown = getattr(config, "INTENT_MODEL_MIN_KNOWN", 0.5)
+
+# Classes whose task is "<class> <query>" (or just "<class>"), so the model can serve them alone.
+ServedCategories = ("general", "realtime", "exit", "skip ads")
+MULTI = "multi"  # Label for decisions with several tasks; never served locally.
+
+_log_lock = threading.Lock()
+
+
+# ---------------------------------------------------------------- logging
+
+def LogDecision(query, decision):
+    """Append a remote (query, decision) pair to the training log."""
+    if not query or not decision:
+        return
+    line = json.dumps({"q": query, "d": decision, "t": int(time.time())}, ensure_ascii=False)
+    with _log_lock:
+        try:
+            with open(LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            print(f"[WARNING] Could not log decision: {e}")
+
+
+def FewShotExamples():
+    """The (query, decision) pairs of the few-shot ChatHistory in Model.py."""
+    from Backend.Model import ChatHistory
+    return [(user["message"], [t.strip() for t in bot["message"].split(",") if t.strip()])
+            for user, bot in zip(ChatHistory[::2], ChatHistory[1::2])]
+
+
+def LoadExamples(path=LOG_PATH, include_few_shot=True):
+    """Return [(query, decision list)] from the log and the Model.py few-shot examples."""
+    examples = FewShotExamples() if include_few_shot else []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    examples.append((entry["q"], entry["d"]))
+                except (ValueError, KeyError):
+                    continue  # Skip a torn line.
+    except FileNotFoundError:
+        pass
+    return examples
+
+
+def Label(decision):
+    """The category of a decision: the funcs keyword of its only task, or MULTI."""
+    from Backend.Model import funcs
+    if len(decision) != 1:
+        return MULTI
+    task = decision[0]
+    matches = [func for func in funcs if task.startswith(func)]
+    return max(matches, key=len) if matches else None
+
+
+# ---------------------------------------------------------------- features
+
+def _normalize(query):
+    return re.sub(r"\s+", " ", re.sub(r"[^a-z0-9' ]+", " ", query.lower())).strip()
+
+
+def Features(query, buckets=DefaultBuckets):
+    """Hashed word unigram/bigram and character trigram bucket indices for a query."""
+    words = _normalize(query).split()
+    grams = [f"w:{w}" for w in words]
+    grams += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f"<{word}>"
+        grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    grams.append("bias:")
+    return np.fromiter({zlib.crc32(g.encode("utf-8")) % buckets for g in grams}, dtype=np.int64)
+
+
+# ---------------------------------------------------------------- model
+
+class IntentModel:
+    """Multinomial logistic regression over hashed n-gram features."""
+
+    def __init__(self, classes, buckets=DefaultBuckets, weights=None, counts=None):
+        self.classes = list(classes)
+        self.buckets = buckets
+        self.weights = weights if weights is not None else np.zeros((buckets, len(self.classes)), dtype=np.float32)
+        self.counts = dict(counts or {})  # Training examples per class.
+
+    def Missing(self):
+        """Model.funcs categories with fewer than MinExamples training examples."""
+        from Backend.Model import funcs
+        return [c for c in funcs if self.counts.get(c, 0) < MinExamples]
+
+    def Known(self, query):
+        """Fraction of the query's n-gram buckets that were seen in training."""
+        features = Features(query, self.buckets)
+        return float(np.any(self.weights[features] != 0, axis=1).mean())
+
+    def Probabilities(self, query):
+        scores = self.weights[Features(query, self.buckets)].sum(axis=0)
+        scores = np.exp(scores - scores.max())
+        return scores / scores.sum()
+
+    def Predict(self, query):
+        """Return (category, probability)."""
+        probabilities = self.Probabilities(query)
+        best = int(probabilities.argmax())
+        return self.classes[best], float(probabilities[best])
+
+    def Fit(self, examples, epochs=12, learning_rate=0.5, l2=1e-6, seed=0):
+        """Train with plain SGD on (query, category) pairs."""
+        rng = random.Random(seed)
+        index = {c: i for i, c in enumerate(self.classes)}
+        data = [(Features(q, self.buckets), index[c]) for q, c in examples]
+        for _, c in examples:
+            self.counts[c] = self.counts.get(c, 0) + 1
+        for epoch in range(epochs):
+            rng.shuffle(data)
+            rate = learning_rate / (1 + epoch)
+            for features, target in data:
+                rows = self.weights[features]
+                scores = rows.sum(axis=0)
+                scores = np.exp(scores - scores.max())
+                gradient = scores / scores.sum()
+                gradient[target] -= 1.0
+                self.weights[features] = rows * (1 - l2) - rate * gradient
+        return self
+
+    def Save(self, path=MODEL_PATH):
+        counts = np.array([self.counts.get(c, 0) for c in self.classes], dtype=np.int64)
+        np.savez_compressed(path, weights=self.weights, classes=np.array(self.classes), buckets=self.buckets,
+                            counts=counts)
+
+    @classmethod
+    def Load(cls, path=MODEL_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            classes = [str(c) for c in data["classes"]]
+            # Models saved before counts were kept count as untrained on every class (retrain to serve).
+            counts = dict(zip(classes, (int(n) for n in data["counts"]))) if "counts" in data.files else {}
+            return cls(classes, int(data["buckets"]), data["weights"], counts)
+
+
+def Train(examples=None, epochs=12, buckets=DefaultBuckets):
+    """Train a model from labelled examples (default: the whole decision log)."""
+    if not Available:
+        raise RuntimeError("Training the intent model needs NumPy (pip install numpy).")
+    labelled = [(q, Label(d)) for q, d in (examples if examples is not None else LoadExamples())]
+    labelled = [(q, c) for q, c in labelled if c is not None]
+    if not labelled:
+        raise ValueError("No logged decisions to train on yet.")
+    classes = sorted({c for _, c in labelled})
+    return IntentModel(classes, buckets).Fit(labelled, epochs=epochs), len(labelled)
+
+
+# ---------------------------------------------------------------- serving
+
+_model = None
+_model_mtime = None
+_model_lock = threading.Lock()
+
+
+def _current_model():
+    """The saved model, reloaded when the file changes; None if no model was trained."""
+    global _model, _model_mtime
+    if not Available:
+        return None
+    try:
+        mtime = os.path.getmtime(MODEL_PATH)
+    except OSError:
+        return None
+    if mtime != _model_mtime:
+        with _model_lock:
+            if mtime != _model_mtime:
+                try:
+                    _model = IntentModel.Load(MODEL_PATH)
+                except Exception as e:
+                    print(f"[WARNING] Could not load intent model: {e}")
+                    _model = None
+                _model_mtime = mtime
+    return _model
+
+
+def ClassifyLocal(query):
+    """
+    Return (tasks, confidence) from the local model, or (None, confidence)
+    when the model is missing, was not trained on every category, is unsure,
+    does not know the query's words, or predicts a class it cannot serve.
+    """
+    model = _current_model()
+    if model is None or model.Missing():
+        return None, 0.0
+    category, confidence = model.Predict(query)
+    if category not in ServedCategories or confidence < MinConfidence:
+        return None, confidence
+    if model.Known(query) < MinKnown:
+        return None, confidence  # Out of distribution: the probabilities mean little here.
+    if category in ("exit", "skip ads"):
+        return [category], confidence
+    return [f"{category} {query.lower().strip()}"], confidence
+
+
+# ---------------------------------------------------------------- command line
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))] if ordered else None
+
+
+def Evaluate(holdout=0.2, remote=0, epochs=12, buckets=DefaultBuckets, seed=0):
+    """Train on part of the log and report accuracy and latency on the rest."""
+    examples = [(q, d) for q, d in LoadExamples(include_few_shot=False) if Label(d) is not None]
+    random.Random(seed).shuffle(examples)
+    split = max(1, int(len(examples) * holdout))
+    test, train = examples[:split], examples[split:]
+    if not train:
+        raise ValueError("Not enough logged decisions to evaluate (need at least 2).")
+
+    model, _ = Train(FewShotExamples() + train, epochs=epochs, buckets=buckets)
+
+    missing = model.Missing()
+    correct, served, served_correct, latencies = 0, 0, 0, []
+    per_class = {}
+    for query, decision in test:
+        expected = Label(decision)
+        started = time.perf_counter()
+        predicted, confidence = model.Predict(query)
+        latencies.append((time.perf_counter() - started) * 1e6)
+        correct += predicted == expected
+        stats = per_class.setdefault(expected, {"support": 0, "correct": 0, "predicted": 0})
+        stats["support"] += 1
+        stats["correct"] += predicted == expected
+        per_class.setdefault(predicted, {"support": 0, "correct": 0, "predicted": 0})["predicted"] += 1
+        if (not missing and predicted in ServedCategories and confidence >= MinConfidence
+                and model.Known(query) >= MinKnown):
+            served += 1
+            served_correct += predicted == expected
+
+    report = {
+        "train_examples": len(train),
+        "test_examples": len(test),
+        "accuracy": round(correct / len(test), 4),
+        "missing_categories": missing,
+        "served_fraction": round(served / len(test), 4),
+        "served_accuracy": round(served_correct / served, 4) if served else None,
+        "local_latency_us": {"p50": round(_percentile(latencies, 50), 1), "p95": round(_percentile(latencies, 95), 1)},
+        "per_category": {
+            c: {"support": s["support"],
+                "recall": round(s["correct"] / s["support"], 4) if s["support"] else None,
+                "precision": round(s["correct"] / s["predicted"], 4) if s["predicted"] else None}
+            for c, s in sorted(per_class.items())
+        },
+    }
+
+    if remote:
+        from Backend.Model import RemoteDMM
+        remote_latencies, agree = [], 0
+        for query, decision in test[:remote]:
+            started = time.perf_counter()
+            answer = RemoteDMM(query)
+            remote_latencies.append((time.perf_counter() - started) * 1e3)
+            agree += Label(answer) == model.Predict(query)[0]
+        report["remote_latency_ms"] = {"p50": round(_percentile(remote_latencies, 50), 1),
+                                       "p95": round(_percentile(remote_latencies, 95), 1)}
+        report["remote_agreement"] = round(agree / len(remote_latencies), 4)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train or evaluate the local Jarvis intent model")
+    parser.add_argument("command", choices=["train", "eval"])
+    parser.add_argument("--epochs", type=int, default=12)
+    parser.add_argument("--buckets", type=int, default=DefaultBuckets, help="Number of hashed feature buckets")
+    parser.add_argument("--holdout", type=float, default=0.2, help="eval: fraction of the log held out")
+    parser.add_argument("--remote", type=int, default=0, help="eval: also query Cohere for this many held-out queries")
+    args = parser.parse_args()
+
+    if args.command == "train":
+        started = time.perf_counter()
+        model, count = Train(epochs=args.epochs, buckets=args.buckets)
+        model.Save()
+        print(f"Trained on {count} examples ({', '.join(model.classes)}) in {time.perf_counter() - started:.1f}s")
+        print(f"Saved to {MODEL_PATH}")
+        missing = model.Missing()
+        if missing:
+            print(f"Not served yet: fewer than {MinExamples} examples of {', '.join(missing)}")
+    else:
+        print(json.dumps(Evaluate(args.holdout, args.remote, args.epochs, args.buckets), indent=4))
@@ -0,0 +1,246 @@
+"""
+Shared Groq client layer for every Jarvis backend.
+
+Chatbot, RealtimeSearchEngine, LearningSystem and Automation used to build
+their own Groq client, each with its own HTTP connection pool and TLS
+handshakes. They now all go through this module, which owns:
+
+- one pooled sync client (GetClient) and one async client (GetAsyncClient),
+  both created on first use and sharing LLM_MAX_CONNECTIONS keep-alive slots
+- Prewarm(), run by the backend warm-up at startup, which opens the first
+  connection so the first real answer does not pay for DNS + TLS
+- a central request token bucket with two priorities. INTERACTIVE calls
+  (the answer the user is waiting for) may use every token; BACKGROUND
+  calls (learning extraction) leave LLM_INTERACTIVE_RESERVE tokens untouched
+  and always yield to a waiting interactive call, so a burst of background
+  work cannot starve the user-facing answer. It refills at Groq's free-tier
+  limit of 30 requests per minute by default.
+- bounded retries, per-model circuit breakers and model failover for every
+  request (Backend.Resilience)
+- the time to first chunk of every streamed request, per model, which
+  Backend.ModelRouter uses to pick models
+
+Backends keep the familiar `client.chat.completions.create(...)` call:
+
+    client = LLMProvider.Client(LLMProvider.INTERACTIVE)
+
+CONFIG (config.py, all optional):
+    LLM_MAX_CONNECTIONS      pooled connections (default 10)
+    LLM_REQUESTS_PER_MINUTE  token refill rate (default 30; 0 = no limit and no reserve)
+    LLM_BURST                bucket size (default 10)
+    LLM_INTERACTIVE_RESERVE  tokens background calls may not use (default 3)
+
+On a paid Groq plan, raise LLM_REQUESTS_PER_MINUTE to the plan's request
+limit in config.py, or call LLMProvider.SetRateLimit(...) at runtime.
+"""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+import httpx  # Installed with the groq package
+from groq import Groq, AsyncGroq
+import config  # Import centralized configuration
+from Backend import Resilience  # Retries, circuit breakers and model failover
+from Backend import ModelRouter  # Per-model first-chunk latency for routing
+
+GroqAPIKey = config.GROQ_API_KEY
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+MaxConnections = getattr(config, "LLM_MAX_CONNECTIONS", 10)
+RequestsPerMinute = getattr(config, "LLM_REQUESTS_PER_MINUTE", 30)
+Burst = getattr(config, "LLM_BURST", 10)
+InteractiveReserve = getattr(config, "LLM_INTERACTIVE_RESERVE", 3)
+
+
+class TokenBucket:
+    """Request rate limiter with a reserve that only INTERACTIVE callers may spend."""
+
+    def __init__(self, per_minute, capacity, reserve):
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity)
+        self.reserve = min(float(reserve), self.capacity - 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.interactive_waiting = 0
+        self.granted = {INTERACTIVE: 0, BACKGROUND: 0}
+        self.waited_seconds = {INTERACTIVE: 0.0, BACKGROUND: 0.0}
+        self._cond = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, priority=INTERACTIVE, timeout=None):
+        """Take one token, waiting as needed. Returns False if `timeout` seconds passed first."""
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        floor = 0.0 if priority == INTERACTIVE else self.reserve
+
+        with self._cond:
+            if not self.rate:  # Rate limiting disabled.
+                self.granted[priority] += 1
+                return True
+
+            if priority == INTERACTIVE:
+                self.interactive_waiting += 1
+            try:
+                while True:
+                    self._refill()
+                    blocked = priority == BACKGROUND and self.interactive_waiting > 0
+                    if not blocked and self.tokens >= floor + 1:
+                        self.tokens -= 1
+                        self.granted[priority] += 1
+                        self.waited_seconds[priority] += time.monotonic() - started
+                        return True
+
+                    wait = max((floor + 1 - self.tokens) / self.rate, 0.01)
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                        wait = min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                if priority == INTERACTIVE:
+                    self.interactive_waiting -= 1
+                    self._cond.notify_all()  # Let waiting background calls re-check.
+
+    def stats(self):
+        with self._cond:
+            self._refill()
+            return {
+                "tokens": round(self.tokens, 2),
+                "interactive_granted": self.granted[INTERACTIVE],
+                "background_granted": self.granted[BACKGROUND],
+                "interactive_waited_seconds": round(self.waited_seconds[INTERACTIVE], 3),
+                "background_waited_seconds": round(self.waited_seconds[BACKGROUND], 3),
+            }
+
+
+Bucket = TokenBucket(RequestsPerMinute, Burst, InteractiveReserve)
+
+
+def SetRateLimit(per_minute, capacity=Burst, reserve=InteractiveReserve):
+    """Replace the central token bucket (per_minute=0 turns rate limiting off)."""
+    global Bucket
+    Bucket = TokenBucket(per_minute, capacity, reserve)
+
+_lock = threading.Lock()
+_client = None
+_async_client = None
+
+
+def GetClient():
+    """The shared sync Groq client (one connection pool for the whole process)."""
+    global _client
+    with _lock:
+        if _client is None:
+            _client = Groq(
+                api_key=GroqAPIKey,
+                http_client=httpx.Client(
+                    limits=httpx.Limits(max_connections=MaxConnections, max_keepalive_connections=MaxConnections),
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                ),
+            )
+        return _client
+
+
+def GetAsyncClient():
+    """The shared async Groq client. Use it from one long-lived event loop."""
+    global _async_client
+    with _lock:
+        if _async_client is None:
+            _async_client = AsyncGroq(
+                api_key=GroqAPIKey,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(max_connections=MaxConnections, max_keepalive_connections=MaxConnections),
+                    timeout=httpx.Timeout(60.0, connect=10.0),
+                ),
+            )
+        return _async_client
+
+
+def SetClient(client=None, async_client=None):
+    """Replace the shared clients, e.g. with offline stand-ins."""
+    global _client, _async_client
+    with _lock:
+        if client is not None:
+            _client = client
+        if async_client is not None:
+            _async_client = async_client
+
+
+def Prewarm():
+    """Open a pooled connection to Groq ahead of the first query; returns the seconds it took."""
+    started = time.perf_counter()
+    client = GetClient()
+    try:
+        if hasattr(client, "models"):
+            client.models.list()  # Cheap authenticated request: DNS, TLS and keep-alive are set up.
+    except Exception as e:
+        print(f"[WARNING] Could not pre-warm the Groq connection: {e}")
+    return time.perf_counter() - started
+
+
+_stand_in = None
+
+
+def _client_for(model, is_async):
+    """The client that serves `model`: the shared Groq client, or the offline stand-in endpoint."""
+    global _stand_in
+    if model != Resilience.STAND_IN:
+        return GetAsyncClient() if is_async else GetClient()
+    with _lock:
+        if _stand_in is None:
+            from Backend.StandIns import StandInGroq, StandInAsyncGroq
+            _stand_in = (StandInGroq(), StandInAsyncGroq())
+        return _stand_in[1] if is_async else _stand_in[0]
+
+
+class _Completions:
+
+    def __init__(self, priority, is_async):
+        self.priority = priority
+        self.is_async = is_async
+
+    def create(self, **kwargs):
+        if self.is_async:
+            return Resilience.Executor.CallAsync(self._send_async, **kwargs)
+        return Resilience.Executor.Call(self._send, **kwargs)
+
+    def _send(self, **kwargs):
+        Bucket.acquire(self.priority)  # Every attempt, retries included, is a request.
+        started = time.perf_counter()
+        response = _client_for(kwargs.get("model"), False).chat.completions.create(**kwargs)
+        if not kwargs.get("stream"):
+            return response
+        response = Resilience.Prime(response)
+        ModelRouter.Observe(kwargs.get("model"), (time.perf_counter() - started) * 1000)
+        return response
+
+    async def _send_async(self, **kwargs):
+        await asyncio.to_thread(Bucket.acquire, self.priority)
+        started = time.perf_counter()
+        response = await _client_for(kwargs.get("model"), True).chat.completions.create(**kwargs)
+        if not kwargs.get("stream"):
+            return response
+        response = await Resilience.PrimeAsync(response)
+        ModelRouter.Observe(kwargs.get("model"), (time.perf_counter() - started) * 1000)
+        return response
+
+
+class Client:
+    """Rate-limited view of the shared client: `.chat.completions.create(...)` like groq.Groq."""
+
+    def __init__(self, priority=INTERACTIVE, is_async=False):
+        self.priority = priority
+        self.chat = SimpleNamespace(completions=_Completions(priority, is_async))
+
+
+def GetStats():
+    """Token bucket state and per-priority grant / wait totals."""
+    return Bucket.stats()
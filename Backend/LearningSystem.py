@@ -19,6 +19,16 @@ WHAT IT LEARNS:
 
 FEATURES:
 - Automatic extraction: No manual input needed
+- Off the answer path: finished turns go to a background queue (saved in
+  LearningQueue.jsonl, so nothing is lost on restart) and several turns are
+  sent in one extraction request once LEARNING_BATCH_SIZE turns are waiting,
+  the assistant has been quiet for LEARNING_IDLE_SECONDS, or on exit. A
+  batch whose extraction fails (rate limit, timeout, no network) stays
+  queued and is retried after a growing pause (LEARNING_RETRY_SECONDS,
+  doubled per failure up to LEARNING_RETRY_MAX_SECONDS). After
+  LEARNING_MAX_ATTEMPTS failures the batch is moved to
+  LearningQueue.failed.jsonl so later turns are not held up, and at most
+  LEARNING_QUEUE_MAX turns are kept waiting (the oldest are dropped)
 - Duplicate prevention: Similar facts are merged
 - Relevance tracking: Frequently mentioned facts are prioritized
 - Memory limit: Keeps the 100 most relevant learnings
@@ -29,10 +39,12 @@ The system works automatically - just have conversations with Jarvis and it will
 You can clear learned memory anytime from Settings → Preferences → Clear Learned Memory
 """
 
-from groq import Groq
-from json import load, dump
+from Backend import LLMProvider  # Shared, rate-limited Groq client
+from json import load, dump, dumps, loads
 from datetime import datetime
 import os
+import threading
+import time
 import config  # Import centralized configuration
 import app_paths  # Import for correct file paths
 
@@ -41,12 +53,29 @@ Username = config.USERNAME
 Assistantname = config.ASSISTANT_NAME
 GroqAPIKey = config.GROQ_API_KEY
 
-# Initialize Groq client
-client = Groq(api_key=GroqAPIKey)
+# Learning extraction runs in the background and must not starve user-facing answers.
+client = LLMProvider.Client(LLMProvider.BACKGROUND)
 
 # Path to learning memory file
 LEARNING_MEMORY_PATH = app_paths.get_data_path("LearningMemory.json")
 
+# Path to the queue of turns waiting for extraction (one JSON object per line)
+LEARNING_QUEUE_PATH = app_paths.get_data_path("LearningQueue.jsonl")
+
+# Path to the batches given up on after LEARNING_MAX_ATTEMPTS failures
+LEARNING_FAILED_PATH = app_paths.get_data_path("LearningQueue.failed.jsonl")
+
+# Background queue settings (config.py, optional)
+BatchSize = getattr(config, "LEARNING_BATCH_SIZE", 4)  # Turns per extraction request
+IdleSeconds = getattr(config, "LEARNING_IDLE_SECONDS", 15)  # Quiet time before a smaller batch is sent
+RetrySeconds = getattr(config, "LEARNING_RETRY_SECONDS", 10)  # Pause after the first failed batch
+RetryMaxSeconds = getattr(config, "LEARNING_RETRY_MAX_SECONDS", 600)  # Longest pause between retries
+MaxAttempts = getattr(config, "LEARNING_MAX_ATTEMPTS", 5)  # Failures before a batch is given up on
+MaxQueued = getattr(config, "LEARNING_QUEUE_MAX", 200)  # Turns kept waiting; the oldest are dropped beyond this
+
+# Serialises load-modify-save cycles on LearningMemory.json
+memory_lock = threading.RLock()
+
 def load_learning_memory():
     """Load the learning memory from JSON file."""
     try:
@@ -62,20 +91,35 @@ def load_learning_memory():
 
 def save_learning_memory(memory):
     """Save the learning memory to JSON file."""
-    with open(LEARNING_MEMORY_PATH, "w", encoding="utf-8") as f:
+    # Write a temporary file and swap it in, so readers never see a half-written file
+    with open(LEARNING_MEMORY_PATH + ".tmp", "w", encoding="utf-8") as f:
         dump(memory, f, indent=4, ensure_ascii=False)
+    os.replace(LEARNING_MEMORY_PATH + ".tmp", LEARNING_MEMORY_PATH)
 
 def extract_learnings(user_query, assistant_response):
     """
     Analyze the conversation and extract important learnings using AI.
-    Returns a list of learned facts.
+    Returns a list of learned facts (empty if the extraction failed).
     """
     try:
-        # Prompt for extracting learnings
-        extraction_prompt = f"""Analyze this conversation between the user and assistant and extract any important facts, preferences, or information about the user that should be remembered for future conversations.
+        return extract_learnings_batch([(user_query, assistant_response)])
+    except Exception as e:
+        print(f"Learning extraction error: {e}")
+        return []
+
+def extract_learnings_batch(turns):
+    """
+    Extract learnings from several (user query, assistant response) turns
+    with a single AI request. Returns a list of learned facts; raises if the
+    request fails, so queued turns are kept for a retry.
+    """
+    conversation = "\n\n".join(f"User: {user_query}\nAssistant: {assistant_response}"
+                                for user_query, assistant_response in turns)
+
+    # Prompt for extracting learnings
+    extraction_prompt = f"""Analyze this conversation between the user and assistant and extract any important facts, preferences, or information about the user that should be remembered for future conversations.
 
-User: {user_query}
-Assistant: {assistant_response}
+{conversation}
 
 Extract ONLY significant facts worth remembering, such as:
 - User's preferences, likes/dislikes
@@ -93,85 +137,270 @@ Example output format:
 
 Extracted learnings:"""
 
-        response = client.chat.completions.create(
-            model="llama-3.1-8b-instant",
-            messages=[
-                {"role": "system", "content": "You are a learning extraction system. Extract only meaningful, important facts from conversations that would be useful to remember in the future."},
-                {"role": "user", "content": extraction_prompt}
-            ],
-            max_tokens=200,
-            temperature=0.3,
-        )
-
-        result = response.choices[0].message.content.strip()
-        
-        # Parse the result
-        if result.upper() == "NONE" or not result:
-            return []
-        
-        # Extract learnings (each line starting with -)
-        learnings = []
-        for line in result.split('\n'):
-            line = line.strip()
-            if line.startswith('-'):
-                fact = line[1:].strip()
-                if fact and len(fact) > 5:  # Only keep substantial facts
-                    learnings.append(fact)
-        
-        return learnings
+    response = client.chat.completions.create(
+        model="llama-3.1-8b-instant",
+        messages=[
+            {"role": "system", "content": "You are a learning extraction system. Extract only meaningful, important facts from conversations that would be useful to remember in the future."},
+            {"role": "user", "content": extraction_prompt}
+        ],
+        max_tokens=200 + 100 * (len(turns) - 1),
+        temperature=0.3,
+    )
+
+    result = response.choices[0].message.content.strip()
     
-    except Exception as e:
-        print(f"Learning extraction error: {e}")
+    # Parse the result
+    if result.upper() == "NONE" or not result:
         return []
+    
+    # Extract learnings (each line starting with -)
+    learnings = []
+    for line in result.split('\n'):
+        line = line.strip()
+        if line.startswith('-'):
+            fact = line[1:].strip()
+            if fact and len(fact) > 5:  # Only keep substantial facts
+                learnings.append(fact)
+    
+    return learnings
 
 def add_learning(fact):
     """Add a new learning to memory."""
-    memory = load_learning_memory()
-    
-    # Create learning entry
-    entry = {
-        "fact": fact,
-        "timestamp": datetime.now().isoformat(),
-        "relevance_count": 1
-    }
-    
-    # Check if similar fact already exists (basic duplicate prevention)
-    fact_lower = fact.lower()
-    for existing in memory:
-        if existing["fact"].lower() == fact_lower:
-            # Update existing fact
-            existing["relevance_count"] += 1
-            existing["timestamp"] = datetime.now().isoformat()
-            save_learning_memory(memory)
-            return
-    
-    # Add new fact
-    memory.append(entry)
-    
-    # Keep only last 100 learnings (to prevent unlimited growth)
-    if len(memory) > 100:
-        memory = sorted(memory, key=lambda x: (x["relevance_count"], x["timestamp"]), reverse=True)[:100]
-    
-    save_learning_memory(memory)
+    add_learnings([fact])
+
+def add_learnings(facts):
+    """Add new learnings to memory with a single load and save."""
+    if not facts:
+        return
+
+    with memory_lock:
+        memory = load_learning_memory()
+
+        for fact in facts:
+            # Check if similar fact already exists (basic duplicate prevention)
+            fact_lower = fact.lower()
+            for existing in memory:
+                if existing["fact"].lower() == fact_lower:
+                    # Update existing fact
+                    existing["relevance_count"] += 1
+                    existing["timestamp"] = datetime.now().isoformat()
+                    break
+            else:
+                # Add new fact
+                memory.append({
+                    "fact": fact,
+                    "timestamp": datetime.now().isoformat(),
+                    "relevance_count": 1
+                })
+
+        # Keep only last 100 learnings (to prevent unlimited growth)
+        if len(memory) > 100:
+            memory = sorted(memory, key=lambda x: (x["relevance_count"], x["timestamp"]), reverse=True)[:100]
+
+        save_learning_memory(memory)
 
 def learn_from_conversation(user_query, assistant_response):
     """
-    Automatically learn from a conversation exchange.
-    This is called after each user-assistant interaction.
+    Automatically learn from a conversation exchange, synchronously.
+    Turns saved by ChatBot go through queue_conversation() instead.
     """
     learnings = extract_learnings(user_query, assistant_response)
-    
-    for learning in learnings:
-        add_learning(learning)
-    
+    add_learnings(learnings)
     return len(learnings)
 
+# ========== BACKGROUND LEARNING QUEUE ==========
+
+class LearningQueue:
+    """
+    Turns waiting for extraction, persisted to LearningQueue.jsonl so they
+    survive a restart. A worker thread sends them in batches; a batch
+    leaves the queue once its extraction succeeded, or is moved to
+    `failed_path` once it has failed MaxAttempts times.
+    """
+
+    def __init__(self, path, failed_path):
+        self.path = path
+        self.failed_path = failed_path
+        self.pending = []  # [{"q": ..., "a": ..., "t": ..., "n": failed attempts}] oldest first
+        self.last_added = time.monotonic()
+        self.stats = {"queued": 0, "batches": 0, "turns_learned": 0, "facts": 0, "errors": 0,
+                      "failures_in_a_row": 0, "failed_turns": 0, "dropped_turns": 0, "last_batch_seconds": None}
+        self.retry_at = 0.0  # time.monotonic() before which a failed batch is not retried.
+        self.cond = threading.Condition()
+        self.worker = None
+        self.busy = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self.pending.append(loads(line))
+                    except ValueError:
+                        continue  # Skip a torn line.
+        except FileNotFoundError:
+            pass
+        if len(self.pending) > MaxQueued:
+            self._drop_oldest()
+            self._rewrite()
+
+    def _drop_oldest(self):
+        """Drop the oldest turns beyond MaxQueued, never one of the batch being processed."""
+        start = BatchSize if self.busy else 0
+        excess = min(len(self.pending) - MaxQueued, len(self.pending) - start)
+        if excess > 0:
+            del self.pending[start:start + excess]
+            self.stats["dropped_turns"] += excess
+            print(f"Learning queue full, dropped the {excess} oldest turns")
+
+    def _rewrite(self):
+        # Keep only the turns still waiting.
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            f.writelines(dumps(item, ensure_ascii=False) + "\n" for item in self.pending)
+        os.replace(self.path + ".tmp", self.path)
+
+    def put(self, user_query, assistant_response):
+        item = {"q": user_query, "a": assistant_response, "t": datetime.now().isoformat()}
+        with self.cond:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(dumps(item, ensure_ascii=False) + "\n")
+            self.pending.append(item)
+            if len(self.pending) > MaxQueued:
+                self._drop_oldest()
+                self._rewrite()
+            self.last_added = time.monotonic()
+            self.stats["queued"] += 1
+            self.cond.notify_all()
+        self.start()
+
+    def start(self):
+        with self.cond:
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._work, name="LearningQueue", daemon=True)
+                self.worker.start()
+
+    def _next_batch(self):
+        """Wait until a batch is due, then return it (still in self.pending)."""
+        with self.cond:
+            while True:
+                if self.busy:
+                    self.cond.wait()  # flush() is processing a batch.
+                    continue
+                backoff = self.retry_at - time.monotonic()
+                if self.pending and backoff > 0:
+                    self.cond.wait(backoff)  # The last batch failed.
+                    continue
+                if len(self.pending) >= BatchSize:
+                    break
+                if self.pending:
+                    quiet = time.monotonic() - self.last_added
+                    if quiet >= IdleSeconds:
+                        break
+                    self.cond.wait(IdleSeconds - quiet)
+                else:
+                    self.cond.wait()
+            self.busy = True
+            return list(self.pending[:BatchSize])
+
+    def _process(self, batch):
+        """Learn from `batch`; returns False (and keeps it queued for a retry, up to MaxAttempts) if that failed."""
+        started = time.perf_counter()
+        try:
+            facts = extract_learnings_batch([(item["q"], item["a"]) for item in batch])
+            add_learnings(facts)
+        except Exception as e:
+            with self.cond:
+                self.busy = False
+                self.stats["errors"] += 1
+                for item in batch:
+                    item["n"] = item.get("n", 0) + 1
+                if max(item["n"] for item in batch) >= MaxAttempts:
+                    # Give up on this batch so the turns behind it are learned from.
+                    del self.pending[:len(batch)]
+                    self._rewrite()
+                    with open(self.failed_path, "a", encoding="utf-8") as f:
+                        f.writelines(dumps(item, ensure_ascii=False) + "\n" for item in batch)
+                    self.stats["failed_turns"] += len(batch)
+                    self.stats["failures_in_a_row"] = 0
+                    self.retry_at = 0.0
+                    self.cond.notify_all()
+                    print(f"Learning error, giving up on {len(batch)} turns after {MaxAttempts} attempts: {e}")
+                    return False
+                self._rewrite()  # Keep the attempt counts across a restart.
+                self.stats["failures_in_a_row"] += 1
+                delay = min(RetryMaxSeconds, RetrySeconds * 2 ** (self.stats["failures_in_a_row"] - 1))
+                self.retry_at = time.monotonic() + delay
+                self.cond.notify_all()
+            print(f"Learning error, retrying {len(batch)} turns in {delay:.0f}s: {e}")
+            return False
+        with self.cond:
+            del self.pending[:len(batch)]
+            self._rewrite()
+            self.busy = False
+            self.retry_at = 0.0
+            self.stats["failures_in_a_row"] = 0
+            self.stats["batches"] += 1
+            self.stats["turns_learned"] += len(batch)
+            self.stats["facts"] += len(facts)
+            self.stats["last_batch_seconds"] = round(time.perf_counter() - started, 3)
+            self.cond.notify_all()
+        return True
+
+    def _work(self):
+        while True:
+            self._process(self._next_batch())
+
+    def flush(self, timeout=None):
+        """
+        Process every waiting turn now. Returns True if the queue emptied within
+        `timeout`, False on timeout or when a batch failed (it stays queued).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.cond:
+                while self.busy:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self.cond.wait(remaining)
+                if not self.pending:
+                    return True
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                batch = list(self.pending[:BatchSize])
+                self.busy = True
+            if not self._process(batch):
+                return False
+
+    def depth(self):
+        with self.cond:
+            return len(self.pending)
+
+Queue = LearningQueue(LEARNING_QUEUE_PATH, LEARNING_FAILED_PATH)
+if Queue.pending:
+    Queue.start()  # Turns left over from the last run.
+
+def queue_conversation(user_query, assistant_response):
+    """Queue a finished exchange for background learning; returns immediately."""
+    Queue.put(user_query, assistant_response)
+
+def flush_learning_queue(timeout=None):
+    """Learn from every queued turn now (e.g. before exiting)."""
+    return Queue.flush(timeout)
+
+def get_learning_queue_stats():
+    """Queue depth and totals of the background learning queue."""
+    with Queue.cond:
+        return dict(Queue.stats, depth=len(Queue.pending), busy=Queue.busy)
+
 def get_relevant_learnings(max_facts=10):
     """
     Get the most relevant learnings to include in conversation context.
     Returns a formatted string of learned facts.
     """
-    memory = load_learning_memory()
+    with memory_lock:
+        memory = load_learning_memory()
     
     if not memory:
         return ""
@@ -194,7 +423,8 @@ def get_relevant_learnings(max_facts=10):
 
 def clear_learning_memory():
     """Clear all learned information."""
-    save_learning_memory([])
+    with memory_lock:
+        save_learning_memory([])
 
 # Test function
 if __name__ == "__main__":
@@ -0,0 +1,115 @@
+"""
+In-process status and message bus for Jarvis.
+
+Main.py, the GUI and the backends used to talk by rewriting small files in
+Frontend/Files (Status.data, Mic.data, Responses.data) which the GUI re-read
+on a timer. They now publish to typed topics on this bus instead:
+
+- STATUS      assistant status line ("Listening...", "Thinking...", ...)
+- MICROPHONE  "True" / "False" microphone switch
+- RESPONSES   text shown on the chat screen
+- IMAGE_JOBS  image-generation job status (a dict per update, no legacy file)
+- LIFECYCLE   startup milestones: "first_frame" (GUI drawn), "ready" (backends loaded)
+
+Subscribers are plain callables. The GUI subscribes Qt signal `emit` methods,
+so updates cross into the GUI thread as queued signals without disk I/O.
+
+Setting FILE_IPC_COMPAT = True in config.py keeps the old files in sync:
+every publish is mirrored to its file and reads go through the file, so
+external tools that still read or write Frontend/Files keep working.
+"""
+
+import os
+import threading
+from dataclasses import dataclass
+import config  # Import centralized configuration
+import app_paths  # Import for correct file paths
+
+
+@dataclass(frozen=True)
+class Topic:
+    """A named bus channel carrying values of a single type."""
+    name: str
+    type: type
+    filename: str = ""  # Legacy Frontend/Files file mirrored in compatibility mode
+    default: object = ""
+
+
+STATUS = Topic("status", str, "Status.data")
+MICROPHONE = Topic("microphone", str, "Mic.data", "False")
+RESPONSES = Topic("responses", str, "Responses.data")
+IMAGE_JOBS = Topic("image_jobs", dict, default=None)
+LIFECYCLE = Topic("lifecycle", str)
+
+_lock = threading.Lock()
+_subscribers = {}  # Topic -> list of callbacks
+_values = {}  # Topic -> last published value
+
+# File-based IPC compatibility mode (opt-in).
+_file_compat = bool(getattr(config, "FILE_IPC_COMPAT", False))
+
+
+def enable_file_compat(enabled=True):
+    """Turn mirroring to the legacy Frontend/Files data files on or off."""
+    global _file_compat
+    _file_compat = enabled
+
+
+def file_compat_enabled():
+    return _file_compat
+
+
+def _file_path(topic):
+    return os.path.join(app_paths.FRONTEND_FILES_DIR, topic.filename)
+
+
+def subscribe(topic, callback):
+    """
+    Call `callback(value)` on every publish to `topic`.
+    Returns a function that removes the subscription.
+    """
+    with _lock:
+        _subscribers.setdefault(topic, []).append(callback)
+
+    def unsubscribe():
+        with _lock:
+            if callback in _subscribers.get(topic, []):
+                _subscribers[topic].remove(callback)
+
+    return unsubscribe
+
+
+def publish(topic, value):
+    """Store `value` as the topic's current value and deliver it to subscribers."""
+    if not isinstance(value, topic.type):
+        raise TypeError(f"Topic '{topic.name}' expects {topic.type.__name__}, got {type(value).__name__}")
+
+    with _lock:
+        _values[topic] = value
+        callbacks = list(_subscribers.get(topic, []))
+
+    if _file_compat and topic.filename:
+        try:
+            with open(_file_path(topic), "w", encoding="utf-8") as f:
+                f.write(value)
+        except Exception as e:
+            print(f"[MessageBus] Could not mirror {topic.name} to {topic.filename}: {e}")
+
+    for callback in callbacks:
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"[MessageBus] Subscriber error on '{topic.name}': {e}")
+
+
+def get(topic):
+    """Return the topic's current value (read from its file in compatibility mode)."""
+    if _file_compat and topic.filename:
+        try:
+            with open(_file_path(topic), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+
+    with _lock:
+        return _values.get(topic, topic.default)
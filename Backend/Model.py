@@ -1,6 +1,16 @@
 import cohere  # Import the Cohere library for AI services.
 from rich import print  # Import the Rich library for enhanced terminal output.
+import threading  # Import threading to guard the decision counters.
+import atexit  # Import atexit to write pending cache changes on shutdown.
+import json  # Import json for the on-disk decision cache.
+import os  # Import os for atomic cache file replacement.
+import time  # Import time for cache entry ages.
+from collections import OrderedDict  # Import OrderedDict for LRU ordering.
+from concurrent.futures import ThreadPoolExecutor  # Import the thread pool for batch classification.
 import config  # Import configuration file with hardcoded settings
+import app_paths  # Import for correct file paths
+from Backend.FastIntent import ClassifyFast, Normalize  # Local rules for commands that need no remote model.
+from Backend import IntentModel  # Locally trained classifier and the decision log it learns from.
 
 # Load configuration from config.py
 CohereAPIKey = config.COHERE_API_KEY
@@ -8,6 +18,168 @@ CohereAPIKey = config.COHERE_API_KEY
 # Create a Cohere client using the provided API key.
 co = cohere.Client(api_key=CohereAPIKey)
 
+# Minimum local-rule confidence for skipping the Cohere call (above 1 disables the fast path).
+FastPathMinConfidence = getattr(config, "FASTPATH_MIN_CONFIDENCE", 0.9)
+
+# Decision counters: how many queries the fast path answered without Cohere.
+DecisionStatsLock = threading.Lock()
+DecisionStats = {"calls": 0, "fast_path": 0, "cache": 0, "local_model": 0, "remote": 0,
+                 "last_source": None, "last_confidence": None}
+
+def GetDecisionStats():
+    """Return decision counters, including calls avoided by the local fast path."""
+    with DecisionStatsLock:
+        stats = dict(DecisionStats)
+    stats["avoided_calls"] = stats["fast_path"] + stats["cache"] + stats["local_model"]
+    stats["fast_path_rate"] = stats["fast_path"] / stats["calls"] if stats["calls"] else 0.0
+    return stats
+
+def _record_decision(source, confidence):
+    with DecisionStatsLock:
+        DecisionStats["calls"] += 1
+        DecisionStats[source] += 1
+        DecisionStats["last_source"] = source
+        DecisionStats["last_confidence"] = confidence
+
+# Tasks whose wording depends on when they were asked are never cached.
+UncachedTasks = ("realtime", "reminder")
+
+class DecisionCache:
+    """
+    Bounded LRU cache of FirstLayerDMM decisions with a time-to-live, keyed on
+    the normalized query and persisted as compact JSON so it survives restarts.
+    New entries are written at most once every `save_seconds` (0 writes on
+    every Put) and by Flush(), which also runs at interpreter exit.
+    """
+
+    def __init__(self, path, max_entries=500, ttl_seconds=7 * 24 * 3600, save_seconds=30):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.save_seconds = save_seconds
+        self.entries = OrderedDict()  # Normalized query -> (tasks, stored_at)
+        self.counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0, "skipped": 0,
+                         "saves": 0}
+        self.lock = threading.Lock()
+        self.dirty = False  # Entries stored since the last save.
+        self._timer = None
+        self._load()
+
+    @staticmethod
+    def Key(query):
+        return Normalize(query)
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        now = time.time()
+        for key, tasks, stored_at in data.get("entries", []):
+            if now - stored_at < self.ttl_seconds:
+                self.entries[key] = (tasks.split(", "), stored_at)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def _save(self):
+        # Called with self.lock held. One [query, "task, task", unix time] triple per entry, oldest first.
+        self.dirty = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.counters["saves"] += 1
+        data = {"version": 1, "entries": [[key, ", ".join(tasks), int(stored_at)]
+                                          for key, (tasks, stored_at) in self.entries.items()]}
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"[WARNING] Could not save the decision cache: {e}")
+
+    def Get(self, query):
+        key = self.Key(query)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.time() - entry[1] >= self.ttl_seconds:
+                del self.entries[key]
+                self.counters["expired"] += 1
+                entry = None
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            self.entries.move_to_end(key)
+            self.counters["hits"] += 1
+            return list(entry[0])
+
+    def Put(self, query, tasks):
+        key = self.Key(query)
+        if not key or not tasks or any(task.startswith(UncachedTasks) for task in tasks):
+            with self.lock:
+                self.counters["skipped"] += 1
+            return
+        with self.lock:
+            self.entries[key] = (list(tasks), time.time())
+            self.entries.move_to_end(key)
+            self.counters["stores"] += 1
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.counters["evictions"] += 1
+            if not self.save_seconds:
+                self._save()
+                return
+            self.dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_seconds, self.Flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def Flush(self):
+        """Write entries stored since the last save."""
+        with self.lock:
+            if self.dirty:
+                self._save()
+
+    def Clear(self):
+        with self.lock:
+            self.entries.clear()
+            self._save()
+
+    def Stats(self):
+        with self.lock:
+            stats = dict(self.counters, size=len(self.entries), max_entries=self.max_entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+# Decision cache (DMM_CACHE_SIZE entries, DMM_CACHE_TTL_HOURS hours, new entries written every
+# DMM_CACHE_SAVE_SECONDS seconds; size 0 disables it).
+DecisionCacheSize = getattr(config, "DMM_CACHE_SIZE", 500)
+Cache = DecisionCache(
+    app_paths.get_data_path("DecisionCache.json"),
+    max_entries=DecisionCacheSize,
+    ttl_seconds=getattr(config, "DMM_CACHE_TTL_HOURS", 7 * 24) * 3600,
+    save_seconds=getattr(config, "DMM_CACHE_SAVE_SECONDS", 30),
+) if DecisionCacheSize else None
+if Cache is not None:
+    atexit.register(Cache.Flush)
+
+# Log remote decisions for training (DMM_LOG_DECISIONS) and serve from the trained
+# local model once Data/IntentModel.npz exists (INTENT_MODEL_ENABLED; needs NumPy).
+LogDecisions = getattr(config, "DMM_LOG_DECISIONS", True)
+LocalModelEnabled = getattr(config, "INTENT_MODEL_ENABLED", True) and IntentModel.Available
+
+def GetDecisionCacheStats():
+    """Return decision cache hit/miss counters, or None when the cache is disabled."""
+    return Cache.Stats() if Cache is not None else None
+
+def FlushDecisionCache():
+    """Write pending decision cache entries now (exits through os._exit skip atexit)."""
+    if Cache is not None:
+        Cache.Flush()
+
 # Define a list of recognized functions keywords for task categorization.
 funcs = [
     "exit", "general", "realtime", "open", "close", "play",
@@ -73,54 +245,124 @@ ChatHistory = [
 
 # Define the main function for decision-making on queries.
 def FirstLayerDMM(prompt: str = "test"):
-    # Add the user's query to the message list.                           
+    # Collect the whole decision; see FirstLayerDMMStream for the incremental version.
+    return list(FirstLayerDMMStream(prompt))
+
+def _local_decision(prompt):
+    """Return (source, confidence, tasks) from the fast path, cache or local model, or tasks=None."""
+    # Commands fully determined by their wording are classified locally.
+    fast = ClassifyFast(prompt)
+    if fast.tasks and fast.confidence >= FastPathMinConfidence:
+        return "fast_path", fast.confidence, fast.tasks
+
+    # Phrasings seen before reuse their earlier decision.
+    if Cache is not None:
+        cached = Cache.Get(prompt)
+        if cached is not None:
+            return "cache", None, cached
+
+    # A locally trained model answers the general/realtime queries it is sure about.
+    if LocalModelEnabled:
+        local, confidence = IntentModel.ClassifyLocal(prompt)
+        if local is not None:
+            return "local_model", confidence, local
+
+    return "remote", fast.confidence, None
+
+def FirstLayerDMMStream(prompt: str = "test", on_remote=None):
+    """
+    Yield the decision's tasks one at a time. Local decisions arrive at once;
+    remote ones arrive as soon as Cohere has finished writing each task, so
+    the first command can start while the rest is still being generated.
+    on_remote, if given, is called just before the query is sent to Cohere.
+    """
+    source, confidence, tasks = _local_decision(prompt)
+    _record_decision(source, confidence)
+    if tasks is not None:
+        yield from tasks
+        return
+
+    if on_remote is not None:
+        on_remote()
+
+    decision = []
+    for task in RemoteDMMStream(prompt):
+        decision.append(task)
+        yield task
+
+    # Only a complete decision is cached and logged.
+    if Cache is not None:
+        Cache.Put(prompt, decision)
+    if LogDecisions:
+        IntentModel.LogDecision(prompt, decision)  # Training data for the local model.
+
+def _valid_task(task):
+    # Keep only tasks that start with a recognized function keyword.
+    return any(task.startswith(func) for func in funcs)
+
+# Classify a query with the remote Cohere model, yielding each task as soon as it is complete.
+def RemoteDMMStream(prompt: str = "test"):
+    # Add the user's query to the message list.
     messages.append({"role": "user", "content": f"{prompt}"})
-    
+
     # Create a streaming chat session with the cohere model.
     stream = co.chat_stream(
         model= 'command-r-plus-08-2024',  # Specify the Cohere model to use.
         message=prompt,  # Pass the user's query.
         temperature=0.7,  # Set the creativity level of the model.
         chat_history=ChatHistory,  # Provide the predefined chat history for context.
-        prompt_truncation='OFF',  # Ensure the prompt is not truncated. 
+        prompt_truncation='OFF',  # Ensure the prompt is not truncated.
         connectors=[],  # No additional connectors are used.
         preamble=preamble  # Pass the detailed instruction preamble.
     )
 
-    # Initialize an empty string to store the generated response.
-    response = ""
+    # Text after the last comma: the task still being generated.
+    pending = ""
 
-    # Iterate over events in the stream and capture text generation events.
+    # Tasks are comma separated, so every comma completes the task before it.
     for event in stream:
         if event.event_type == "text-generation":
-            response += event.text  # Append the generated text to the response.
-
-    # Remove newline characters and split responses into individual tasks.
-    response = response.replace("\n", "")
-    response = response.split(",")
-
-    #  Strip leading and trailing whitespace from each task.
-    response = [i.strip() for i in response]
-
-    # Initialize an empty list to filter valid tasks.
-    temp = []
+            pending += event.text.replace("\n", "")
+            *complete, pending = pending.split(",")
+            for task in complete:
+                task = task.strip()
+                if _valid_task(task):
+                    yield task
 
-    # Filter the task based on recognized function keywords.
-    for task in response:
-        for func in funcs:
-            if task.startswith(func):
-                temp.append(task)  # Add valid tasks to the filtered list.
+    # The last task has no trailing comma.
+    task = pending.strip()
+    if _valid_task(task):
+        yield task
 
-    # Update the response with the filtered list of tasks.
-    response = temp
+# Classify a query with the remote Cohere model.
+def RemoteDMM(prompt: str = "test"):
+    response = list(RemoteDMMStream(prompt))
 
     # If '(query)' is in the response, recursively call the function for further clarification.
     if "(query)" in response:
-        newresponse = FirstLayerDMM(prompt=prompt)
+        newresponse = RemoteDMM(prompt=prompt)
         return newresponse  # Return the clarified response.
     else:
         return response  # Return the filtered response.
-            
+
+def ClassifyBatch(prompts, concurrency=8, classify=None):
+    """
+    Classify many queries concurrently, at most `concurrency` at a time, with
+    `classify` (default: RemoteDMM, so the fast path and caches are bypassed).
+    Returns one (tasks, seconds, error) tuple per query, in input order.
+    """
+    classify = classify or RemoteDMM
+
+    def one(prompt):
+        started = time.perf_counter()
+        try:
+            return classify(prompt), time.perf_counter() - started, None
+        except Exception as e:
+            return [], time.perf_counter() - started, f"{type(e).__name__}: {e}"
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="dmm-batch") as pool:
+        return list(pool.map(one, prompts))
+
 # Entry point for the script.
 if __name__ == "__main__":
     # Continuously prompt the user for input and process it.
@@ -0,0 +1,172 @@
+"""
+Latency-aware model routing for Groq answers.
+
+ChatBot was hard-wired to the small model, and RealtimeSearchEngine and
+Automation.Content to the large one, whatever the query. Route() now picks
+the model for each request from:
+
+- the query: greetings and other short chit-chat always get the small
+  model; long or demanding questions ("explain", "compare", code, ...)
+  ask for the large one
+- the intent: "general" prefers the small model, "realtime" (answering
+  from search results) and "content" (writing letters, code, essays)
+  prefer the large one, and "voice" (the short spoken summary of voice
+  mode, Backend.VoiceAnswer) always uses the small one
+- live latency: LLMProvider reports every streamed request's time to first
+  chunk per model. When the preferred large model's recent p50 is over the
+  intent's latency budget, the request goes to the small model instead.
+  Samples expire after LLM_ROUTER_SAMPLE_TTL seconds, so a slow spell is
+  not held against a model forever.
+- health: a model whose circuit breaker is open (Backend.Resilience) is
+  skipped.
+
+Every decision is kept with its reason and the numbers behind it:
+
+    model, decision = ModelRouter.Route(Query, "general")
+    ModelRouter.GetDecisions()   # the latest decisions, newest last
+    ModelRouter.GetStats()       # counts per model / intent and latency per model
+
+They are also marked on the current trace ("route"), served by the API
+server at GET /router, and printed for a query from the command line:
+
+    python -m Backend.ModelRouter "explain how transformers work" [--intent realtime]
+
+CONFIG (config.py, all optional):
+    LLM_SMALL_MODEL          fast model (default "llama-3.1-8b-instant")
+    LLM_LARGE_MODEL          capable model (default "llama-3.3-70b-versatile")
+    LLM_LATENCY_BUDGET_MS    {intent: first-chunk budget in ms}
+                             (default general 900, realtime 1500, content 4000, voice 600)
+    LLM_ROUTER_LONG_WORDS    queries this long ask for the large model (default 25)
+    LLM_ROUTER_SAMPLE_TTL    seconds a latency sample counts (default 300)
+"""
+
+import collections
+import re
+import threading
+import time
+import config  # Import centralized configuration
+from Backend import Resilience  # Circuit breaker state per model
+from Backend import Tracing  # Per-stage latency tracing
+
+SmallModel = getattr(config, "LLM_SMALL_MODEL", "llama-3.1-8b-instant")
+LargeModel = getattr(config, "LLM_LARGE_MODEL", "llama-3.3-70b-versatile")
+LatencyBudgetMs = dict({"general": 900, "realtime": 1500, "content": 4000, "voice": 600},
+                       **getattr(config, "LLM_LATENCY_BUDGET_MS", {}))
+LongWords = getattr(config, "LLM_ROUTER_LONG_WORDS", 25)
+SampleTTL = getattr(config, "LLM_ROUTER_SAMPLE_TTL", 300)
+
+# Intents whose answers are worth the large model by default.
+LargeIntents = ("realtime", "content")
+
+Window = 20  # Latency samples kept per model.
+KeptDecisions = 100
+
+_ChitChat = re.compile(
+    r"^(hi|hello|hey|yo|thanks|thank you|ok|okay|cool|nice|great|bye|goodbye|good (morning|afternoon|evening|night)"
+    r"|how are you|how's it going|what's up|who are you|what is your name)\b")
+_Demanding = re.compile(
+    r"\b(explain|compare|comparison|difference|differences|analy[sz]e|analysis|why|step by step|in detail|detailed"
+    r"|pros and cons|code|program|function|algorithm|essay|summari[sz]e|derive|prove|calculate|plan)\b")
+
+_lock = threading.Lock()
+_samples = collections.defaultdict(lambda: collections.deque(maxlen=Window))  # model -> (time, ms)
+_decisions = collections.deque(maxlen=KeptDecisions)
+_counts = collections.Counter()
+
+
+def Observe(model, first_chunk_ms):
+    """Record one request's time to first chunk for `model` (called by LLMProvider)."""
+    with _lock:
+        _samples[model].append((time.monotonic(), round(first_chunk_ms, 1)))
+
+
+def _recent(model):
+    cutoff = time.monotonic() - SampleTTL
+    with _lock:
+        return [ms for at, ms in _samples.get(model, ()) if at >= cutoff]
+
+
+def Expected(model):
+    """Recent p50 time to first chunk for `model` in ms, or None without recent samples."""
+    return Tracing.Percentile(_recent(model), 50)
+
+
+def _healthy(model):
+    return not Resilience.Executor.Breaker(model).is_open()
+
+
+def Decide(Query, Intent="general"):
+    """The routing decision for one request, without recording it."""
+    text = Query.lower().strip()
+    words = len(text.split())
+    budget = LatencyBudgetMs.get(Intent, LatencyBudgetMs["general"])
+    expected = {SmallModel: Expected(SmallModel), LargeModel: Expected(LargeModel)}
+
+    if Intent == "voice":
+        model, reason = SmallModel, "spoken summaries need the fastest first token"
+    elif _ChitChat.match(text) and words <= 8:
+        model, reason = SmallModel, "short chit-chat"
+    elif Intent in LargeIntents:
+        model, reason = LargeModel, f"{Intent} answers prefer the large model"
+    elif _Demanding.search(text):
+        model, reason = LargeModel, "demanding question"
+    elif words >= LongWords:
+        model, reason = LargeModel, f"long query ({words} words)"
+    else:
+        model, reason = SmallModel, "short general question"
+
+    if model == LargeModel:
+        if expected[LargeModel] is not None and expected[LargeModel] > budget:
+            model, reason = SmallModel, f"{reason}, but it is over the {budget} ms budget ({expected[LargeModel]:.0f} ms)"
+        elif not _healthy(LargeModel) and _healthy(SmallModel):
+            model, reason = SmallModel, f"{reason}, but its circuit is open"
+    elif not _healthy(SmallModel) and _healthy(LargeModel):
+        model, reason = LargeModel, f"{reason}, but the small model's circuit is open"
+
+    return {"intent": Intent, "model": model, "reason": reason, "words": words, "budget_ms": budget,
+            "expected_ms": {name: (round(ms, 1) if ms is not None else None) for name, ms in expected.items()}}
+
+
+def Route(Query, Intent="general"):
+    """Pick the model for one request. Returns (model, decision)."""
+    decision = Decide(Query, Intent)
+    decision["ts"] = time.time()
+    decision["query"] = Query[:80]
+    with _lock:
+        _decisions.append(decision)
+        _counts[(Intent, decision["model"])] += 1
+    Tracing.Mark("route", once=False, intent=Intent, model=decision["model"], reason=decision["reason"])
+    return decision["model"], decision
+
+
+def GetDecisions(limit=20):
+    """The latest routing decisions, newest last."""
+    with _lock:
+        return [dict(decision) for decision in list(_decisions)[-limit:]]
+
+
+def GetStats():
+    """Requests routed per intent and model, and recent first-chunk latency per model."""
+    with _lock:
+        counts = dict(_counts)
+        models = list(_samples)
+    routed = collections.defaultdict(dict)
+    for (intent, model), count in counts.items():
+        routed[intent][model] = count
+    latency = {}
+    for model in models:
+        values = _recent(model)
+        latency[model] = {"samples": len(values), "p50_ms": Tracing.Percentile(values, 50),
+                          "p95_ms": Tracing.Percentile(values, 95)}
+    return {"routed": dict(routed), "latency": latency, "budget_ms": dict(LatencyBudgetMs)}
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Show which model a query would be routed to.")
+    parser.add_argument("query")
+    parser.add_argument("--intent", default="general", choices=["general", "realtime", "content", "voice"])
+    args = parser.parse_args()
+    print(json.dumps(Decide(args.query, args.intent), indent=4))
@@ -1,32 +1,32 @@
 from googlesearch import search 
-from groq import Groq  # Importing the Groq library to use its API.
-from json import load, dump  # Importing function to read and write JSON files.
+import asyncio  # Importing asyncio for the async streaming variant.
 import datetime  # Importing the datetime module for real-time date and time information.
-from Backend.LearningSystem import learn_from_conversation, get_relevant_learnings  # Import learning system
+import time  # Importing time to measure first-token latency.
+from Backend.LearningSystem import get_relevant_learnings  # Import learning system
+from Backend.Chatbot import SaveChatTurn, UnavailableAnswer  # Shared chat log writer
+from Backend.ContextBuilder import BuildContext  # Token-budgeted prompt assembly
 import config  # Import centralized configuration
-import app_paths  # Import for correct file paths
+from Backend import MessageBus  # In-process status bus shared with the GUI
+from Backend import Tracing  # Per-stage latency tracing
+from Backend import LLMProvider  # Shared, rate-limited Groq client
+from Backend import ModelRouter  # Latency-aware model choice per query
+from Backend.Resilience import LLMUnavailable  # Raised once retries and failover are exhausted
+from Backend.TokenStream import AnswerCleaner, CloseAsyncStream  # Incremental answer clean-up
 
 # Load configuration from config.py
 Username = config.USERNAME
 Assistantname = config.ASSISTANT_NAME
 GroqAPIKey = config.GROQ_API_KEY
 
-# Initialize the Groq client with the provided API key.
-client = Groq(api_key=GroqAPIKey)
+# The answer the user is waiting for: full priority on the shared Groq client.
+client = LLMProvider.Client(LLMProvider.INTERACTIVE)
+async_client = LLMProvider.Client(LLMProvider.INTERACTIVE, is_async=True)
 
 # Define the system instructions for the chatbot.
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which has real-time up-to-date information from the internet.
 *** Provide Answers In a Professional Way, make sure to add full stops, commas, question marks, and use proper grammar.***
 *** Just answer the question from the provided data in a professional way. ***"""
 
-# Try to load the chat log from a JSON file, or create an empty one if it doesn't exist.
-try:
-    with open(app_paths.get_data_path("ChatLog.json"), "r") as f:
-        messages = load(f)  
-except:
-    with open(app_paths.get_data_path("ChatLog.json"), "w") as f:
-        dump([], f)
-
 # Function to perform a Google search and format the results.
 def GoogleSearch(query):
     search_results = search(query)
@@ -76,78 +76,129 @@ def Information():
     data += f"Time: {hour} hour, {minute} minutes, {second} second.\n"
     return data
 
-# Function to handle real-time search and response generation.
-# Import the SetAssistantStatus function path.
-import os
-
+# Function to publish the assistant's status on the message bus.
 def SetAssistantStatus(Status):
-    with open(os.path.join(app_paths.FRONTEND_FILES_DIR, 'Status.data'), "w", encoding='utf-8') as file:
-        file.write(Status)
+    MessageBus.publish(MessageBus.STATUS, Status)
 
-def RealtimeSearchEngine(prompt):
-    global SystemChatBot, messages
-
-    SetAssistantStatus("Searching...")
-
-    # Load the chat log from the JSON file.
-    with open(app_paths.get_data_path("ChatLog.json"), "r") as f:
-        messages = load(f)
-    messages.append({
-        "role": "user",
-        "content": f"{prompt}",
-        "timestamp": datetime.datetime.now().isoformat()
-    })    
-
-    # Add Google search result to the system chatbot messages.
-    SystemChatBot.append({"role": "system", "content": GoogleSearch(prompt)})
+# Build the messages for one real-time search request.
+def RealtimeSearchMessages(prompt):
+    """System prompt, Google results, recent history within the token budget, and the prompt."""
+    # Add Google search result to this request's system messages.
+    with Tracing.Span("web_search"):
+        search_messages = SystemChatBot + [{"role": "system", "content": GoogleSearch(prompt)}]
 
     # Get learned facts for context
     learned_ctx = get_relevant_learnings()
     context_messages = [{"role": "system", "content": Information() + learned_ctx}] if learned_ctx else [{"role": "system", "content": Information()}]
 
-    # Strip timestamps from messages before sending to API (API doesn't support timestamp field)
-    api_messages = [{"role": msg["role"], "content": msg["content"]} for msg in messages]
+    # Recent chat history that fits the token budget, followed by the prompt.
+    return BuildContext(search_messages + context_messages, prompt, Name="realtime")
+
+# Request parameters shared by the sync and async streams (the model is picked per query by ModelRouter).
+SearchParameters = dict(
+    temperature=0.7,
+    max_tokens=2048,
+    top_p=1,
+    stream=True,
+    stop=None
+)
+
+# Streaming real-time search: yields the answer while Groq generates it.
+def RealtimeSearchEngineStream(prompt):
+    """
+    Answer `prompt` from Google search results, yielding the response chunk by chunk,
+    already cleaned like AnswerModifier(Answer.strip()).
+    The full exchange is saved to the chat log once the stream is exhausted.
+    """
 
-    # Generate a response using Groq client.
-    completion = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=SystemChatBot + context_messages + api_messages,
-        temperature=0.7,
-        max_tokens=2048,
-        top_p=1,
-        stream=True,
-        stop=None
-    )
+    SetAssistantStatus("Searching...")
+    AskedAt = datetime.datetime.now().isoformat()
+    messages, usage = RealtimeSearchMessages(prompt)
+    SearchModel, _ = ModelRouter.Route(prompt, "realtime")
 
     Answer =""
-
-    # Concatenate response chunks from the streaming output.
-    for chunks in completion:
-        if chunks.choices[0].delta.content:
-            Answer += chunks.choices[0].delta.content
-
-    # Clean up the response.
+    Cleaner = AnswerCleaner(strip=True)
+
+    with Tracing.Span("groq_completion", model=SearchModel, prompt_tokens=usage["total_tokens"],
+                      history_messages=usage["history_messages"]) as Trace:
+        # Generate a response using Groq client.
+        Started = LastChunk = time.perf_counter()
+        completion = client.chat.completions.create(model=SearchModel, messages=messages, **SearchParameters)
+
+        # Hand each streamed chunk to the caller while building the full answer.
+        try:
+            for chunks in completion:
+                LastChunk = time.perf_counter()  # Time spent by the caller between chunks is not Groq's.
+                if chunks.choices[0].delta.content:
+                    if not Answer:
+                        Tracing.Mark("first_token")
+                        Trace["first_token_ms"] = round((time.perf_counter() - Started) * 1000, 3)
+                    Answer += chunks.choices[0].delta.content
+                    Text = Cleaner.feed(chunks.choices[0].delta.content)
+                    if Text:
+                        yield Text
+            Text = Cleaner.finish()
+            if Text:
+                yield Text
+        finally:
+            if hasattr(completion, "close"):
+                completion.close()
+            Trace["duration_ms"] = round((LastChunk - Started) * 1000, 3)
+
+    # Clean up the response, then save the exchange and learn from it.
     Answer = Answer.strip().replace("</s>", "")
-    messages.append({
-        "role": "assistant",
-        "content": Answer,
-        "timestamp": datetime.datetime.now().isoformat()
-    })
+    SaveChatTurn(prompt, Answer, AskedAt)
 
-    # Save the updated chat log back to the JSON file.
-    with open(app_paths.get_data_path("ChatLog.json"), "w") as f:
-        dump(messages, f, indent=4)
+    SetAssistantStatus("")
 
-    # Automatically learn from this conversation
-    try:
-        learn_from_conversation(prompt, Answer)
-    except Exception as learning_error:
-        print(f"Learning error: {learning_error}")  # Don't fail if learning fails
+# Async streaming real-time search through the shared async Groq client.
+async def RealtimeSearchEngineAsyncStream(prompt):
+    """Async-iterator variant of RealtimeSearchEngineStream, for callers running an event loop."""
+    SetAssistantStatus("Searching...")
+    AskedAt = datetime.datetime.now().isoformat()
+    # The search and the chat log reads block, so they run off the event loop.
+    messages, usage = await asyncio.to_thread(RealtimeSearchMessages, prompt)
+    SearchModel, _ = ModelRouter.Route(prompt, "realtime")
+
+    Answer = ""
+    Cleaner = AnswerCleaner(strip=True)
+
+    with Tracing.Span("groq_completion", model=SearchModel, prompt_tokens=usage["total_tokens"],
+                      history_messages=usage["history_messages"], mode="async") as Trace:
+        Started = LastChunk = time.perf_counter()
+        completion = await async_client.chat.completions.create(model=SearchModel, messages=messages, **SearchParameters)
+        try:
+            async for chunks in completion:
+                LastChunk = time.perf_counter()
+                if chunks.choices[0].delta.content:
+                    if not Answer:
+                        Tracing.Mark("first_token")
+                        Trace["first_token_ms"] = round((time.perf_counter() - Started) * 1000, 3)
+                    Answer += chunks.choices[0].delta.content
+                    Text = Cleaner.feed(chunks.choices[0].delta.content)
+                    if Text:
+                        yield Text
+            Text = Cleaner.finish()
+            if Text:
+                yield Text
+        finally:
+            await CloseAsyncStream(completion)
+            Trace["duration_ms"] = round((LastChunk - Started) * 1000, 3)
+
+    await asyncio.to_thread(SaveChatTurn, prompt, Answer.strip().replace("</s>", ""), AskedAt)
 
-    # Remove the most recent syste message from the chatbot conversation.
-    SystemChatBot.pop()
     SetAssistantStatus("")
-    return AnswerModifier(Answer=Answer)
+
+# Function to handle real-time search and response generation.
+def RealtimeSearchEngine(prompt):
+    try:
+        Answer = "".join(RealtimeSearchEngineStream(prompt))
+    except LLMUnavailable as e:
+        # Retries and failover are already exhausted (Backend.Resilience); the chat log is left as it is.
+        print(f"Error: {e}")
+        SetAssistantStatus("")
+        return UnavailableAnswer
+    return AnswerModifier(Answer=Answer.strip())
 
 # Main entry point of the program for interactive querying.
 if __name__ == "__main__":
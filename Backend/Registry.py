@@ -0,0 +1,123 @@
+"""
+Lazy backend registry for Jarvis.
+
+Importing a backend is expensive: SpeechToText starts a browser, the shared
+Groq client (LLMProvider) opens its first connection, Model builds a Cohere
+client, and Automation/TextToSpeech/ImageGeneration pull in BeautifulSoup,
+AppOpener, keyboard, pygame and PIL.
+Main.py used to do all of that before the window appeared.
+
+Main.py now refers to backend functions through Lazy("chatbot", "ChatBot")
+style proxies. A backend is imported the first time one of its functions is
+called, or earlier by WarmUp(), which loads every registered backend on a
+background thread once the window has been drawn. Loads are serialized per
+backend, so a call that arrives during warm-up simply waits for it.
+
+LoadTimes() reports how long each backend took to load.
+"""
+
+import importlib
+import threading
+import time
+
+
+class LazyBackend:
+    """A backend module that is imported (and optionally warmed) on first use."""
+
+    def __init__(self, name, module, warm=None):
+        self.name = name
+        self.module_name = module
+        self.warm = warm  # Optional callable(module) run right after import, e.g. to start a driver.
+        self.module = None
+        self.load_seconds = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self):
+        return self.module is not None
+
+    def load(self):
+        if self.module is not None:
+            return self.module
+        with self._lock:
+            if self.module is None:
+                started = time.perf_counter()
+                module = importlib.import_module(self.module_name)
+                if self.warm is not None:
+                    self.warm(module)
+                self.load_seconds = time.perf_counter() - started
+                self.module = module
+        return self.module
+
+
+class LazyFunction:
+    """Callable stand-in for a backend function that loads its backend on the first call."""
+
+    def __init__(self, backend, attr):
+        self.backend = backend
+        self.attr = attr
+
+    def __call__(self, *args, **kwargs):
+        return getattr(self.backend.load(), self.attr)(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy {self.backend.module_name}.{self.attr}>"
+
+
+# Registered backends, in warm-up order (the slowest and first-needed first).
+_backends = {}
+
+
+def Register(name, module, warm=None):
+    backend = _backends.get(name)
+    if backend is None:
+        backend = _backends[name] = LazyBackend(name, module, warm)
+    return backend
+
+
+Register("speech", "Backend.SpeechToText", warm=lambda module: module.GetDriver())
+Register("llm", "Backend.LLMProvider", warm=lambda module: module.Prewarm())
+Register("tts", "Backend.TextToSpeech")
+Register("model", "Backend.Model")
+Register("chatbot", "Backend.Chatbot")
+Register("realtime", "Backend.RealtimeSearchEngine")
+Register("speculation", "Backend.Speculation")
+Register("voice", "Backend.VoiceAnswer")
+Register("automation", "Backend.Automation")
+Register("image", "Backend.ImageGeneration")
+Register("learning", "Backend.LearningSystem")
+
+
+def Get(name):
+    """Return the backend's module, importing it if needed."""
+    return _backends[name].load()
+
+
+def Lazy(name, attr):
+    """Return a callable proxy for `attr` of the named backend."""
+    return LazyFunction(_backends[name], attr)
+
+
+def WarmUp(names=None, on_done=None):
+    """
+    Load the named backends (default: all, in registration order) on a daemon
+    thread, then call on_done(LoadTimes()). Load errors are printed and left
+    for the first real call to raise again.
+    """
+    def warm():
+        for name in names or list(_backends):
+            try:
+                _backends[name].load()
+            except Exception as e:
+                print(f"[WARNING] Could not preload backend '{name}': {e}")
+        if on_done is not None:
+            on_done(LoadTimes())
+
+    thread = threading.Thread(target=warm, name="BackendWarmUp", daemon=True)
+    thread.start()
+    return thread
+
+
+def LoadTimes():
+    """Seconds each loaded backend took to import and warm, by name."""
+    return {name: round(b.load_seconds, 3) for name, b in _backends.items() if b.load_seconds is not None}
@@ -0,0 +1,399 @@
+"""
+Bounded retries, circuit breakers and model failover for Groq requests.
+
+Chatbot.ChatBot used to answer any exception by wiping the chat log and
+calling itself again, with no limit: one transient API error could destroy
+the history and loop forever. Every Groq request made through
+LLMProvider.Client now runs through the shared ResilientExecutor instead:
+
+- a failed attempt is retried with capped exponential backoff (full jitter),
+  at most LLM_RETRIES times per model
+- every attempt gets its own timeout (LLM_ATTEMPT_TIMEOUT), and no attempt
+  starts after the request's overall deadline (LLM_REQUEST_DEADLINE)
+- each model has a circuit breaker: after LLM_BREAKER_FAILURES failures in
+  a row it is skipped for LLM_BREAKER_COOLDOWN seconds, then one probe
+  request decides whether it is healthy again. Any failure of the probe
+  re-opens the breaker; a probe abandoned part-way (cancelled, interrupted)
+  lets the next request probe instead
+- when a model keeps failing (or its breaker is open) the request fails
+  over to the next model in LLM_FALLBACK_MODELS. The name "stand-in" there
+  means the offline StandInGroq endpoint.
+
+For streamed completions only the part up to the first chunk is retried:
+once text has reached the caller it cannot be taken back. Errors that no
+retry can fix (bad API key, invalid request) are raised straight away.
+When everything has failed, LLMUnavailable is raised. The chat history is
+never touched.
+
+Retries and failovers are counted in GetStats() and marked on the current
+trace ("llm_retry", "llm_failover").
+
+CONFIG (config.py, all optional):
+    LLM_RETRIES            retries per model (default 2)
+    LLM_BACKOFF_BASE       first backoff in seconds (default 0.5)
+    LLM_BACKOFF_MAX        backoff cap in seconds (default 4)
+    LLM_ATTEMPT_TIMEOUT    seconds per attempt / to the first streamed chunk (default 20)
+    LLM_REQUEST_DEADLINE   seconds after which no new attempt starts (default 45)
+    LLM_BREAKER_FAILURES   failures in a row that open a breaker (default 3)
+    LLM_BREAKER_COOLDOWN   seconds a breaker stays open (default 30)
+    LLM_FALLBACK_MODELS    {model: [fallback, ...]} (default: the two Groq models back each other up)
+"""
+
+import random
+import threading
+import time
+import config  # Import centralized configuration
+from Backend import Tracing  # Per-stage latency tracing
+
+Retries = getattr(config, "LLM_RETRIES", 2)
+BackoffBase = getattr(config, "LLM_BACKOFF_BASE", 0.5)
+BackoffMax = getattr(config, "LLM_BACKOFF_MAX", 4.0)
+AttemptTimeout = getattr(config, "LLM_ATTEMPT_TIMEOUT", 20.0)
+RequestDeadline = getattr(config, "LLM_REQUEST_DEADLINE", 45.0)
+BreakerFailures = getattr(config, "LLM_BREAKER_FAILURES", 3)
+BreakerCooldown = getattr(config, "LLM_BREAKER_COOLDOWN", 30.0)
+FallbackModels = getattr(config, "LLM_FALLBACK_MODELS", {
+    "llama-3.1-8b-instant": ["llama-3.3-70b-versatile"],
+    "llama-3.3-70b-versatile": ["llama-3.1-8b-instant"],
+})
+
+STAND_IN = "stand-in"  # Fallback entry served by the offline StandInGroq endpoint.
+PROBE = "probe"  # CircuitBreaker.allow() result for the one half-open probe (truthy).
+
+# HTTP statuses worth retrying on the same model.
+_RetryStatuses = {408, 409, 429}
+# HTTP statuses no other model can fix either.
+_FatalStatuses = {401, 403}
+# Exception class names (anywhere in the MRO) of transport-level failures.
+_TransientNames = ("Connection", "Timeout", "Transport", "Protocol", "APIError")
+
+
+class LLMUnavailable(Exception):
+    """Every model in the failover chain failed or was short-circuited."""
+
+
+def Classify(error):
+    """'retry' (transient), 'failover' (this model cannot serve it) or 'fatal' (raise now)."""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if isinstance(status, int):
+        if status in _FatalStatuses:
+            return "fatal"
+        if status in _RetryStatuses or status >= 500:
+            return "retry"
+        return "failover"  # e.g. an unknown or decommissioned model, or a prompt too long for it.
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return "retry"
+    if any(name in cls.__name__ for cls in type(error).__mro__ for name in _TransientNames):
+        return "retry"
+    return "fatal"  # A bug on our side; retrying would only hide it.
+
+
+def Backoff(attempt):
+    """Seconds to wait before retry number `attempt` (1-based): capped exponential, full jitter."""
+    return random.uniform(0, min(BackoffMax, BackoffBase * 2 ** (attempt - 1)))
+
+
+class CircuitBreaker:
+    """Closed -> open after `threshold` failures in a row -> half-open probe after `cooldown`."""
+
+    def __init__(self, threshold=BreakerFailures, cooldown=BreakerCooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self.opened = 0  # Times the breaker has opened.
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """
+        May a request go to this model now? In half-open state only one probe is
+        let through; it gets PROBE and must end in success(), failure() or release().
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if not self.probing and time.monotonic() - self.opened_at >= self.cooldown:
+                self.probing = True
+                return PROBE
+            return False
+
+    def is_open(self):
+        with self.lock:
+            return self.opened_at is not None
+
+    def success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or (self.opened_at is None and self.failures >= self.threshold):
+                self.opened_at = time.monotonic()
+                self.opened += 1
+            self.probing = False
+
+    def release(self):
+        """The probe ended without a verdict: stay open and let the next request probe."""
+        with self.lock:
+            self.probing = False
+
+    def state(self):
+        with self.lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half-open" if self.probing else "open"
+
+
+class _Run:
+    """The retry / failover plan of one request; shared by the sync and async paths."""
+
+    def __init__(self, executor, kwargs):
+        self.executor = executor
+        self.kwargs = kwargs
+        model = kwargs.get("model")
+        self.chain = [model] + [m for m in executor.fallbacks.get(model, []) if m != model]
+        self.position = 0
+        self.attempts = 0  # Attempts made on the current model.
+        self.move_on = False
+        self.probe = None  # Model whose half-open probe the current attempt is.
+        self.tried = []
+        self.errors = []
+        self.deadline = time.monotonic() + executor.deadline
+
+    def next(self):
+        """(model, call kwargs, seconds to wait first) of the next attempt; raises LLMUnavailable at the end."""
+        executor = self.executor
+        while self.position < len(self.chain):
+            model = self.chain[self.position]
+            breaker = executor.Breaker(model)
+            if self.attempts and (self.move_on or self.attempts > executor.retries or breaker.is_open()):
+                self.position += 1
+                self.attempts = 0
+                self.move_on = False
+                continue
+            if not self.attempts:
+                allowed = breaker.allow()
+                if not allowed:
+                    executor._count("short_circuited")
+                    self.errors.append(f"{model}: circuit open")
+                    self.position += 1
+                    continue
+                if allowed == PROBE:
+                    self.probe = model
+
+            remaining = self.deadline - time.monotonic()
+            delay = Backoff(self.attempts) if self.attempts else 0.0
+            if remaining - delay <= 0:
+                self.errors.append("request deadline reached")
+                self.abandoned(model)
+                break
+
+            if self.attempts:
+                executor._count("retries")
+                Tracing.Mark("llm_retry", once=False, model=model, attempt=self.attempts + 1,
+                             error=self.errors[-1] if self.errors else "")
+            elif self.tried:
+                executor._count("failovers")
+                Tracing.Mark("llm_failover", once=False, source=self.tried[-1], target=model)
+                print(f"[LLM] Failing over from {self.tried[-1]} to {model}")
+            if not self.attempts:
+                self.tried.append(model)
+            self.attempts += 1
+
+            call = dict(self.kwargs, model=model)
+            call.setdefault("timeout", min(executor.attempt_timeout, remaining - delay))
+            return model, call, delay
+
+        executor._count("unavailable")
+        raise LLMUnavailable("No model could answer: " + "; ".join(self.errors[-4:]))
+
+    def failed(self, model, error):
+        """Record a failed attempt; re-raises errors that no retry or failover can fix."""
+        kind = Classify(error)
+        self.executor._count("failures")
+        probe, self.probe = self.probe == model, None
+        if kind == "retry" or probe:
+            self.executor.Breaker(model).failure()  # A failed probe re-opens the breaker, whatever the error.
+        if kind == "fatal":
+            raise error
+        self.errors.append(f"{model}: {type(error).__name__}: {error}")
+        print(f"[LLM] {model} failed (attempt {self.attempts}): {type(error).__name__}: {error}")
+        if kind != "retry":
+            self.move_on = True
+
+    def abandoned(self, model):
+        """The attempt on `model` ended without a result (cancelled, interrupted): free its probe."""
+        if self.probe == model:
+            self.probe = None
+            self.executor.Breaker(model).release()
+
+    def succeeded(self, model):
+        self.probe = None
+        self.executor.Breaker(model).success()
+        if model != self.chain[0]:
+            self.executor._count("served_by_fallback")
+
+
+class ResilientExecutor:
+    """Runs a request function with bounded retries, per-model circuit breakers and failover."""
+
+    def __init__(self, retries=Retries, attempt_timeout=AttemptTimeout, deadline=RequestDeadline,
+                 fallbacks=FallbackModels):
+        self.retries = retries
+        self.attempt_timeout = attempt_timeout
+        self.deadline = deadline
+        self.fallbacks = fallbacks
+        self.breakers = {}
+        self.counts = {"requests": 0, "failures": 0, "retries": 0, "failovers": 0,
+                       "served_by_fallback": 0, "short_circuited": 0, "unavailable": 0}
+        self.lock = threading.Lock()
+
+    def _count(self, key):
+        with self.lock:
+            self.counts[key] += 1
+
+    def Breaker(self, model):
+        with self.lock:
+            if model not in self.breakers:
+                self.breakers[model] = CircuitBreaker()
+            return self.breakers[model]
+
+    def Call(self, send, **kwargs):
+        """send(**kwargs) with retries and failover; kwargs["model"] is the primary model and is swapped on failover."""
+        self._count("requests")
+        run = _Run(self, kwargs)
+        while True:
+            model, call, delay = run.next()
+            if delay:
+                time.sleep(delay)
+            try:
+                result = send(**call)
+            except Exception as e:
+                run.failed(model, e)
+                continue
+            except BaseException:
+                run.abandoned(model)
+                raise
+            run.succeeded(model)
+            return result
+
+    async def CallAsync(self, send, **kwargs):
+        """Async variant of Call for `async def send(**kwargs)`."""
+        import asyncio
+        self._count("requests")
+        run = _Run(self, kwargs)
+        while True:
+            model, call, delay = run.next()
+            if delay:
+                await asyncio.sleep(delay)
+            try:
+                result = await send(**call)
+            except Exception as e:
+                run.failed(model, e)
+                continue
+            except BaseException:  # Cancelled while waiting for the model.
+                run.abandoned(model)
+                raise
+            run.succeeded(model)
+            return result
+
+    def Stats(self):
+        with self.lock:
+            breakers = dict(self.breakers)
+            counts = dict(self.counts)
+        counts["breakers"] = {model: {"state": breaker.state(), "failures": breaker.failures,
+                                      "opened": breaker.opened}
+                              for model, breaker in breakers.items()}
+        return counts
+
+
+_End = object()
+
+
+class PrimedStream:
+    """A streamed completion whose first chunk was already received (inside the retried attempt)."""
+
+    def __init__(self, stream, iterator, first):
+        self.stream = stream
+        self.iterator = iterator
+        self.first = first
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.first is not _End:
+            chunk, self.first = self.first, _End
+            return chunk
+        return next(self.iterator)
+
+    def close(self):
+        self.first = _End
+        close = getattr(self.stream, "close", None)
+        if close is not None:
+            close()
+
+
+class AsyncPrimedStream(PrimedStream):
+    """PrimedStream for async completion streams."""
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.first is not _End:
+            chunk, self.first = self.first, _End
+            return chunk
+        return await self.iterator.__anext__()
+
+    async def aclose(self):
+        self.first = _End
+        close = getattr(self.stream, "aclose", None) or getattr(self.stream, "close", None)
+        if close is not None:
+            result = close()
+            if hasattr(result, "__await__"):
+                await result
+
+
+def Prime(stream):
+    """Wait for the first chunk of a sync stream, so a stream that fails before any text is retried."""
+    iterator = iter(stream)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        first = _End
+    except BaseException:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+        raise
+    return PrimedStream(stream, iterator, first)
+
+
+async def PrimeAsync(stream):
+    """Async variant of Prime."""
+    iterator = stream.__aiter__()
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        first = _End
+    except BaseException:
+        primed = AsyncPrimedStream(stream, iterator, _End)
+        await primed.aclose()
+        raise
+    return AsyncPrimedStream(stream, iterator, first)
+
+
+# The executor every LLMProvider.Client request goes through.
+Executor = ResilientExecutor()
+
+
+def GetStats():
+    """Request, failure, retry and failover counts, and the state of every model's breaker."""
+    return Executor.Stats()
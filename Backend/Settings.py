@@ -0,0 +1,132 @@
+"""
+Shared in-memory cache of the user's settings files.
+
+Chatbot re-read and re-parsed Profile.json and Preferences.json on every
+query, and AutoDeleteChat and the GUI settings screen read them again
+separately. Every module now goes through one cached copy per file, which
+is re-read only when the file's modification time changes (someone edited
+it by hand) or when it is saved through Save() (the GUI settings screen).
+
+ProfileContext() returns the profile fragment of the chat system prompt.
+It is memoized and only rebuilt after one of the two files has changed.
+
+USAGE:
+    from Backend import Settings
+    prefs = Settings.Preferences.Get()          # dict, defaults if missing
+    Settings.Profile.Save({"name": "Tony", ...})
+    fragment = Settings.ProfileContext()
+"""
+
+import json
+import os
+import threading
+import app_paths  # Import for correct file paths
+
+PROFILE_PATH = app_paths.get_data_path("Profile.json")
+PREFERENCES_PATH = app_paths.get_data_path("Preferences.json")
+
+ProfileDefaults = {"name": "", "email": "", "age": "", "gender": "", "location": "",
+                   "occupation": "", "hobbies": ""}
+PreferenceDefaults = {"languages": "English", "response_style": "Balanced",
+                      "voice_response": True, "auto_start": False,
+                      "notifications": True, "search_engine": "Google",
+                      "auto_delete_chat": False}
+
+
+class SettingsFile:
+    """A JSON settings file cached in memory and reloaded when its mtime changes."""
+
+    def __init__(self, path, defaults):
+        self.path = path
+        self.defaults = defaults
+        self.data = None  # Parsed contents, or None if the file is missing or invalid.
+        self.mtime = None
+        self.version = 0  # Bumped whenever the cached contents change.
+        self.lock = threading.Lock()
+
+    def _refresh(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime == self.mtime and self.version:
+            return
+        data = None
+        if mtime is not None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = None
+        self.data = data
+        self.mtime = mtime
+        self.version += 1
+
+    def Load(self):
+        """The file's contents (a copy), or None if it is missing or invalid."""
+        with self.lock:
+            self._refresh()
+            return dict(self.data) if self.data is not None else None
+
+    def Get(self):
+        """The file's contents, or the defaults if it is missing or invalid."""
+        data = self.Load()
+        return data if data is not None else dict(self.defaults)
+
+    def Save(self, data):
+        with self.lock:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+            self.data = dict(data)
+            self.mtime = os.path.getmtime(self.path)
+            self.version += 1
+
+    def Version(self):
+        with self.lock:
+            self._refresh()
+            return self.version
+
+
+Profile = SettingsFile(PROFILE_PATH, ProfileDefaults)
+Preferences = SettingsFile(PREFERENCES_PATH, PreferenceDefaults)
+
+_context_lock = threading.Lock()
+_context = (None, "")  # ((profile version, preferences version), fragment)
+
+_ProfileFields = {
+    "name": "Name", "email": "Email", "age": "Age", "gender": "Gender",
+    "location": "Location", "occupation": "Occupation",
+    "hobbies": "Hobbies"
+}
+
+
+def _build_profile_context():
+    profile = Profile.Load()
+    if profile is None:
+        return ""
+    prefs = Preferences.Load() or {}
+
+    parts = []
+    for key, label in _ProfileFields.items():
+        val = str(profile.get(key, "")).strip()
+        if val:
+            parts.append(f"{label}: {val}")
+
+    # Add languages from preferences
+    languages = str(prefs.get("languages", "")).strip()
+    if languages:
+        parts.append(f"Languages: {languages}")
+
+    if parts:
+        return "\n*** Here is the user's profile information, use it to personalise your responses: ***\n" + "\n".join(parts) + "\n"
+    return ""
+
+
+def ProfileContext():
+    """The profile fragment of the chat system prompt, rebuilt only when a settings file changed."""
+    global _context
+    key = (Profile.Version(), Preferences.Version())
+    with _context_lock:
+        if _context[0] != key:
+            _context = (key, _build_profile_context())
+        return _context[1]
@@ -0,0 +1,144 @@
+"""
+Speculative general-chat answers for Jarvis.
+
+Most queries end up classified as "general", yet every one waits for the
+FirstLayerDMM round trip to Cohere before ChatBot starts. In speculative mode
+(SPECULATIVE_GENERAL = True in config.py) Main.py starts a ChatBot answer for
+the raw query at the same time as the Cohere request. Queries the fast path,
+decision cache or local model classify are answered without one, and voice
+mode (VOICE_SHORT_ANSWERS) never speculates since it speaks a short summary:
+
+- If the decision is a single "general" task the speculation is committed:
+  the chunks generated so far are replayed, the rest stream through live,
+  and the exchange is saved to the chat log as usual.
+- Otherwise it is cancelled: the Groq stream is closed and nothing is saved.
+
+The exchange is only saved once the answer has been read to the end. If the
+speculative request fails before producing any text, a fresh ChatBot answer
+is given instead.
+
+GetSpeculationStats() reports the hit rate and the head start committed
+answers got over a classify-then-answer turn.
+"""
+
+import contextvars
+import threading
+import time
+import datetime
+from Backend.Chatbot import ChatBotStream, SaveChatTurn, AnswerModifier
+
+_stats_lock = threading.Lock()
+_stats = {"started": 0, "committed": 0, "cancelled": 0, "head_start_seconds": 0.0}
+
+
+def GetSpeculationStats():
+    """Return speculation counters, hit rate and average head start in seconds."""
+    with _stats_lock:
+        stats = dict(_stats)
+    decided = stats["committed"] + stats["cancelled"]
+    stats["hit_rate"] = stats["committed"] / decided if decided else 0.0
+    stats["avg_head_start_seconds"] = stats["head_start_seconds"] / stats["committed"] if stats["committed"] else 0.0
+    return stats
+
+
+def _record(key, head_start=0.0):
+    with _stats_lock:
+        _stats[key] += 1
+        _stats["head_start_seconds"] += head_start
+
+
+class SpeculativeChat:
+    """A ChatBot answer generated in the background until it is committed or cancelled."""
+
+    def __init__(self, Query):
+        self.Query = Query
+        self.AskedAt = datetime.datetime.now().isoformat()
+        self.started = time.perf_counter()
+        self.decided = False
+        self._chunks = []  # Every chunk generated so far; each reader replays them from the start.
+        self._finished = False
+        self._changed = threading.Condition()
+        self._cancelled = threading.Event()
+        self._error = None
+        self._saved = False
+        _record("started")
+        # Generate in a copy of this context so spans are attributed to the current turn.
+        self._thread = threading.Thread(target=contextvars.copy_context().run, args=(self._generate,), daemon=True)
+        self._thread.start()
+
+    def _generate(self):
+        stream = ChatBotStream(self.Query, save=False)
+        try:
+            for chunk in stream:
+                if self._cancelled.is_set():
+                    break
+                with self._changed:
+                    self._chunks.append(chunk)
+                    self._changed.notify_all()
+        except Exception as e:
+            self._error = e
+        finally:
+            stream.close()  # Closes the Groq stream if we stopped early.
+            with self._changed:
+                self._finished = True
+                self._changed.notify_all()
+
+    @staticmethod
+    def Matches(Decision):
+        """A speculation is only usable when the whole query was classified as one general task."""
+        return len(Decision) == 1 and Decision[0].startswith("general")
+
+    def Cancel(self):
+        if not self.decided:
+            self.decided = True
+            self._cancelled.set()
+            _record("cancelled")
+
+    def _replay(self):
+        """Yield every chunk of the speculative answer, waiting for the ones still being generated."""
+        index = 0
+        while True:
+            with self._changed:
+                while index >= len(self._chunks) and not self._finished:
+                    self._changed.wait()
+                if index >= len(self._chunks):
+                    return
+                chunk = self._chunks[index]
+            index += 1
+            yield chunk
+
+    def Stream(self, _Query=None):
+        """
+        Commit the speculation and yield its answer; saves the exchange once it has been read to the end.
+        If the speculative request failed before producing any text, a fresh ChatBot answer is streamed instead.
+        """
+        if not self.decided:
+            self.decided = True
+            _record("committed", time.perf_counter() - self.started)
+
+        parts = []
+        for chunk in self._replay():
+            parts.append(chunk)
+            yield chunk
+
+        if self._error is not None:
+            if parts:
+                raise self._error  # Text is already out; the caller shows what it has.
+            print(f"[SPECULATION] Speculative answer failed, answering again: {self._error}")
+            yield from ChatBotStream(self.Query)  # Saves the exchange itself.
+            return
+
+        with self._changed:
+            if self._saved:
+                return
+            self._saved = True
+        SaveChatTurn(self.Query, "".join(parts), self.AskedAt)
+
+    def Answer(self, _Query=None):
+        """Commit the speculation and return the complete, formatted answer."""
+        return AnswerModifier(Answer="".join(self.Stream()))
+
+
+def StartSpeculation(Query):
+    """Start answering `Query` as a general question while it is being classified."""
+    return SpeculativeChat(Query)
@@ -7,10 +7,12 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 import os
+import threading
 import mtranslate as mt 
 from time import sleep
 import config  # Import configuration file with hardcoded settings
 import app_paths  # Import for correct file paths
+from Backend import MessageBus  # In-process status bus shared with the GUI
 
 # Load configuration from config.py
 InputLanguage = config.INPUT_LANGUAGE
@@ -137,29 +139,39 @@ def initialize_browser():
     print("[ERROR] ================================================")
     return None, None
 
-# Initialize the WebDriver with automatic browser detection
+# The WebDriver is started on first use (or by the backend warm-up), not at import.
 driver = None
 browser_name = None
-try:
-    print("[INFO] Initializing WebDriver for speech recognition...")
-    driver, browser_name = initialize_browser()
-    if driver:
-        print(f"[INFO] ✓ Speech recognition is ready using {browser_name}!")
-    else:
-        print("[ERROR] ✗ Speech recognition will not work - no compatible browser found.")
-except Exception as e:
-    print(f"[ERROR] ✗ Failed to initialize WebDriver: {e}")
-    print("[ERROR] ✗ Speech recognition will not work.")
-    driver = None
-    browser_name = None
+driver_initialized = False
+driver_lock = threading.Lock()
+
+def GetDriver():
+    """Return the speech recognition WebDriver, starting the browser on the first call."""
+    global driver, browser_name, driver_initialized
+    with driver_lock:
+        if driver_initialized:
+            return driver
+        try:
+            print("[INFO] Initializing WebDriver for speech recognition...")
+            driver, browser_name = initialize_browser()
+            if driver:
+                print(f"[INFO] ✓ Speech recognition is ready using {browser_name}!")
+            else:
+                print("[ERROR] ✗ Speech recognition will not work - no compatible browser found.")
+        except Exception as e:
+            print(f"[ERROR] ✗ Failed to initialize WebDriver: {e}")
+            print("[ERROR] ✗ Speech recognition will not work.")
+            driver = None
+            browser_name = None
+        driver_initialized = True
+        return driver
 
 # Define the path for temporary files.
 TempDirPath = app_paths.FRONTEND_FILES_DIR
 
-# Function to set the assistant's status by writing it to a file.
+# Function to publish the assistant's status on the message bus.
 def SetAssistantStatus(Status):
-    with open(os.path.join(TempDirPath, 'Status.data'), "w", encoding='utf-8') as file:
-        file.write(Status)
+    MessageBus.publish(MessageBus.STATUS, Status)
 
 # Function to modify a query to ensue proper punctuation and formatting.
 def QueryModifier(Query):
@@ -191,7 +203,8 @@ def UniversalTranalator(Text):
 def SpeechRecognition():
     from datetime import datetime
     
-    # Check if driver is initialized
+    # Start the browser if this is the first recognition
+    driver = GetDriver()
     if driver is None:
         print("[ERROR] WebDriver not available. Cannot perform speech recognition.")
         print("[ERROR] Jarvis cannot listen without a compatible browser. Please install Chrome, Edge, or Firefox and restart.")
@@ -0,0 +1,310 @@
+"""
+Offline stand-ins for the remote services Jarvis calls.
+
+StandInGroq, StandInAsyncGroq and StandInCohere mimic the parts of the Groq
+and Cohere client APIs the backends use (chat.completions.create, sync or
+async, and chat_stream), returning
+deterministic local answers with optional artificial latency. InstallStandIns()
+swaps them into every backend module, so the whole DMM -> ChatBot /
+RealtimeSearchEngine / Automation pipeline runs without API keys or network.
+
+StandInCommunicate, StandInMixer and StandInSpeechDriver replace edge-tts,
+the pygame mixer and the Selenium speech-recognition browser. They are
+installed at the library level with InstallLibraryStandIns() *before* the
+backends are imported, which is how the offline benchmark (Backend.Benchmark)
+drives MainExecution without a microphone, speakers or network, and how the
+local API server's --stand-ins flag runs offline.
+"""
+
+import asyncio
+import collections
+import functools
+import re
+import sys
+import time
+from types import SimpleNamespace
+
+# Keyword rules the stand-in decision model uses, checked in order:
+# (pattern, task template expanded with the match groups).
+_DecisionRules = [
+    (r"^(bye|goodbye|exit)\b", "exit"),
+    (r"^skip (the |this )?ads?\b", "skip ads"),
+    (r"^(open|close|play) (.+)", r"\1 \2"),
+    (r"^(google|youtube) search (?:for )?(.+)", r"\1 search \2"),
+    (r"^(?:generate|create|make) (?:an? )?image (?:of )?(.+)", r"generate image \1"),
+    (r"^(?:write|draft) (?:me )?(?:an? )?(.+)", r"content \1"),
+    (r"^(.*\b(?:news|today's|latest|current|price|weather|who is)\b.*)$", r"realtime \1"),
+]
+
+
+def StandInDecision(query):
+    """Classify a query the way FirstLayerDMM would, using keyword rules only."""
+    text = query.lower().strip().rstrip(".?!")
+    for pattern, template in _DecisionRules:
+        match = re.search(pattern, text)
+        if match:
+            return match.expand(template)
+    return f"general {text}"
+
+
+def StandInAnswer(messages):
+    """A deterministic, multi-sentence answer to the last user message."""
+    question = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    return (f"This is an offline stand-in answer to: {question.strip()} "
+            "No remote model was contacted. The pipeline ran end to end.")
+
+
+def _chunks(text):
+    # Split into word-sized chunks like a streamed completion (one chunk per "token" for max_tokens).
+    return re.findall(r"\S+\s*", text)
+
+
+class _StandInCompletions:
+
+    def __init__(self, owner):
+        self.owner = owner
+
+    def create(self, model=None, messages=(), stream=False, **kwargs):
+        owner = self.owner
+        owner.calls += 1
+        time.sleep(owner.first_token_latency)
+        text = owner.answer(list(messages))
+
+        if not stream:
+            message = SimpleNamespace(content=text)
+            return SimpleNamespace(model=model, choices=[SimpleNamespace(message=message)])
+
+        def generate():
+            for i, piece in enumerate(_chunks(text)[:kwargs.get("max_tokens")]):
+                if i:
+                    time.sleep(owner.token_latency)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+        return generate()
+
+
+class StandInGroq:
+    """Drop-in for groq.Groq: chat.completions.create with or without stream=True."""
+
+    def __init__(self, api_key=None, first_token_latency=0.0, token_latency=0.0, answer=StandInAnswer, **kwargs):
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.answer = answer
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=_StandInCompletions(self))
+
+
+class _StandInAsyncCompletions:
+
+    def __init__(self, owner):
+        self.owner = owner
+
+    async def create(self, model=None, messages=(), stream=False, **kwargs):
+        owner = self.owner
+        owner.calls += 1
+        await asyncio.sleep(owner.first_token_latency)
+        text = owner.answer(list(messages))
+
+        if not stream:
+            message = SimpleNamespace(content=text)
+            return SimpleNamespace(model=model, choices=[SimpleNamespace(message=message)])
+
+        async def generate():
+            for i, piece in enumerate(_chunks(text)[:kwargs.get("max_tokens")]):
+                if i:
+                    await asyncio.sleep(owner.token_latency)
+                yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+        return generate()
+
+
+class StandInAsyncGroq(StandInGroq):
+    """Drop-in for groq.AsyncGroq: awaitable chat.completions.create, async-iterable when streaming."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.chat = SimpleNamespace(completions=_StandInAsyncCompletions(self))
+
+
+class StandInCohere:
+    """Drop-in for cohere.Client: chat_stream yielding text-generation events."""
+
+    def __init__(self, api_key=None, first_token_latency=0.0, token_latency=0.0, decide=StandInDecision, **kwargs):
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.decide = decide
+        self.calls = 0
+
+    def chat_stream(self, message="", **kwargs):
+        self.calls += 1
+        time.sleep(self.first_token_latency)
+        for i, piece in enumerate(_chunks(self.decide(message))):
+            if i:
+                time.sleep(self.token_latency)
+            yield SimpleNamespace(event_type="text-generation", text=piece)
+        yield SimpleNamespace(event_type="stream-end", text="")
+
+
+def StandInGoogleSearch(query):
+    return f"The search results for '{query}' are:\n[start]\n(offline stand-in: no results)\n[end]"
+
+
+class StandInCommunicate:
+    """Drop-in for edge_tts.Communicate: save() waits `latency` seconds and writes the text to the file."""
+
+    latency = 0.0
+
+    def __init__(self, text, voice=None, **kwargs):
+        self.text = text
+
+    async def save(self, path):
+        await asyncio.sleep(self.latency)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.text)
+
+
+class _StandInMusic:
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.length = 0
+        self.until = 0.0
+
+    def load(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            self.length = len(f.read())
+
+    def play(self):
+        seconds = self.length / self.owner.chars_per_second if self.owner.chars_per_second else 0.0
+        self.until = time.perf_counter() + seconds
+
+    def get_busy(self):
+        return time.perf_counter() < self.until
+
+    def stop(self):
+        self.until = 0.0
+
+    def unload(self):
+        self.length = 0
+
+
+class StandInMixer:
+    """Drop-in for pygame.mixer: "plays" a file for len(text) / chars_per_second seconds (0 = instantly)."""
+
+    def __init__(self, chars_per_second=0.0):
+        self.chars_per_second = chars_per_second
+        self.initialized = False
+        self.music = _StandInMusic(self)
+
+    def init(self, *args, **kwargs):
+        self.initialized = True
+
+    def get_init(self):
+        return self.initialized
+
+    def quit(self):
+        self.initialized = False
+
+
+class _StandInElement:
+
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.element_id = element_id
+
+    @property
+    def text(self):
+        if self.element_id != "output" or self.driver.phrase is None:
+            return ""
+        return self.driver.phrase if time.perf_counter() >= self.driver.ready_at else ""
+
+    def click(self):
+        if self.element_id == "end":
+            self.driver.phrase = None
+
+
+class StandInSpeechDriver:
+    """
+    Drop-in for the Selenium WebDriver behind SpeechRecognition(). Queue an
+    utterance with Say(query): the next page load hears the wake word, the one
+    after that hears `query` once `latency` seconds have passed.
+    """
+
+    def __init__(self, latency=0.0, wake_word="Jarvis"):
+        self.latency = latency
+        self.wake_word = wake_word
+        self.phrases = collections.deque()
+        self.phrase = None
+        self.ready_at = 0.0
+
+    def Say(self, query):
+        self.phrases.extend([self.wake_word, query])
+
+    def get(self, url):
+        self.phrase = self.phrases.popleft() if self.phrases else None
+        delay = 0.0 if self.phrase == self.wake_word else self.latency
+        self.ready_at = time.perf_counter() + delay
+
+    def find_element(self, by=None, value=None):
+        return _StandInElement(self, value)
+
+    def quit(self):
+        pass
+
+
+def InstallLibraryStandIns(llm_first_token=0.0, llm_token=0.0, dmm_first_token=0.0, dmm_token=0.0,
+                           stt_latency=0.0, tts_latency=0.0, playback_cps=0.0, search_latency=0.0):
+    """
+    Patch groq.Groq / AsyncGroq, cohere.Client, edge_tts.Communicate, googlesearch.search,
+    pygame.mixer and the Selenium browsers with stand-ins (latencies in seconds).
+    Must run before any backend module is imported. Returns the speech driver
+    that SpeechRecognition() will use.
+    """
+    import groq
+    import cohere
+    import edge_tts
+    import googlesearch
+    import pygame
+    from selenium import webdriver
+
+    groq.Groq = functools.partial(StandInGroq, first_token_latency=llm_first_token, token_latency=llm_token)
+    groq.AsyncGroq = functools.partial(StandInAsyncGroq, first_token_latency=llm_first_token, token_latency=llm_token)
+    cohere.Client = functools.partial(StandInCohere, first_token_latency=dmm_first_token, token_latency=dmm_token)
+    edge_tts.Communicate = type("StandInCommunicate", (StandInCommunicate,), {"latency": tts_latency})
+    pygame.mixer = StandInMixer(playback_cps)
+
+    def search(query, *args, **kwargs):
+        time.sleep(search_latency)
+        return [f"(offline stand-in result {i + 1} for '{query}')" for i in range(5)]
+    googlesearch.search = search
+
+    driver = StandInSpeechDriver(stt_latency)
+    for browser in ("Chrome", "Edge", "Firefox"):
+        setattr(webdriver, browser, lambda *args, **kwargs: driver)
+
+    return driver
+
+
+def InstallStandIns(groq_client=None, cohere_client=None):
+    """
+    Replace the Groq/Cohere clients (and Google search) in every backend module
+    with stand-ins. Modules imported later are not affected, so import the
+    backends first. Returns the (groq, cohere) stand-ins in use.
+    """
+    groq_client = groq_client or StandInGroq()
+    cohere_client = cohere_client or StandInCohere()
+
+    provider = sys.modules.get("Backend.LLMProvider")
+    if provider is not None:
+        # Shared by Chatbot, RealtimeSearchEngine, LearningSystem and Automation.
+        async_client = StandInAsyncGroq(first_token_latency=groq_client.first_token_latency,
+                                        token_latency=groq_client.token_latency, answer=groq_client.answer)
+        provider.SetClient(groq_client, async_client=async_client)
+
+    model = sys.modules.get("Backend.Model")
+    if model is not None:
+        model.co = cohere_client
+
+    search = sys.modules.get("Backend.RealtimeSearchEngine")
+    if search is not None:
+        search.GoogleSearch = StandInGoogleSearch
+
+    return groq_client, cohere_client
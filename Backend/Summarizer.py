@@ -0,0 +1,195 @@
+"""
+Background summarization of older chat history.
+
+ContextBuilder only sends the most recent turns that fit the token budget,
+so anything older used to be forgotten. This module rolls older chat log
+messages into a running summary stored next to the log in
+Data/ChatSummary.json, and BuildContext sends that summary (as a system
+message) plus the turns after it instead of raw history.
+
+Summarization never runs on the hot path. StartIdleWorker() starts a daemon
+thread that waits until the assistant status (MessageBus.STATUS) has not
+changed for SUMMARY_IDLE_SECONDS, then summarizes on the BACKGROUND priority
+of the shared Groq client, so a query that arrives meanwhile is never kept
+waiting by it. Runs are incremental: the summary records how many messages
+it covers, and each run only folds in the messages added since, leaving the
+newest SUMMARY_KEEP_RECENT messages raw.
+
+If the chat log is cleared or rewritten so that the summarized messages are
+no longer where the summary left them, the summary is discarded.
+
+CONFIG (config.py, all optional):
+    SUMMARY_ENABLED        turn summaries on/off (default True)
+    SUMMARY_IDLE_SECONDS   quiet time before a run (default 60)
+    SUMMARY_KEEP_RECENT    newest messages never summarized (default 20)
+    SUMMARY_MIN_NEW        new messages needed before a run (default 10)
+    SUMMARY_MAX_WORDS      summary length the model is asked for (default 250)
+"""
+
+import datetime
+import json
+import os
+import threading
+import time
+import config  # Import centralized configuration
+import app_paths  # Import for correct file paths
+from Backend import ChatLog  # Append-only chat log store
+from Backend import MessageBus  # In-process status bus
+
+SUMMARY_PATH = app_paths.get_data_path("ChatSummary.json")
+
+Enabled = getattr(config, "SUMMARY_ENABLED", True)
+IdleSeconds = getattr(config, "SUMMARY_IDLE_SECONDS", 60)
+KeepRecent = getattr(config, "SUMMARY_KEEP_RECENT", 20)
+MinNew = getattr(config, "SUMMARY_MIN_NEW", 10)
+MaxWords = getattr(config, "SUMMARY_MAX_WORDS", 250)
+ChunkMessages = 40  # Messages folded into the summary per model call.
+
+_lock = threading.Lock()
+_cached = None  # (mtime, state) of the summary file.
+_last_activity = time.monotonic()
+_stats = {"runs": 0, "messages_summarized": 0, "errors": 0, "last_run_seconds": None}
+
+
+def _anchor(message):
+    """A fingerprint of the last summarized message, to notice rewritten logs."""
+    return [message.get("role", ""), message.get("timestamp", ""), message.get("content", "")[:64]]
+
+
+def _load():
+    global _cached
+    try:
+        mtime = os.path.getmtime(SUMMARY_PATH)
+    except OSError:
+        return None
+    if _cached is None or _cached[0] != mtime:
+        try:
+            with open(SUMMARY_PATH, "r", encoding="utf-8") as f:
+                _cached = (mtime, json.load(f))
+        except (OSError, ValueError):
+            return None
+    return _cached[1]
+
+
+def _save(state):
+    with open(SUMMARY_PATH + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=4)
+    os.replace(SUMMARY_PATH + ".tmp", SUMMARY_PATH)
+
+
+def Current():
+    """
+    Return (summary text, number of chat log messages it covers), or ("", 0)
+    when there is no summary or it no longer matches the chat log.
+    """
+    if not Enabled:
+        return "", 0
+    with _lock:
+        state = _load()
+    if not state or not state.get("summary"):
+        return "", 0
+    covered = state["covered"]
+    last = ChatLog.Read(covered - 1, covered) if 0 < covered <= ChatLog.Count() else []
+    if not last or _anchor(last[0]) != state["anchor"]:
+        return "", 0  # The log was cleared or rewritten since.
+    return state["summary"], covered
+
+
+def _summarize(summary, messages):
+    """Fold `messages` into `summary` with one model call."""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    prompt = (f"Summary of the conversation so far:\n{summary or '(none yet)'}\n\n"
+              f"Newer messages:\n{transcript}\n\n"
+              f"Write an updated summary of the whole conversation in at most {MaxWords} words. "
+              f"Keep names, facts about the user, decisions and open requests; drop greetings and small talk.")
+    # Imported here so the GUI can clear summaries without loading the Groq client.
+    from Backend import LLMProvider
+    client = LLMProvider.Client(LLMProvider.BACKGROUND)  # Background work never holds up an answer.
+    response = client.chat.completions.create(
+        model="llama-3.1-8b-instant",
+        messages=[
+            {"role": "system", "content": "You maintain a concise running summary of a conversation between a user and their assistant."},
+            {"role": "user", "content": prompt},
+        ],
+        max_tokens=MaxWords * 2,
+        temperature=0.3,
+    )
+    return response.choices[0].message.content.strip()
+
+
+def SummarizeNow():
+    """Fold every message older than the newest KeepRecent into the summary. Returns messages added."""
+    started = time.perf_counter()
+    summary, covered = Current()
+    target = ChatLog.Count() - KeepRecent
+    if target - covered < MinNew:
+        return 0
+
+    added = 0
+    try:
+        while covered < target:
+            stop = min(covered + ChunkMessages, target)
+            messages = ChatLog.Read(covered, stop)
+            summary = _summarize(summary, messages)
+            covered = stop
+            added += len(messages)
+            state = {"version": 1, "summary": summary, "covered": covered, "anchor": _anchor(messages[-1]),
+                     "updated": datetime.datetime.now().isoformat(timespec="seconds")}
+            with _lock:
+                _save(state)  # Saved per chunk, so an interrupted run keeps its progress.
+    except Exception as e:
+        _stats["errors"] += 1
+        print(f"[SUMMARY] Could not summarize chat history: {e}")
+
+    _stats["runs"] += 1
+    _stats["messages_summarized"] += added
+    _stats["last_run_seconds"] = round(time.perf_counter() - started, 3)
+    if added:
+        print(f"[SUMMARY] Summarized {added} messages ({covered} total) in {_stats['last_run_seconds']:.1f}s")
+    return added
+
+
+def Clear():
+    """Delete the stored summary (used when the chat history is deleted)."""
+    global _cached
+    with _lock:
+        _cached = None
+        try:
+            os.remove(SUMMARY_PATH)
+        except FileNotFoundError:
+            pass
+
+
+def _on_status(_):
+    global _last_activity
+    _last_activity = time.monotonic()
+
+
+_worker = None
+
+
+def StartIdleWorker():
+    """Summarize in the background whenever the assistant has been idle for IdleSeconds."""
+    global _worker
+    if not Enabled or _worker is not None:
+        return _worker
+
+    MessageBus.subscribe(MessageBus.STATUS, _on_status)
+
+    def work():
+        while True:
+            quiet = time.monotonic() - _last_activity
+            if quiet < IdleSeconds:
+                time.sleep(IdleSeconds - quiet)
+                continue
+            SummarizeNow()
+            _on_status(None)  # Wait another idle period before checking again.
+
+    _worker = threading.Thread(target=work, name="ChatSummarizer", daemon=True)
+    _worker.start()
+    return _worker
+
+
+def GetStats():
+    summary, covered = Current()
+    return dict(_stats, covered_messages=covered, summary_words=len(summary.split()))
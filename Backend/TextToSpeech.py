@@ -1,17 +1,28 @@
 import pygame  # Import pygame library for handling audio playback.
 import random  # Import random library for generating random choices.
 import asyncio  # Import asyncio for asynchronous operations.
+import queue  # Import queue to hand synthesized sentences to the player.
+import re  # Import re for splitting sentences off a token stream.
+import threading  # Import threading to synthesize while playing.
 import edge_tts  # Import edge_tts for text-to-speech functionality.
 import os  # Import os for file path handling 
+import contextvars  # Import contextvars so the synthesis thread traces into the caller's turn.
 import config  # Import configuration file with hardcoded settings
 import app_paths  # Import for correct file paths
+from Backend import Tracing  # Per-stage latency tracing
 
 # Load configuration from config.py
 AssistantVoice = config.ASSISTANT_VOICE
 
+# Only one caller may use the pygame mixer at a time (answers and automation
+# acknowledgments can be spoken from concurrent intent threads). Streamed answers
+# hold it per sentence, so an acknowledgment never waits for the model to write.
+SpeechLock = threading.Lock()
+
 # Asynchronous function to convert text to an audio file
-async def TextToAudioFile(text) -> None:
-    file_path = app_paths.get_data_path("speech.mp3")  # Define the path where the speech file will be saved 
+async def TextToAudioFile(text, file_path=None) -> None:
+    if file_path is None:
+        file_path = app_paths.get_data_path("speech.mp3")  # Define the path where the speech file will be saved 
 
     # Try to remove existing file with retry logic
     if os.path.exists(file_path):  # Check if the file already exists
@@ -29,8 +40,9 @@ async def TextToAudioFile(text) -> None:
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            communicate = edge_tts.Communicate(text, AssistantVoice, pitch='+5Hz', rate='+25%')
-            await communicate.save(r'Data\speech.mp3')  # Save the generated speech as an MP3 file
+            with Tracing.Span("tts_synthesis", chars=len(text)):
+                communicate = edge_tts.Communicate(text, AssistantVoice, pitch='+5Hz', rate='+25%')
+                await communicate.save(file_path)  # Save the generated speech as an MP3 file
             break  # Success, exit retry loop
         except Exception as e:
             if attempt < max_retries - 1:
@@ -54,14 +66,16 @@ def TTS(Text, func=lambda r=None: True):
             mixer_initialized = True  # Mark as initialized
 
             # Load the generated speech file into pygame mixer
-            pygame.mixer.music.load(r'Data\speech.mp3')
-            pygame.mixer.music.play()  # Play the audio
+            pygame.mixer.music.load(app_paths.get_data_path("speech.mp3"))
+            with Tracing.Span("tts_playback"):
+                pygame.mixer.music.play()  # Play the audio
+                Tracing.Mark("first_audio")
 
-            # Loop until the audio is done playing or the function stops 
-            while pygame.mixer.music.get_busy():
-                if func() == False:  # Check if the external function returns False
-                    break
-                pygame.time.Clock().tick(20)  # Increase tick rate for more responsive playback
+                # Loop until the audio is done playing or the function stops 
+                while pygame.mixer.music.get_busy():
+                    if func() == False:  # Check if the external function returns False
+                        break
+                    pygame.time.Clock().tick(20)  # Increase tick rate for more responsive playback
 
             return True  # Return True if the audio played successfully
         
@@ -85,41 +99,194 @@ def TTS(Text, func=lambda r=None: True):
                 if "mixer not initialized" not in str(e).lower():
                     print(f"Error in finally block: {e}")
 
+# List of predefined responses for cases where the text is too long 
+LongAnswerResponses = [
+    "The rest of the result has been printed to the chat screen, kindly check it out sir.",
+    "The rest of the text is now on the chat screen, sir, please check it.",
+    "You can see the rest of the text on the chat screen, sir.",
+    "The remaining part of the text is now on the chat screen, sir.",
+    "Sir, you'll find more text on the chat screen for you to see.",
+    "The rest of the answer is now on the chat screen, sir.",
+    "Sir, please look at the chat screen, the rest of the answer is there.",
+    "You'll find the complete answer on the chat screen, sir.",
+    "The next part of the text is on the chat screen, sir.",
+    "Sir, please check the chat screen for more information.",
+    "There's more text on the chat screen for you, sir.",
+    "Sir, take a look at the chat screen for additional text.",
+    "You'll find more to read on the chat screen, sir.",
+    "Sir, check the chat screen for the rest of the text.",
+    "The chat screen has the rest of the text, sir.",
+    "There's more to see on the chat screen, sir, please look.",
+    "Sir, the chat screen holds the continuation of the text.",
+    "You'll find the complete answer on the chat screen, kindly check it out sir.",
+    "Please review the chat screen for the rest of the text, sir.",
+    "Sir, look at the chat screen for the complete answer."
+]
+
+# Function to tell whether only the start of an answer is spoken (more than 4 sentences and 250 characters)
+def IsLongAnswer(Text):
+    Text = str(Text)
+    return len(Text.split(".")) > 4 and len(Text) > 250
+
 # Function to manage Text-To-Speech with additional response for long text
 def TextToSpeech(Text, func=lambda r=None: True):
-    Data = str(Text).split(".")  # Split the text by periods into a list of sentences
-
-    # List of predefined responses for cases where the text is too long 
-    responses = [
-        "The rest of the result has been printed to the chat screen, kindly check it out sir.",
-        "The rest of the text is now on the chat screen, sir, please check it.",
-        "You can see the rest of the text on the chat screen, sir.",
-        "The remaining part of the text is now on the chat screen, sir.",
-        "Sir, you'll find more text on the chat screen for you to see.",
-        "The rest of the answer is now on the chat screen, sir.",
-        "Sir, please look at the chat screen, the rest of the answer is there.",
-        "You'll find the complete answer on the chat screen, sir.",
-        "The next part of the text is on the chat screen, sir.",
-        "Sir, please check the chat screen for more information.",
-        "There's more text on the chat screen for you, sir.",
-        "Sir, take a look at the chat screen for additional text.",
-        "You'll find more to read on the chat screen, sir.",
-        "Sir, check the chat screen for the rest of the text.",
-        "The chat screen has the rest of the text, sir.",
-        "There's more to see on the chat screen, sir, please look.",
-        "Sir, the chat screen holds the continuation of the text.",
-        "You'll find the complete answer on the chat screen, kindly check it out sir.",
-        "Please review the chat screen for the rest of the text, sir.",
-        "Sir, look at the chat screen for the complete answer."
-    ]
-
-    # If the text is very long (more than 4 sentences and 250 characters), add a response message 
-    if len(Data) > 4 and len(Text) > 250:
-        TTS("".join(Text.split(".")[0:2]) + ". " + random.choice(responses), func)
-
-        # Otherwise, just play the whole text 
-    else:
-        TTS(Text, func)
+    # If the text is very long, speak its first two sentences and add a response message
+    with SpeechLock:
+        if IsLongAnswer(Text):
+            TTS("".join(Text.split(".")[0:2]) + ". " + random.choice(LongAnswerResponses), func)
+
+            # Otherwise, just play the whole text 
+        else:
+            TTS(Text, func)
+
+# Short lines (automation acknowledgments) waiting to be spoken, in order, by one background thread.
+SpeechQueue = queue.Queue()
+_speech_worker = None
+_speech_worker_lock = threading.Lock()
+
+def _speak_queued():
+    while True:
+        context, Text = SpeechQueue.get()
+        try:
+            context.run(TextToSpeech, Text)
+        except Exception as e:
+            print(f"[TTS] Could not speak '{Text}': {e}")
+
+# Function to speak a short line without waiting for it (or for an answer that is playing)
+def SpeakLater(Text):
+    global _speech_worker
+    with _speech_worker_lock:
+        if _speech_worker is None:
+            _speech_worker = threading.Thread(target=_speak_queued, name="SpeechQueue", daemon=True)
+            _speech_worker.start()
+    SpeechQueue.put((contextvars.copy_context(), Text))
+
+# Sentence boundary: end punctuation followed by whitespace, or a line break.
+SentenceBoundary = re.compile(r"(?<=[.!?])\s+|\n+")
+
+# Function to split complete sentences off the front of a streaming text buffer
+def SplitSentences(buffer):
+    parts = SentenceBoundary.split(buffer)
+    rest = parts.pop()  # The last part may still be growing.
+    return [part.strip() for part in parts if part.strip()], rest
+
+# Function to speak an answer while it is still being generated
+def StreamingTextToSpeech(Chunks, func=lambda r=None: True, on_complete=None):
+    """
+    Speak text from an iterable of streamed chunks (e.g. ChatBotStream) sentence by sentence.
+
+    Sentences are split off the stream as soon as they are complete, synthesized on a
+    background thread and played here, so the first sentence is heard while the model is
+    still writing the rest. Long answers follow the same rule as TextToSpeech: the first
+    two sentences are spoken, followed by a line pointing to the chat screen.
+
+    The stream is always consumed to the end (so the backend can save the chat log), and
+    `on_complete(full_text)` is called as soon as it is. Returns the full text.
+    """
+    player_queue = queue.Queue(maxsize=1)  # One sentence buffered ahead of playback.
+    stop_speaking = threading.Event()  # Set when playback is interrupted.
+    collected = []
+    errors = []
+
+    def synthesize(index, text):
+        # Rotate over three files: one playing, one queued, one being written.
+        file_path = app_paths.get_data_path(f"speech_stream{index % 3}.mp3")
+        asyncio.run(TextToAudioFile(text, file_path))
+        return file_path
+
+    def producer():
+        buffer = ""
+        spoken = []  # Sentences already sent to synthesis.
+        pending = []  # Sentences held back until we know the answer is short.
+        truncated = False
+        index = 0
+        try:
+            for chunk in Chunks:
+                collected.append(chunk)
+                if stop_speaking.is_set() or truncated:
+                    continue  # Keep draining so the full answer is still collected.
+
+                buffer += chunk
+                sentences, buffer = SplitSentences(buffer)
+                for sentence in sentences:
+                    if len(spoken) < 2:
+                        spoken.append(sentence)
+                        player_queue.put(synthesize(index, sentence))
+                        index += 1
+                    else:
+                        pending.append(sentence)
+
+                # Same threshold TextToSpeech applies to a finished answer.
+                if IsLongAnswer("".join(collected)):
+                    truncated = True
+                    player_queue.put(synthesize(index, random.choice(LongAnswerResponses)))
+
+            text = "".join(collected)
+            if on_complete is not None:
+                on_complete(text)
+
+            if not truncated and not stop_speaking.is_set():
+                for sentence in pending + ([buffer.strip()] if buffer.strip() else []):
+                    player_queue.put(synthesize(index, sentence))
+                    index += 1
+        except Exception as e:
+            errors.append(e)
+        finally:
+            player_queue.put(None)  # End of speech.
+
+    # Run the producer in a copy of this context so its spans belong to the current turn.
+    worker = threading.Thread(target=contextvars.copy_context().run, args=(producer,), daemon=True)
+    worker.start()
+
+    mixer_initialized = False
+    try:
+        while True:
+            file_path = player_queue.get()
+            if file_path is None:
+                break
+            if stop_speaking.is_set():
+                continue
+
+            # Hold the speaker only while this sentence plays, not while the next one is written.
+            with SpeechLock:
+                if not pygame.mixer.get_init():  # Another speaker may have closed the mixer in between.
+                    pygame.mixer.init()
+                mixer_initialized = True
+
+                pygame.mixer.music.load(file_path)
+                with Tracing.Span("tts_playback", streamed=True):
+                    pygame.mixer.music.play()
+                    Tracing.Mark("first_audio")
+                    while pygame.mixer.music.get_busy():
+                        if func() == False:  # Check if the external function returns False
+                            stop_speaking.set()
+                            pygame.mixer.music.stop()
+                            break
+                        pygame.time.Clock().tick(20)
+                pygame.mixer.music.unload()  # Release the file so it can be rewritten.
+
+    except Exception as e:
+        print(f"Error in streaming TTS: {e}")
+        stop_speaking.set()
+        # Keep draining so the producer can finish consuming the stream.
+        while player_queue.get() is not None:
+            pass
+
+    finally:
+        try:
+            with SpeechLock:
+                if mixer_initialized and pygame.mixer.get_init():
+                    pygame.mixer.music.stop()
+                    pygame.mixer.quit()
+            func(False)
+        except Exception as e:
+            if "mixer not initialized" not in str(e).lower():
+                print(f"Error in finally block: {e}")
+
+    worker.join()
+    if errors:
+        raise errors[0]
+    return "".join(collected)
 
 # Main execution loop
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+"""
+Incremental post-processing for streamed answers.
+
+ChatBot and RealtimeSearchEngine clean their final answer with
+AnswerModifier (drop blank lines) after removing the "</s>" end token.
+AnswerCleaner applies the same cleaning to a token stream as it arrives, so
+ChatBotStream / RealtimeSearchEngineStream and their async variants yield
+text whose concatenation equals the cleaned final answer:
+
+    cleaner = AnswerCleaner()
+    for token in tokens:
+        yield cleaner.feed(token)
+    yield cleaner.finish()
+
+Text is held back only while it could still change: a partial "</s>", a
+line that is blank so far, and trailing whitespace that strip=True (the
+realtime answer's .strip()) may remove.
+"""
+
+EndToken = "</s>"
+
+
+class AnswerCleaner:
+    """Streaming equivalent of AnswerModifier(answer.replace("</s>", "")), optionally stripped."""
+
+    def __init__(self, strip=False):
+        self.strip = strip
+        self.tail = ""  # Possible start of an end token split across chunks.
+        self.line_ws = ""  # Leading whitespace of a line with no content yet.
+        self.line_started = False  # The current line has content.
+        self.held_ws = ""  # Trailing whitespace of the last line with content.
+        self.emitted = False  # Any content emitted yet.
+
+    def _add(self, part, out):
+        if not part:
+            return
+        if not self.line_started:
+            rest = part.lstrip()
+            self.line_ws += part[:len(part) - len(rest)]
+            if not rest:
+                return  # Still a blank line.
+            if self.emitted:
+                out.append(self.held_ws + "\n")
+            if not (self.strip and not self.emitted):
+                out.append(self.line_ws)
+            self.held_ws = self.line_ws = ""
+            self.line_started = self.emitted = True
+            part = rest
+
+        body = part.rstrip()
+        if body:
+            out.append(self.held_ws + body)
+            self.held_ws = part[len(body):]
+        else:
+            self.held_ws += part
+
+    def _process(self, text, out):
+        for i, part in enumerate(text.split("\n")):
+            if i:
+                # A new line starts; a blank one is dropped.
+                self.line_started = False
+                self.line_ws = ""
+            self._add(part, out)
+
+    def feed(self, text):
+        """Clean the next chunk; returns the text that is safe to show (may be "")."""
+        text = (self.tail + text).replace(EndToken, "")
+        self.tail = ""
+        for size in range(min(len(EndToken) - 1, len(text)), 0, -1):
+            if EndToken.startswith(text[-size:]):
+                text, self.tail = text[:-size], text[-size:]
+                break
+        out = []
+        self._process(text, out)
+        return "".join(out)
+
+    def finish(self):
+        """Flush whatever was held back at the end of the stream."""
+        out = []
+        self._process(self.tail, out)
+        self.tail = ""
+        if not self.strip and self.emitted:
+            out.append(self.held_ws)
+        self.held_ws = ""
+        return "".join(out)
+
+
+async def CloseAsyncStream(stream):
+    """Close an async completion stream early (the caller stopped reading)."""
+    close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+    if close is not None:
+        result = close()
+        if hasattr(result, "__await__"):
+            await result
@@ -0,0 +1,182 @@
+"""
+Per-stage latency tracing for the Jarvis voice pipeline.
+
+Each turn (one spoken or API query) gets a turn id from StartTurn(). Stages
+wrap themselves in Span("name") and one-off moments such as the first
+generated token or the first audible sound are recorded with Mark("name").
+Marks store their offset from the moment the query was received (the
+"query_received" mark), falling back to the start of the turn.
+
+Spans and marks are kept in an in-memory ring buffer (TRACE_BUFFER_SIZE in
+config.py, default 5000 records). Summary() returns p50/p95/p99 per stage
+at runtime and ExportJsonl(path) appends the records not yet exported to a
+JSON lines file for offline analysis.
+
+A span around a generator also times whoever consumes it (for a streamed
+answer, the speech that plays between chunks). Such spans set
+attrs["duration_ms"] themselves from their chunk timestamps; the full wall
+time is then kept as attrs["wall_ms"].
+
+STAGES RECORDED:
+- stt, dmm, dispatch, turn            (Main.py / ApiServer)
+- groq_completion, web_search         (Chatbot, RealtimeSearchEngine)
+- learning                            (Chatbot.SaveChatTurn)
+- tts_synthesis, tts_playback         (TextToSpeech)
+- first_token, first_audio            (marks)
+"""
+
+import collections
+import contextlib
+import contextvars
+import itertools
+import json
+import threading
+import time
+import config  # Import centralized configuration
+
+BufferSize = getattr(config, "TRACE_BUFFER_SIZE", 5000)
+
+_records = collections.deque(maxlen=BufferSize)
+_lock = threading.Lock()
+_turn_ids = itertools.count(1)
+_turns = collections.OrderedDict()  # Turn id -> {"start": ..., "reference": ..., "marks": set()}
+_current_turn = contextvars.ContextVar("jarvis_turn", default=None)
+_last_turn = None  # Used by threads that did not inherit a turn context.
+_sequence = itertools.count(1)  # Record numbers, so ExportJsonl only appends new records.
+_exported = {}  # Export path -> number of the last record written to it.
+
+
+def StartTurn():
+    """Begin a new traced turn in the current context and return its id."""
+    global _last_turn
+    turn = next(_turn_ids)
+    now = time.perf_counter()
+    with _lock:
+        _turns[turn] = {"start": now, "reference": now, "marks": set()}
+        while len(_turns) > 256:
+            _turns.popitem(last=False)
+    _current_turn.set(turn)
+    _last_turn = turn
+    return turn
+
+
+def CurrentTurn():
+    return _current_turn.get() or _last_turn
+
+
+def _record(record):
+    with _lock:
+        record["seq"] = next(_sequence)
+        _records.append(record)
+
+
+@contextlib.contextmanager
+def Span(name, **attrs):
+    """
+    Time the enclosed block as stage `name`; extra attributes can be added to the yielded dict.
+    Setting "duration_ms" there replaces the measured duration (which is kept as "wall_ms").
+    """
+    started = time.perf_counter()
+    record = {"turn": CurrentTurn(), "kind": "span", "name": name, "ts": time.time(),
+              "thread": threading.current_thread().name, "attrs": attrs}
+    try:
+        yield attrs
+    except BaseException as e:
+        record["error"] = type(e).__name__
+        raise
+    finally:
+        wall = round((time.perf_counter() - started) * 1000, 3)
+        if "duration_ms" in attrs:
+            record["duration_ms"] = attrs.pop("duration_ms")
+            attrs["wall_ms"] = wall
+        else:
+            record["duration_ms"] = wall
+        _record(record)
+
+
+def Mark(name, once=True, **attrs):
+    """
+    Record a point in time for the current turn, e.g. "first_token".
+    With once=True only the first mark of that name per turn is kept.
+    """
+    turn = CurrentTurn()
+    now = time.perf_counter()
+    with _lock:
+        state = _turns.get(turn)
+        if state is not None:
+            if once and name in state["marks"]:
+                return
+            state["marks"].add(name)
+            if name == "query_received":
+                state["reference"] = now
+            offset = round((now - state["reference"]) * 1000, 3)
+        else:
+            offset = None
+        _records.append({"turn": turn, "kind": "mark", "name": name, "ts": time.time(),
+                         "thread": threading.current_thread().name, "attrs": attrs,
+                         "offset_ms": offset, "seq": next(_sequence)})
+
+
+def Records(turn=None):
+    """Return a copy of the buffered records, optionally for a single turn."""
+    with _lock:
+        records = list(_records)
+    return [r for r in records if turn is None or r["turn"] == turn]
+
+
+def ExportJsonl(path, turn=None):
+    """
+    Append the buffered records not yet exported to `path` as JSON lines; returns how many were written.
+    Only full exports (turn=None) move the "already exported" position forward.
+    """
+    since = _exported.get(path, 0)
+    records = [r for r in Records(turn) if r["seq"] > since]
+    if not records:
+        return 0
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    if turn is None:
+        _exported[path] = records[-1]["seq"]
+    return len(records)
+
+
+def Percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5 - 1e-9)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def Summary():
+    """p50/p95/p99/max in milliseconds per span (duration) and mark (offset)."""
+    values = collections.defaultdict(list)
+    for record in Records():
+        if record["name"] == "query_received":
+            continue  # The reference point itself is always 0 ms.
+        value = record.get("duration_ms") if record["kind"] == "span" else record.get("offset_ms")
+        if value is not None:
+            values[record["name"]].append(value)
+
+    return {
+        name: {
+            "count": len(v),
+            "p50": Percentile(v, 50),
+            "p95": Percentile(v, 95),
+            "p99": Percentile(v, 99),
+            "max": max(v),
+        }
+        for name, v in sorted(values.items())
+    }
+
+
+def FormatTurn(turn):
+    """One-line timing breakdown of a turn, e.g. for console logging."""
+    parts = []
+    for record in Records(turn):
+        value = record.get("duration_ms") if record["kind"] == "span" else record.get("offset_ms")
+        if value is not None:
+            parts.append(f"{record['name']}={value:.0f}ms")
+    return ", ".join(parts)
@@ -0,0 +1,195 @@
+"""
+Short spoken answers for voice mode.
+
+TextToSpeech only ever speaks the first two sentences of a long answer and
+then points to the chat screen, yet ChatBot asked for up to 512 tokens and
+RealtimeSearchEngine for 2048 before that speech could start. In voice mode
+(VOICE_SHORT_ANSWERS = True in config.py) Main.py answers general and
+realtime questions with a VoiceAnswer instead:
+
+- the prompt (chat history, and for realtime the Google search) is built
+  once and shared by two requests
+- the detailed answer, with the usual model and token limits, is generated
+  on a background thread for the chat screen only; it is shown as soon as
+  it is complete and is what gets saved to the chat log
+- a spoken summary is streamed at the same time from the small model
+  (ModelRouter intent "voice"), with a prompt asking for at most two short
+  sentences and VOICE_SUMMARY_TOKENS tokens, and goes straight to
+  StreamingTextToSpeech
+- when the detailed answer is longer than what TextToSpeech would speak,
+  the usual "the rest is on the chat screen" line follows the summary. If
+  it is still being generated when the summary ends, Spoken() waits up to
+  VOICE_DETAILED_WAIT seconds for it to finish or to grow long enough; a
+  detailed answer that is still short then gets no such line
+
+If either request fails the other one's text is used for both the screen
+and the chat log.
+
+CONFIG (config.py, optional):
+    VOICE_SUMMARY_TOKENS   token limit of the spoken summary (default 80)
+    VOICE_DETAILED_WAIT    seconds to wait for the detailed answer after the summary (default 1.5)
+"""
+
+import contextvars
+import datetime
+import random
+import threading
+import time
+import config  # Import centralized configuration
+from Backend import LLMProvider  # Shared, rate-limited Groq client
+from Backend import ModelRouter  # Latency-aware model choice per query
+from Backend import Tracing  # Per-stage latency tracing
+from Backend.Chatbot import ChatBotMessages, ChatParameters, SaveChatTurn, AnswerModifier
+from Backend.RealtimeSearchEngine import RealtimeSearchMessages, SearchParameters
+from Backend.TextToSpeech import IsLongAnswer, LongAnswerResponses
+from Backend.TokenStream import AnswerCleaner
+
+SummaryTokens = getattr(config, "VOICE_SUMMARY_TOKENS", 80)
+DetailedWait = getattr(config, "VOICE_DETAILED_WAIT", 1.5)
+
+SummaryInstruction = ("This reply will be spoken aloud. Answer in at most two short sentences (under 40 words) "
+                      "of plain spoken language: no lists, headings, markdown, links or code. "
+                      "A detailed answer is shown on the chat screen separately.")
+
+# The answer the user is waiting for: full priority on the shared Groq client.
+client = LLMProvider.Client(LLMProvider.INTERACTIVE)
+
+_stats_lock = threading.Lock()
+_stats = {"answers": 0, "summary_first_token_seconds": 0.0, "detailed_seconds": 0.0, "detailed_failed": 0}
+
+
+def GetVoiceAnswerStats():
+    """Voice answers given, and average time to the summary's first token and to the detailed answer."""
+    with _stats_lock:
+        stats = dict(_stats)
+    answers = stats["answers"] or 1
+    stats["avg_summary_first_token_seconds"] = stats["summary_first_token_seconds"] / answers
+    stats["avg_detailed_seconds"] = stats["detailed_seconds"] / answers
+    return stats
+
+
+def _record(key, value=1):
+    with _stats_lock:
+        _stats[key] += value
+
+
+def _stream(messages, model, parameters, span, strip=False):
+    """Yield a completion's text as it streams, cleaned like AnswerModifier."""
+    Cleaner = AnswerCleaner(strip=strip)
+    with Tracing.Span(span, model=model, max_tokens=parameters.get("max_tokens")) as Trace:
+        Started = LastChunk = time.perf_counter()
+        Completion = client.chat.completions.create(model=model, messages=messages, **parameters)
+        try:
+            for chunk in Completion:
+                LastChunk = time.perf_counter()  # Speech played between chunks is not generation time.
+                if chunk.choices[0].delta.content:
+                    Text = Cleaner.feed(chunk.choices[0].delta.content)
+                    if Text:
+                        yield Text
+            Text = Cleaner.finish()
+            if Text:
+                yield Text
+        finally:
+            if hasattr(Completion, "close"):
+                Completion.close()
+            Trace["duration_ms"] = round((LastChunk - Started) * 1000, 3)
+
+
+class VoiceAnswer:
+    """A spoken summary streamed first, with the detailed answer generated in parallel for the chat screen."""
+
+    def __init__(self, Query, Kind="general", OnDetailed=None):
+        self.Query = Query
+        self.Kind = Kind
+        self.OnDetailed = OnDetailed  # Called once with the text for the chat screen.
+        self.AskedAt = datetime.datetime.now().isoformat()
+        self.started = time.perf_counter()
+        self.detailed = None
+        self.partial = ""  # The detailed answer so far, while it streams.
+        self.summary = ""
+        self.shown = False
+        self._show_lock = threading.Lock()
+        self._done = threading.Event()
+        _record("answers")
+
+        # One prompt for both requests (for realtime answers that is one Google search).
+        if Kind == "realtime":
+            self.messages, _ = RealtimeSearchMessages(Query)
+            self.parameters = SearchParameters
+        else:
+            self.messages, _ = ChatBotMessages(Query)
+            self.parameters = ChatParameters
+
+        # Generate in a copy of this context so spans are attributed to the current turn.
+        self._thread = threading.Thread(target=contextvars.copy_context().run, args=(self._generate,), daemon=True)
+        self._thread.start()
+
+    def _generate(self):
+        try:
+            model, _ = ModelRouter.Route(self.Query, self.Kind)
+            for chunk in _stream(self.messages, model, self.parameters, "detailed_answer",
+                                 strip=self.Kind == "realtime"):
+                self.partial += chunk
+            text = self.partial
+            self.detailed = text
+            _record("detailed_seconds", time.perf_counter() - self.started)
+            self._show(text)
+        except Exception as e:
+            _record("detailed_failed")
+            print(f"[VOICE] Detailed answer failed, the spoken summary will be shown instead: {e}")
+        finally:
+            self._done.set()
+
+    def _show(self, text):
+        with self._show_lock:
+            if self.shown or not text or self.OnDetailed is None:
+                return
+            self.shown = True
+        self.OnDetailed(text)
+
+    def Spoken(self):
+        """Yield the spoken summary as it streams, then the chat screen line if there is more to read."""
+        model, _ = ModelRouter.Route(self.Query, "voice")
+        messages = self.messages[:-1] + [{"role": "system", "content": SummaryInstruction}] + self.messages[-1:]
+        parameters = dict(self.parameters, max_tokens=SummaryTokens)
+        first = True
+        for text in _stream(messages, model, parameters, "voice_summary", strip=True):
+            if first:
+                first = False
+                Tracing.Mark("first_token")
+                _record("summary_first_token_seconds", time.perf_counter() - self.started)
+            self.summary += text
+            yield text
+
+        if self._has_more():
+            yield "\n" + random.choice(LongAnswerResponses)
+
+    def _has_more(self):
+        """Is the detailed answer longer than what TextToSpeech would speak?"""
+        # IsLongAnswer only turns true as text grows, so a long partial answer settles it early.
+        deadline = time.monotonic() + DetailedWait
+        while not self._done.is_set() and not IsLongAnswer(self.partial):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self._done.wait(min(remaining, 0.05))
+        if self._done.is_set():
+            return bool(self.detailed) and IsLongAnswer(self.detailed)
+        return IsLongAnswer(self.partial)
+
+    def Finish(self, timeout=None):
+        """
+        Wait for the detailed answer, save the exchange and return the chat screen text.
+        Falls back to the spoken summary when the detailed answer failed.
+        """
+        self._done.wait(timeout)
+        text = self.detailed or AnswerModifier(Answer=self.summary)
+        self._show(text)
+        if text:
+            SaveChatTurn(self.Query, text, self.AskedAt)
+        return text
+
+
+def StartVoiceAnswer(Query, Kind="general", OnDetailed=None):
+    """Start the detailed answer for `Query` in the background; speak VoiceAnswer.Spoken() meanwhile."""
+    return VoiceAnswer(Query, Kind, OnDetailed)
@@ -11,15 +11,18 @@ from PyQt5.QtGui import (
 )
 from PyQt5.QtCore import (
     Qt, QSize, QTimer, QPropertyAnimation, QEasingCurve,
-    QPoint, pyqtProperty, QRect
+    QPoint, pyqtProperty, QRect, QObject, pyqtSignal
 )
 import sys
 import os
-import json
 import winreg
 import subprocess
 import config
 import app_paths  # Import for correct file paths
+from Backend import MessageBus  # In-process status/message bus
+from Backend import ChatLog  # Append-only chat log store
+from Backend import Summarizer  # Summary of older chat history
+from Backend import Settings  # Cached profile and preferences
 
 # ---------------------------------------------------------------------------
 #  Configuration
@@ -139,23 +142,19 @@ def QueryModifier(Query):
 
 
 def SetMicrophoneStatus(Command):
-    with open(os.path.join(TempDirPath, "Mic.data"), "w", encoding='utf-8') as f:
-        f.write(Command)
+    MessageBus.publish(MessageBus.MICROPHONE, Command)
 
 
 def GetMicrophoneStatus():
-    with open(os.path.join(TempDirPath, "Mic.data"), "r", encoding='utf-8') as f:
-        return f.read()
+    return MessageBus.get(MessageBus.MICROPHONE)
 
 
 def SetAssistantStatus(Status):
-    with open(os.path.join(TempDirPath, "Status.data"), "w", encoding='utf-8') as f:
-        f.write(Status)
+    MessageBus.publish(MessageBus.STATUS, Status)
 
 
 def GetAssistantStatus():
-    with open(os.path.join(TempDirPath, "Status.data"), "r", encoding='utf-8') as f:
-        return f.read()
+    return MessageBus.get(MessageBus.STATUS)
 
 
 def MicButtonInitialed():
@@ -175,8 +174,25 @@ def TempDirectoryPath(Filename):
 
 
 def ShowTextToScreen(Text):
-    with open(os.path.join(TempDirPath, "Responses.data"), "w", encoding='utf-8') as f:
-        f.write(Text)
+    MessageBus.publish(MessageBus.RESPONSES, Text)
+
+
+# ===================================================================
+#  Bus -> Qt bridge
+# ===================================================================
+class BusSignals(QObject):
+    """Re-emits MessageBus topics as Qt signals.
+
+    Publishes usually happen on Main.py's worker threads; connecting widget
+    slots to these signals makes Qt queue the update onto the GUI thread.
+    """
+    statusChanged = pyqtSignal(str)
+    responsesChanged = pyqtSignal(str)
+
+
+bus_signals = BusSignals()
+MessageBus.subscribe(MessageBus.STATUS, bus_signals.statusChanged.emit)
+MessageBus.subscribe(MessageBus.RESPONSES, bus_signals.responsesChanged.emit)
 
 
 # ===================================================================
@@ -296,18 +312,23 @@ class ChatSection(QWidget):
         """)
         root.addWidget(self.label)
 
-        # --- polling timer (100 ms instead of 5 ms) ---
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.loadMessages)
-        self.timer.timeout.connect(self.SpeechRecogText)
-        self.timer.start(100)
-
-    # -- file-based message loading --
-    def loadMessages(self):
+        # --- bus updates (file polling only in compatibility mode) ---
+        bus_signals.responsesChanged.connect(self.loadMessages)
+        bus_signals.statusChanged.connect(self.label.setText)
+        self.loadMessages()
+        self.SpeechRecogText()
+        if MessageBus.file_compat_enabled():
+            self.timer = QTimer(self)
+            self.timer.timeout.connect(self.loadMessages)
+            self.timer.timeout.connect(self.SpeechRecogText)
+            self.timer.start(100)
+
+    # -- message loading --
+    def loadMessages(self, messages=None):
         global old_chat_message
         try:
-            with open(TempDirectoryPath('Responses.data'), "r", encoding='utf-8') as f:
-                messages = f.read()
+            if messages is None:
+                messages = MessageBus.get(MessageBus.RESPONSES)
 
             if not messages or messages == old_chat_message:
                 return
@@ -339,8 +360,7 @@ class ChatSection(QWidget):
 
     def SpeechRecogText(self):
         try:
-            with open(TempDirectoryPath('Status.data'), "r", encoding='utf-8') as f:
-                self.label.setText(f.read())
+            self.label.setText(MessageBus.get(MessageBus.STATUS))
         except Exception:
             pass
 
@@ -384,9 +404,7 @@ class ChatSection(QWidget):
         
         # Load chat history
         try:
-            chatlog_path = app_paths.get_data_path("ChatLog.json")
-            with open(chatlog_path, "r", encoding="utf-8") as f:
-                history = json.load(f)
+            history = ChatLog.All()
             
             if not history:
                 no_history = QLabel("No conversation history available.")
@@ -619,10 +637,13 @@ class InitialScreen(QWidget):
         bottom_bar.addStretch()
         content.addLayout(bottom_bar)
 
-        # --- polling ---
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.SpeechRecogText)
-        self.timer.start(100)
+        # --- bus updates (file polling only in compatibility mode) ---
+        bus_signals.statusChanged.connect(self.label.setText)
+        self.SpeechRecogText()
+        if MessageBus.file_compat_enabled():
+            self.timer = QTimer(self)
+            self.timer.timeout.connect(self.SpeechRecogText)
+            self.timer.start(100)
 
         self.toggled = True
         MicButtonInitialed()
@@ -657,8 +678,7 @@ class InitialScreen(QWidget):
 
     def SpeechRecogText(self):
         try:
-            with open(TempDirectoryPath('Status.data'), "r", encoding='utf-8') as f:
-                self.label.setText(f.read())
+            self.label.setText(MessageBus.get(MessageBus.STATUS))
         except Exception:
             pass
 
@@ -696,30 +716,15 @@ class MessageScreen(QWidget):
 # ===================================================================
 #  Settings / Profile screen
 # ===================================================================
-PROFILE_PATH = app_paths.get_data_path("Profile.json")
-PREFERENCES_PATH = app_paths.get_data_path("Preferences.json")
-
+# Profile.json and Preferences.json are cached in memory and shared with the backends.
 def _load_profile():
-    try:
-        with open(PROFILE_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {"name": "", "email": "", "age": "", "gender": "", "location": "",
-                "occupation": "", "hobbies": ""}
+    return Settings.Profile.Get()
 
 def _save_profile(data):
-    with open(PROFILE_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+    Settings.Profile.Save(data)
 
 def _load_preferences():
-    try:
-        with open(PREFERENCES_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
-        return {"languages": "English", "response_style": "Balanced", 
-                "voice_response": True, "auto_start": False, 
-                "notifications": True, "search_engine": "Google",
-                "auto_delete_chat": False}
+    return Settings.Preferences.Get()
 
 def _set_windows_startup(enable):
     """Add or remove Jarvis from Windows startup using Registry."""
@@ -769,8 +774,7 @@ def _save_preferences(data):
     if "auto_start" in data:
         _set_windows_startup(data["auto_start"])
     
-    with open(PREFERENCES_PATH, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+    Settings.Preferences.Save(data)
 
 class SettingsScreen(QWidget):
 
@@ -1576,12 +1580,11 @@ class SettingsScreen(QWidget):
         QTimer.singleShot(2500, lambda: self.prefs_saved_label.setText(""))
 
     def _delete_chat_history(self):
-        """Delete all chat history from ChatLog.json and display files"""
+        """Delete all chat history from the chat log and display files"""
         try:
-            chatlog_path = app_paths.get_data_path("ChatLog.json")
-            # Write an empty list to the chat log file
-            with open(chatlog_path, "w", encoding="utf-8") as f:
-                json.dump([], f, indent=4)
+            # Empty the chat log and forget its summary
+            ChatLog.Clear()
+            Summarizer.Clear()
             
             # Clear the display files that store chat messages for the GUI
             display_files = ["Responses.data", "Database.data", "Response.data"]
@@ -1592,6 +1595,7 @@ class SettingsScreen(QWidget):
                         f.write("")
                 except Exception:
                     pass  # File might not exist, which is fine
+            ShowTextToScreen("")
             
             self.delete_status_label.setText("✓ Chat history deleted!")
             self.delete_status_label.setStyleSheet(f"""
@@ -1985,22 +1989,22 @@ class GifOnlyWindow(QWidget):
             y = (geo.height() - window_h) // 2
             self.setGeometry(x, y, window_w, window_h)
         
-        # Timer to update status from file
-        self.status_timer = QTimer()
-        self.status_timer.timeout.connect(self.update_status)
-        self.status_timer.start(500)  # Update every 500ms
+        # Status updates arrive over the bus (file polling only in compatibility mode)
+        bus_signals.statusChanged.connect(self.update_status)
+        self.update_status()
+        if MessageBus.file_compat_enabled():
+            self.status_timer = QTimer()
+            self.status_timer.timeout.connect(self.update_status)
+            self.status_timer.start(500)  # Update every 500ms
     
-    def update_status(self):
-        """Update status label from Status.data file"""
+    def update_status(self, status=None):
+        """Update status label from the bus"""
         try:
-            status_file = os.path.join(TempDirPath, "Status.data")
-            if os.path.exists(status_file):
-                with open(status_file, "r", encoding="utf-8") as f:
-                    status = f.read().strip()
-                    if status:
-                        self.status_label.setText(status)
-                    else:
-                        self.status_label.setText("Listening...")
+            if status is None:
+                status = MessageBus.get(MessageBus.STATUS)
+            status = status.strip()
+            if status:
+                self.status_label.setText(status)
             else:
                 self.status_label.setText("Listening...")
         except:
@@ -2029,6 +2033,8 @@ def GifOnlyInterface():
     
     window = GifOnlyWindow()
     window.show()
+    # Fires once the event loop has painted the window for the first time.
+    QTimer.singleShot(0, lambda: MessageBus.publish(MessageBus.LIFECYCLE, "first_frame"))
     sys.exit(app.exec_())
 
 # ===================================================================
@@ -2053,6 +2059,8 @@ def GraphicalUserIntersace():
 
     window = MainWindow()
     window.show()
+    # Fires once the event loop has painted the window for the first time.
+    QTimer.singleShot(0, lambda: MessageBus.publish(MessageBus.LIFECYCLE, "first_frame"))
     sys.exit(app.exec_())
 
 
@@ -1,5 +1,8 @@
 # ========== PARSE COMMAND-LINE ARGUMENTS FIRST ==========
 # This MUST happen before importing Frontend.GUI to prevent PyQt5 initialization
+import time
+StartupStarted = time.perf_counter()  # Reference point for time-to-first-frame / time-to-ready
+
 import argparse
 import sys
 
@@ -36,24 +39,40 @@ if not headless_mode:
         GetAssistantStatus
     )
 
-# ========== BACKEND IMPORTS (always needed) ==========
-from Backend.Model import FirstLayerDMM
-from Backend.RealtimeSearchEngine import RealtimeSearchEngine
-from Backend.Automation import Automation
-from Backend.SpeechToText import SpeechRecognition
-from Backend.Chatbot import ChatBot
-from Backend.TextToSpeech import TextToSpeech
+# ========== BACKEND IMPORTS ==========
+# Heavy backends (browser, API clients, audio, automation) are loaded on first
+# use or by the background warm-up started once the window is on screen.
+from Backend import Registry
 from Backend.AutoDeleteChat import delete_old_messages
+from Backend import ChatLog
+from Backend import Summarizer
+from Backend.Dispatcher import DispatchDecisionStream
+from Backend import MessageBus
+from Backend import Tracing
 import config
 from asyncio import run
 from time import sleep
-import subprocess
 import threading
 import datetime
 import random
-import json
 import os
-import speech_recognition as sr
+
+FirstLayerDMMStream = Registry.Lazy("model", "FirstLayerDMMStream")
+GetDecisionStats = Registry.Lazy("model", "GetDecisionStats")
+RealtimeSearchEngine = Registry.Lazy("realtime", "RealtimeSearchEngine")
+RealtimeSearchEngineStream = Registry.Lazy("realtime", "RealtimeSearchEngineStream")
+Automation = Registry.Lazy("automation", "Automation")
+SpeechRecognition = Registry.Lazy("speech", "SpeechRecognition")
+ChatBot = Registry.Lazy("chatbot", "ChatBot")
+ChatBotStream = Registry.Lazy("chatbot", "ChatBotStream")
+TextToSpeech = Registry.Lazy("tts", "TextToSpeech")
+StreamingTextToSpeech = Registry.Lazy("tts", "StreamingTextToSpeech")
+StartSpeculation = Registry.Lazy("speculation", "StartSpeculation")
+GetSpeculationStats = Registry.Lazy("speculation", "GetSpeculationStats")
+StartVoiceAnswer = Registry.Lazy("voice", "StartVoiceAnswer")
+SubmitImageJobs = Registry.Lazy("image", "SubmitImageJobs")
+FlushLearningQueue = Registry.Lazy("learning", "flush_learning_queue")
+FlushDecisionCache = Registry.Lazy("model", "FlushDecisionCache")
 
 # Global variables for interruption handling
 is_speaking = False  # Flag to track if Jarvis is currently speaking
@@ -66,8 +85,16 @@ Username = config.USERNAME
 Assistantname = config.ASSISTANT_NAME
 DefaultMessage = f'''{Username} : Hello {Assistantname}, How are you?
 {Assistantname} : Welcome {Username} : I am doing well. How may i help you?'''
-subprocesses = []
-Function = ["open", "close", "play", "system", "content", "google search", "youtube search", "skip ads"]
+# Speak answers sentence by sentence while they are generated (set STREAMING_SPEECH = False in config.py to disable)
+StreamingSpeech = getattr(config, "STREAMING_SPEECH", True)
+# Start a general-chat answer in parallel with FirstLayerDMM (set SPECULATIVE_GENERAL = True in config.py to enable)
+SpeculativeGeneral = getattr(config, "SPECULATIVE_GENERAL", False)
+# Speak a short summary while the detailed answer is written to the chat screen (set VOICE_SHORT_ANSWERS = True in config.py to enable)
+VoiceShortAnswers = getattr(config, "VOICE_SHORT_ANSWERS", False)
+# Voice mode speaks a short summary, which a speculative ChatBot answer cannot give
+SpeculativeGeneral = SpeculativeGeneral and not VoiceShortAnswers
+# Write the latency trace buffer to this JSONL file after every turn (set TRACE_EXPORT_PATH in config.py to enable)
+TraceExportPath = getattr(config, "TRACE_EXPORT_PATH", None)
 
 # ========== HEADLESS MODE UTILITY FUNCTIONS ==========
 # These provide alternatives to GUI utility functions when running without GUI
@@ -117,6 +144,7 @@ def HeadlessSetAssistantStatus(status):
     global headless_status
     headless_status = status
     print(f"[STATUS] {status}")
+    MessageBus.publish(MessageBus.STATUS, status)
 
 def HeadlessShowTextToScreen(text):
     """Show text in headless mode (console only)"""
@@ -131,6 +159,7 @@ def HeadlessSetMicrophoneStatus(status):
     """Set microphone status in headless mode"""
     global headless_mic_status
     headless_mic_status = status
+    MessageBus.publish(MessageBus.MICROPHONE, status)
 
 def HeadlessGetAssistantStatus():
     """Get assistant status in headless mode"""
@@ -192,6 +221,54 @@ def QueryModifierWrapper(Query):
 
 # ========== END HEADLESS MODE FUNCTIONS ==========
 
+# ========== MICROPHONE STATE CONTROLLER ==========
+# FirstThread sleeps on this condition while the microphone is off and is woken
+# by every MICROPHONE publish on the message bus (GUI mic button or
+# HeadlessSetMicrophoneStatus), so an idle assistant uses no CPU and no disk.
+
+MicStateChanged = threading.Condition()
+MicIdleRecheckSeconds = 5  # Safety net for Mic.data edited outside the app (file compat mode)
+
+def NotifyMicrophoneStatusChanged(status=None):
+    """Wake the controller thread after a microphone status change"""
+    with MicStateChanged:
+        MicStateChanged.notify_all()
+
+def WaitForMicrophone(timeout=None):
+    """Block until the microphone is switched on; returns True if it is on"""
+    with MicStateChanged:
+        return MicStateChanged.wait_for(lambda: GetMicrophoneStatusWrapper() == "True", timeout=timeout)
+
+MessageBus.subscribe(MessageBus.MICROPHONE, NotifyMicrophoneStatusChanged)
+
+# ========== STARTUP TIMING ==========
+# Time-to-first-frame: process start until the GUI has painted its window.
+# Time-to-ready: process start until every backend has been loaded.
+
+StartupTimes = {}
+WarmUpStarted = threading.Event()
+
+def StartBackendWarmUp():
+      """Load all backends in the background (once)"""
+      if not WarmUpStarted.is_set():
+            WarmUpStarted.set()
+            Registry.WarmUp(on_done=BackendsReady)
+
+def BackendsReady(LoadTimes):
+      StartupTimes["time_to_ready"] = time.perf_counter() - StartupStarted
+      Loads = ", ".join(f"{Name} {Seconds:.2f}s" for Name, Seconds in LoadTimes.items())
+      print(f"[STARTUP] Ready after {StartupTimes['time_to_ready']:.2f}s ({Loads})")
+      MessageBus.publish(MessageBus.LIFECYCLE, "ready")
+      Summarizer.StartIdleWorker()  # Compact old chat history whenever the assistant is idle
+
+def OnLifecycle(Event):
+      if Event == "first_frame" and "time_to_first_frame" not in StartupTimes:
+            StartupTimes["time_to_first_frame"] = time.perf_counter() - StartupStarted
+            print(f"[STARTUP] First frame after {StartupTimes['time_to_first_frame']:.2f}s")
+            StartBackendWarmUp()
+
+MessageBus.subscribe(MessageBus.LIFECYCLE, OnLifecycle)
+
 def GetRandomGreeting():
     """Generate a random greeting based on time of day."""
     current_time = datetime.datetime.now()
@@ -250,48 +327,20 @@ def GetRandomGreeting():
     return random.choice(all_greetings)
 
 def ShowDefaultChatIfNoChats():
-      chatlog_path = r'Data\ChatLog.json'
-      
-      # Ensure the file exists before trying to read it
-      if not os.path.exists(chatlog_path):
-            print(f"[INFO] ChatLog.json not found, creating it...")
-            with open(chatlog_path, 'w', encoding='utf-8') as f:
-                  json.dump([], f)
-      
       try:
-            File = open(chatlog_path, "r", encoding='utf-8')
-            chat_content = File.read()
-            File.close()
-            
-            if len(chat_content)<5:
+            if ChatLog.Count() == 0:
                   with open(TempDirectoryPathWrapper('Database.data'), "w", encoding='utf-8') as file:
                         file.write("")
 
-                  with open(TempDirectoryPathWrapper('Responses.data'), 'w', encoding='utf-8') as file:
-                        file.write("")  # Keep it empty instead of showing default message
+                  ShowTextToScreenWrapper("")  # Keep it empty instead of showing default message
       except Exception as e:
             print(f"[ERROR] Error in ShowDefaultChatIfNoChats: {e}")
 
 def ReadChatLogJson():
-      chatlog_path = r'Data\ChatLog.json'
       try:
-            # Ensure file exists before reading
-            if not os.path.exists(chatlog_path):
-                  print(f"[INFO] ChatLog.json not found, creating empty log...")
-                  with open(chatlog_path, 'w', encoding='utf-8') as f:
-                        json.dump([], f)
-                  return []
-            
-            with open(chatlog_path, 'r', encoding='utf-8') as file:
-                  chatlog_data = json.load(file)
-            return chatlog_data
-      except json.JSONDecodeError:
-            print(f"[WARNING] ChatLog.json is corrupted, resetting...")
-            with open(chatlog_path, 'w', encoding='utf-8') as f:
-                  json.dump([], f)
-            return []
+            return ChatLog.All()  # Corrupted lines are skipped by the store
       except Exception as e:
-            print(f"[ERROR] Error reading ChatLog.json: {e}")
+            print(f"[ERROR] Error reading the chat log: {e}")
             return []
 
 def ChatLogIntegration():
@@ -318,10 +367,8 @@ def ShowChatsOnGUI():
       if len(str(Data))>0:
             lines = Data.split("\n")
             result = '\n'.join(lines)
-            File.close()
-            File = open(TempDirectoryPathWrapper('Responses.data'), "w", encoding='utf-8')
-            File.write(result)
-            File.close()
+            ShowTextToScreenWrapper(result)
+      File.close()
 
 def InitialExecution():
       SetMicrophoneStatusWrapper("False")
@@ -332,12 +379,6 @@ def InitialExecution():
             ShowDefaultChatIfNoChats()
             ChatLogIntegration()
             ShowChatsOnGUI()
-      else:
-            # In headless mode, just ensure chat log exists
-            chatlog_path = r'Data\ChatLog.json'
-            if not os.path.exists(chatlog_path):
-                  with open(chatlog_path, 'w') as f:
-                        json.dump([], f)
 
 InitialExecution()
 
@@ -369,6 +410,7 @@ def WakeWordMonitor():
     If detected while Jarvis is speaking, sets interruption flag.
     """
     global should_interrupt, is_speaking
+    import speech_recognition as sr  # Only needed by the monitor thread
     
     recognizer = sr.Recognizer()
     microphone = sr.Microphone()
@@ -408,129 +450,222 @@ def WakeWordMonitor():
                 print(f"[WARNING] Wake word monitor error: {e}")
             sleep(0.1)
 
-def MainExecution():
+def RespondWith(Responder, StreamResponder, Query):
+      """Answer Query, show it on screen and speak it; streams speech when StreamingSpeech is on."""
+      global is_speaking
 
-      global is_speaking, should_interrupt, current_query, task_paused
+      if StreamingSpeech:
+            SetAssistantStatusWrapper("Answering... ")
+            is_speaking = True
+            Parts = []  # Chunks the answer stream has produced so far
+            Shown = []
 
-      TaskExecution = False
-      ImageExecution = False
-      ImageGenerationQuery = ""
+            def Tracked(Chunks):
+                  for Chunk in Chunks:
+                        Parts.append(Chunk)
+                        yield Chunk
 
-      SetAssistantStatusWrapper("Listening... ")
-      Query = SpeechRecognition()
-      current_query = Query  # Store current query
-      ShowTextToScreenWrapper(f"{Username} : {Query}")
-      SetAssistantStatusWrapper("Thinking... ")
-      Decision = FirstLayerDMM(Query)
+            def ShowAnswer(Text):
+                  Shown.append(Text)
+                  ShowTextToScreenWrapper(f"{Assistantname} : {AnswerModifierWrapper(Text.strip())}")
 
-      print("")
-      print(f"Decision : {Decision}")
-      print("")
+            Stream = None
+            try:
+                  Stream = StreamResponder(Query)
+                  Answer = StreamingTextToSpeech(Tracked(Stream), tts_check_interrupt, on_complete=ShowAnswer)
+                  return AnswerModifierWrapper(Answer.strip())
+            except Exception as e:
+                  if not Parts:
+                        print(f"[WARNING] Streaming answer failed, retrying without streaming: {e}")
+                  else:
+                        # Part of the answer is already out: never ask the model again, just finish showing it.
+                        print(f"[WARNING] Speaking the answer failed, showing it instead: {e}")
+                        try:
+                              for Chunk in Stream:  # Drain the stream so the backend saves the exchange
+                                    Parts.append(Chunk)
+                        except Exception as e:
+                              print(f"[WARNING] Answer stream failed: {e}")
+                        if not Shown:
+                              ShowAnswer("".join(Parts))
+                        return AnswerModifierWrapper("".join(Parts).strip())
+            finally:
+                  is_speaking = False
 
-      G = any([i for i in Decision if i.startswith("general")])
-      R = any([i for i in Decision if i.startswith("realtime")])
+      Answer = Responder(Query)
+      ShowTextToScreenWrapper(f"{Assistantname} : {Answer}")
+      SetAssistantStatusWrapper("Answering... ")
+      is_speaking = True
+      TextToSpeech(Answer, tts_check_interrupt)
+      is_speaking = False
+      return Answer
 
-      Mearged_query = " and ".join(
-            [" ".join(i.split()[1:]) for i in Decision if i.startswith("general") or i.startswith("realtime")]
-      )
+def RespondByVoice(Kind, Responder, StreamResponder, Query):
+      """Speak a short summary of the answer while the detailed answer is generated for the chat screen."""
+      global is_speaking
 
-      for queries in Decision:
-            if "generate " in queries:
-                  ImageGenerationQuery = str(queries)
-                  ImageExecution = True
+      try:
+            Answer = StartVoiceAnswer(Query, Kind, OnDetailed=lambda Text: ShowTextToScreenWrapper(f"{Assistantname} : {AnswerModifierWrapper(Text)}"))
+      except Exception as e:
+            print(f"[WARNING] Voice answer failed, answering normally: {e}")
+            return RespondWith(Responder, StreamResponder, Query)
 
-      for queries in Decision:
-            if TaskExecution == False:
-                  if any(queries.startswith(func) for func in Function):
-                        print(f"[DEBUG] Executing automation with commands: {Decision}")
-                        run(Automation(list(Decision)))
-                        TaskExecution = True
-                        print("[DEBUG] Automation completed")
+      SetAssistantStatusWrapper("Answering... ")
+      is_speaking = True
+      try:
+            StreamingTextToSpeech(Answer.Spoken(), tts_check_interrupt)
+      except Exception as e:
+            print(f"[WARNING] Spoken summary failed, speaking the detailed answer: {e}")
+            Text = Answer.Finish()
+            if not Text:
+                  return RespondWith(Responder, StreamResponder, Query)
+            TextToSpeech(Text, tts_check_interrupt)
+            return Text
+      finally:
+            is_speaking = False
+      return Answer.Finish()
 
-      if ImageExecution == True:
+def AnswerGeneral(Query):
+      SetAssistantStatusWrapper("Thinking... ")
+      if VoiceShortAnswers:
+            return RespondByVoice("general", ChatBot, ChatBotStream, QueryModifierWrapper(Query))
+      return RespondWith(ChatBot, ChatBotStream, QueryModifierWrapper(Query))
 
-            with open(r"Frontend\Files\ImageGeneration.data", "w") as file:
-                  file.write(f"{ImageGenerationQuery},True")
+def AnswerSpeculation(Speculation):
+      SetAssistantStatusWrapper("Thinking... ")
+      return RespondWith(Speculation.Answer, Speculation.Stream, None)
+
+def AnswerRealtime(Query):
+      SetAssistantStatusWrapper("Searching... ")
+      if VoiceShortAnswers:
+            return RespondByVoice("realtime", RealtimeSearchEngine, RealtimeSearchEngineStream, QueryModifierWrapper(Query))
+      return RespondWith(RealtimeSearchEngine, RealtimeSearchEngineStream, QueryModifierWrapper(Query))
+
+def RunAutomation(Commands):
+      print(f"[DEBUG] Executing automation with commands: {Commands}")
+      run(Automation(list(Commands)))  # Runs on its own event loop in this worker thread
+      print("[DEBUG] Automation completed")
+      return True
+
+def QueueImageGeneration(Prompts):
+      Jobs = SubmitImageJobs(Prompts)  # Returns at once; the worker reports progress on the bus
+      return [Job.id for Job in Jobs]
+
+def ReportImageJob(Job):
+      Images = f" ({len(Job['images'])} images)" if Job["images"] else ""
+      Error = f": {Job['error']}" if Job["error"] else ""
+      print(f"[IMAGE] Job {Job['id']} '{Job['prompt']}' {Job['status']}{Images}{Error}")
+
+MessageBus.subscribe(MessageBus.IMAGE_JOBS, ReportImageJob)
+
+def ExitAssistant(_):
+      RespondWith(ChatBot, ChatBotStream, QueryModifierWrapper("Okay, Bye!"))
+      SetAssistantStatusWrapper("Answering... ")
+      FlushLearningQueue(10)  # Learn from queued turns now; anything left is kept for the next start
+      FlushDecisionCache()
+      os._exit(1)
+
+# Handler for each intent kind produced by Backend.Dispatcher.GroupDecision
+IntentHandlers = {
+      "general": AnswerGeneral,
+      "realtime": AnswerRealtime,
+      "automation": RunAutomation,
+      "image": QueueImageGeneration,
+      "exit": ExitAssistant,
+}
 
-            try:
-                  p1 = subprocess.Popen(['python', r'Backend\ImageGeneration.py'],
-                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE,
-                                    stdin=subprocess.PIPE, shell=False)
-                  subprocesses.append(p1)
+def MainExecution():
 
-            except Exception as e:
-                  print(f"Error starting ImageGeneration.py: {e}")
+      Turn = Tracing.StartTurn()
+      try:
+            with Tracing.Span("turn"):
+                  return RunTurn()
+      finally:
+            print(f"[TRACE] turn {Turn}: {Tracing.FormatTurn(Turn)}")
+            if TraceExportPath:
+                  try:
+                        Tracing.ExportJsonl(TraceExportPath)
+                  except OSError as e:
+                        print(f"[WARNING] Could not export trace: {e}")
+
+def RunTurn():
+
+      global is_speaking, should_interrupt, current_query, task_paused
+
+      SetAssistantStatusWrapper("Listening... ")
+      with Tracing.Span("stt"):
+            Query = SpeechRecognition()
+      Tracing.Mark("query_received")
+      current_query = Query  # Store current query
+      ShowTextToScreenWrapper(f"{Username} : {Query}")
+      SetAssistantStatusWrapper("Thinking... ")
+      Speculation = None
+      Decision = []
+
+      # Speculate only on queries the fast path, cache and local model could not decide
+      def Speculate():
+            nonlocal Speculation
+            Speculation = StartSpeculation(QueryModifierWrapper(Query))
+
+      # Commands start as soon as FirstLayerDMM has produced them
+      def DecisionTasks():
+            with Tracing.Span("dmm") as DecisionTrace:
+                  for Task in FirstLayerDMMStream(Query, on_remote=Speculate if SpeculativeGeneral else None):
+                        Tracing.Mark("first_task")
+                        yield Task
+                  DecisionTrace["source"] = GetDecisionStats()["last_source"]
+
+      def OnDecision(Tasks):
+            Decision.extend(Tasks)
+            DecisionStats = GetDecisionStats()
+            print("")
+            print(f"Decision : {Decision}")
+            print(f"[DMM] {DecisionStats['last_source']} (confidence {DecisionStats['last_confidence']}), "
+                  f"{DecisionStats['avoided_calls']}/{DecisionStats['calls']} Cohere calls avoided")
+            print("")
+
+            # Use the speculative answer if the query turned out to be a single general question
+            Handlers = IntentHandlers
+            if Speculation is not None:
+                  if Speculation.Matches(Decision):
+                        Handlers = dict(IntentHandlers, general=lambda _: AnswerSpeculation(Speculation))
+                  else:
+                        Speculation.Cancel()
+                  Stats = GetSpeculationStats()
+                  print(f"[SPECULATION] hit rate {Stats['hit_rate']:.0%} ({Stats['committed']}/{Stats['committed'] + Stats['cancelled']}), "
+                        f"avg head start {Stats['avg_head_start_seconds']:.2f}s")
+            return Handlers
+
+      # Run every intent of the decision concurrently
+      Started = datetime.datetime.now()
+      with Tracing.Span("dispatch"):
+            Results = run(DispatchDecisionStream(DecisionTasks(), IntentHandlers, OnDecision=OnDecision))
+      for Result in Results:
+            print(f"[DISPATCH] {Result.kind}: {'ok' if Result.ok else Result.error} in {Result.elapsed:.2f}s")
+      if Results:
+            print(f"[DISPATCH] Decision completed in {(datetime.datetime.now() - Started).total_seconds():.2f}s")
+
+      Kinds = {Result.kind for Result in Results}
 
-      # Handle realtime search queries
-      if G and R or R:
-            SetAssistantStatusWrapper("Searching... ")
-            Answer = RealtimeSearchEngine(QueryModifierWrapper(Mearged_query))
-            ShowTextToScreenWrapper(f"{Assistantname} : {Answer}")
-            SetAssistantStatusWrapper("Answering... ")
-            is_speaking = True
-            TextToSpeech(Answer, tts_check_interrupt)
-            is_speaking = False
-            return True
-      
-      # If automation tasks were executed, provide confirmation
-      if TaskExecution:
-            Answer = "Done."
-            ShowTextToScreenWrapper(f"{Assistantname} : {Answer}")
-            SetAssistantStatusWrapper("Task Completed")
-            is_speaking = True
-            TextToSpeech(Answer, tts_check_interrupt)
-            is_speaking = False
-            return True
-      
-      # Handle general queries and other commands
-      ResponseGiven = False
-      for Queries in Decision:
-
-            if "general" in Queries:
-                  SetAssistantStatusWrapper("Thinking... ")
-                  QueryFinal = Queries.replace("general ", "")
-                  Answer = ChatBot(QueryModifierWrapper(QueryFinal))
-                  ShowTextToScreenWrapper(f"{Assistantname} : {Answer}")
-                  SetAssistantStatusWrapper("Answering... ")
-                  is_speaking = True
-                  TextToSpeech(Answer, tts_check_interrupt)
-                  is_speaking = False
-                  ResponseGiven = True
-                  return True
-
-            elif "realtime" in Queries:
-                  SetAssistantStatusWrapper("Searching... ")
-                  QueryFinal = Queries.replace("realtime ", "")
-                  Answer = RealtimeSearchEngine(QueryModifierWrapper(QueryFinal))
-                  ShowTextToScreenWrapper(f"{Assistantname} : {Answer}")
-                  SetAssistantStatusWrapper("Answering... ")
-                  is_speaking = True
-                  TextToSpeech(Answer, tts_check_interrupt)
-                  is_speaking = False
-                  ResponseGiven = True
-                  return True
-            
-            elif "exit" in Queries:
-                  QueryFinal = "Okay, Bye!"
-                  Answer = ChatBot(QueryModifierWrapper(QueryFinal))
-                  ShowTextToScreenWrapper(f"{Assistantname} : {Answer}")
-                  SetAssistantStatusWrapper("Answering... ")
-                  is_speaking = True
-                  TextToSpeech(Answer, tts_check_interrupt)
-                  is_speaking = False
-                  SetAssistantStatusWrapper("Answering... ")
-                  os._exit(1)
-      
       # If Decision was empty or no valid action was found
-      if not ResponseGiven:
+      if not Kinds:
             print(f"Warning: No valid action found for Decision: {Decision}")
-            Answer = ChatBot(Query)
+            RespondWith(ChatBot, ChatBotStream, Query)
+            return True
+
+      # If only automation or image tasks were executed, provide confirmation
+      if Kinds & {"automation", "image"} and not Kinds & {"general", "realtime"}:
+            Parts = ["Done."] if "automation" in Kinds else []
+            Prompts = [Prompt for Result in Results if Result.kind == "image" for Prompt in Result.payload]
+            if Prompts:
+                  Parts.append(f"Ok sir, generating images of {' and '.join(Prompts)}. They will open when ready.")
+            Answer = " ".join(Parts)
             ShowTextToScreenWrapper(f"{Assistantname} : {Answer}")
-            SetAssistantStatusWrapper("Answering... ")
+            SetAssistantStatusWrapper("Task Completed")
             is_speaking = True
             TextToSpeech(Answer, tts_check_interrupt)
             is_speaking = False
-            return True
+
+      return True
 
 def FirstThread():
     global is_speaking, should_interrupt, task_paused
@@ -552,13 +687,10 @@ def FirstThread():
             MainExecution()
 
         else:
-            AIStatus = GetAssistantStatusWrapper()
-
-            if "Available ... " in AIStatus:
-                sleep(0.05)
-
-            else:
-                 SetAssistantStatusWrapper("Available... ")
+            # Publish the idle status once, then sleep until the mic is switched on.
+            if GetAssistantStatusWrapper() != "Available... ":
+                SetAssistantStatusWrapper("Available... ")
+            WaitForMicrophone(timeout=MicIdleRecheckSeconds)
 
 def SecondThread():
     """Start GUI - either full GUI or GIF-only based on mode"""
@@ -582,6 +714,7 @@ if __name__ == "__main__":
          # Initialize without GUI
          HeadlessSetMicrophoneStatus("True")  # Enable mic by default in headless mode
          InitialExecution()
+         StartBackendWarmUp()  # No window to wait for
          
          # Start the main thread
          thread2 = threading.Thread(target=FirstThread, daemon=False)  # Non-daemon to keep process alive
@@ -604,6 +737,7 @@ if __name__ == "__main__":
              thread2.join()
          except KeyboardInterrupt:
              print("\n[INFO] Shutting down Jarvis...")
+             FlushDecisionCache()
              os._exit(0)
      
      elif gif_only_mode:
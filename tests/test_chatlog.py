@@ -0,0 +1,180 @@
+"""
+Repair paths of Backend.ChatLog.ChatLogStore: torn last lines, stale or
+foreign offset indexes and the one-time ChatLog.json import.
+
+Every test works on its own temporary directory. app_paths is swapped for a
+temporary one while Backend.ChatLog is imported, so the module-level store
+never touches the real Data folder.
+
+USAGE:
+    python -m unittest discover -s tests
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import types
+import unittest
+from array import array
+
+_import_dir = tempfile.mkdtemp(prefix="jarvis-chatlog-")
+_paths = types.ModuleType("app_paths")
+_paths.get_data_path = lambda name: os.path.join(_import_dir, name)
+_saved_paths = sys.modules.get("app_paths")
+sys.modules["app_paths"] = _paths
+try:
+    from Backend.ChatLog import ChatLogStore
+finally:
+    if _saved_paths is not None:
+        sys.modules["app_paths"] = _saved_paths
+    else:
+        del sys.modules["app_paths"]
+
+
+def tearDownModule():
+    shutil.rmtree(_import_dir, ignore_errors=True)
+
+
+def _messages(count, start=0):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": f"message {i}"}
+            for i in range(start, start + count)]
+
+
+class ChatLogStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp(prefix="jarvis-chatlog-")
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+        self.log = os.path.join(self.dir, "ChatLog.jsonl")
+        self.index = os.path.join(self.dir, "ChatLog.idx")
+        self.legacy = os.path.join(self.dir, "ChatLog.json")
+
+    def store(self):
+        return ChatLogStore(self.log, self.index, self.legacy)
+
+    def offsets(self):
+        offsets = array("Q")
+        with open(self.index, "rb") as f:
+            offsets.frombytes(f.read())
+        return list(offsets)
+
+    def line_starts(self):
+        starts, position = [], 0
+        with open(self.log, "rb") as f:
+            for line in f:
+                starts.append(position)
+                position += len(line)
+        return starts
+
+    # ------------------------------------------------------------ torn lines
+
+    def test_torn_last_line_is_ignored(self):
+        self.store().Append(_messages(3))
+        with open(self.log, "ab") as f:
+            f.write(b'{"role": "user", "cont')
+
+        store = self.store()
+        self.assertEqual(store.Count(), 3)
+        self.assertEqual(store.All(), _messages(3))
+        self.assertEqual(store.Tail(1), _messages(1, 2))
+
+    def test_append_overwrites_torn_last_line(self):
+        self.store().Append(_messages(2))
+        with open(self.log, "ab") as f:
+            f.write(b'{"role": "assistant", "content": "half a mess')
+
+        store = self.store()
+        store.Append(_messages(2, 2))
+        self.assertEqual(store.All(), _messages(4))
+        with open(self.log, "rb") as f:
+            self.assertNotIn(b"half a mess", f.read())
+        self.assertEqual(self.offsets(), self.line_starts())
+
+    # ------------------------------------------------------------ stale index
+
+    def test_missing_index_is_rebuilt(self):
+        self.store().Append(_messages(5))
+        os.remove(self.index)
+
+        store = self.store()
+        self.assertEqual(store.Count(), 5)
+        self.assertEqual(store.Read(1, 3), _messages(2, 1))
+        self.assertEqual(self.offsets(), self.line_starts())
+
+    def test_index_behind_the_log_is_caught_up(self):
+        self.store().Append(_messages(2))
+        with open(self.log, "ab") as f:  # Lines written without updating the index.
+            for message in _messages(3, 2):
+                f.write((json.dumps(message) + "\n").encode("utf-8"))
+
+        store = self.store()
+        self.assertEqual(store.Count(), 5)
+        self.assertEqual(store.Tail(2), _messages(2, 3))
+        self.assertEqual(self.offsets(), self.line_starts())
+
+    def test_index_past_the_end_of_the_log_is_trimmed(self):
+        self.store().Append(_messages(4))
+        with open(self.log, "rb") as f:
+            lines = f.readlines()
+        with open(self.log, "wb") as f:  # The log lost its last two lines, the index did not.
+            f.writelines(lines[:2])
+
+        store = self.store()
+        self.assertEqual(store.All(), _messages(2))
+        self.assertEqual(self.offsets(), self.line_starts())
+
+    def test_index_of_another_log_is_rebuilt(self):
+        self.store().Append(_messages(3))
+        with open(self.index, "wb") as f:  # Offsets that point into the middle of lines.
+            array("Q", [0, 5, 17]).tofile(f)
+
+        store = self.store()
+        self.assertEqual(store.All(), _messages(3))
+        self.assertEqual(self.offsets(), self.line_starts())
+
+    def test_change_by_another_writer_is_seen(self):
+        store = self.store()
+        store.Append(_messages(2))
+        self.store().Append(_messages(2, 2))
+
+        self.assertEqual(store.Count(), 4)
+        self.assertEqual(store.Tail(1), _messages(1, 3))
+
+    # ------------------------------------------------------------ migration
+
+    def test_legacy_log_is_imported_once(self):
+        with open(self.legacy, "w", encoding="utf-8") as f:
+            json.dump(_messages(4), f, indent=4)
+
+        store = self.store()
+        self.assertEqual(store.All(), _messages(4))
+        self.assertFalse(os.path.exists(self.legacy))
+        self.assertTrue(os.path.exists(self.legacy + ".migrated"))
+        self.assertEqual(self.offsets(), self.line_starts())
+
+        store.Append(_messages(1, 4))
+        with open(self.legacy, "w", encoding="utf-8") as f:  # A stale copy must not be imported again.
+            json.dump(_messages(2, 10), f)
+        self.assertEqual(self.store().All(), _messages(5))
+
+    def test_empty_legacy_log_is_imported(self):
+        with open(self.legacy, "w", encoding="utf-8") as f:
+            f.write("")
+
+        store = self.store()
+        self.assertEqual(store.Count(), 0)
+        self.assertTrue(os.path.exists(self.legacy + ".migrated"))
+
+    def test_unreadable_legacy_log_is_left_alone(self):
+        with open(self.legacy, "w", encoding="utf-8") as f:
+            f.write('[{"role": "user", "content": "Hi"')
+
+        store = self.store()
+        self.assertEqual(store.Count(), 0)
+        self.assertTrue(os.path.exists(self.legacy))
+
+
+if __name__ == "__main__":
+    unittest.main()
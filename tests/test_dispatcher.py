@@ -0,0 +1,189 @@
+"""
+Backend.Dispatcher: how a decision is grouped into intents, per-intent
+timeouts and failures, exit running last, and the order streamed
+automation commands run in.
+
+Handlers are small blocking functions that record what they were given.
+config is swapped for an empty module while Backend.Dispatcher is imported,
+so the default timeouts apply.
+
+USAGE:
+    python -m unittest discover -s tests
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import types
+import unittest
+
+_saved_config = sys.modules.get("config")
+sys.modules["config"] = types.ModuleType("config")
+try:
+    from Backend.Dispatcher import DispatchDecision, DispatchDecisionStream, GroupDecision, Intent
+finally:
+    if _saved_config is not None:
+        sys.modules["config"] = _saved_config
+    else:
+        del sys.modules["config"]
+
+
+class Recorder:
+    """Blocking handlers that log (kind, payload, "start"/"end") events in order."""
+
+    def __init__(self):
+        self.events = []
+        self.lock = threading.Lock()
+
+    def log(self, *event):
+        with self.lock:
+            self.events.append(event)
+
+    def handler(self, kind, seconds=0.0, error=None):
+        def handle(payload):
+            self.log(kind, payload, "start")
+            time.sleep(seconds)
+            self.log(kind, payload, "end")
+            if error is not None:
+                raise error
+            return kind
+        return handle
+
+
+def _results(results):
+    return {result.kind: result for result in results}
+
+
+class GroupDecisionTest(unittest.TestCase):
+
+    def test_tasks_are_grouped_by_intent(self):
+        intents = GroupDecision(["exit", "open chrome", "general tell me about gandhi", "generate image lion",
+                                 "play afsanay", "generate image a red car"])
+        self.assertEqual(intents, [
+            Intent("general", "tell me about gandhi"),
+            Intent("automation", ["open chrome", "play afsanay"]),
+            Intent("image", ["lion", "a red car"]),
+            Intent("exit", None),
+        ])
+
+    def test_realtime_absorbs_general_questions(self):
+        intents = GroupDecision(["general how are you", "realtime who won the match"])
+        self.assertEqual(intents, [Intent("realtime", "how are you and who won the match")])
+
+    def test_unknown_tasks_are_dropped(self):
+        self.assertEqual(GroupDecision(["reminder 9pm call mom", "something else"]), [])
+
+
+class DispatchDecisionTest(unittest.TestCase):
+
+    def test_intents_run_concurrently_and_exit_last(self):
+        recorder = Recorder()
+        handlers = {"general": recorder.handler("general", 0.2), "image": recorder.handler("image", 0.2),
+                    "exit": recorder.handler("exit")}
+
+        started = time.perf_counter()
+        results = asyncio.run(DispatchDecision(["exit", "general hi", "generate image lion"], handlers))
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual([result.kind for result in results], ["general", "image", "exit"])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(recorder.events[-2:], [("exit", None, "start"), ("exit", None, "end")])
+
+    def test_timeout_and_failure_do_not_cancel_siblings(self):
+        recorder = Recorder()
+        handlers = {"general": recorder.handler("general", 0.05),
+                    "automation": recorder.handler("automation", error=RuntimeError("no such app")),
+                    "image": recorder.handler("image", 0.5)}
+
+        results = _results(asyncio.run(DispatchDecision(["general hi", "open nothing", "generate image lion"],
+                                                        handlers, Timeouts={"image": 0.1})))
+
+        self.assertTrue(results["general"].ok)
+        self.assertEqual(results["general"].value, "general")
+        self.assertEqual((results["automation"].ok, results["automation"].error), (False, "no such app"))
+        self.assertEqual((results["image"].ok, results["image"].error), (False, "timeout"))
+        self.assertLess(results["image"].elapsed, 0.3)
+
+    def test_intents_without_a_handler_are_skipped(self):
+        recorder = Recorder()
+        results = asyncio.run(DispatchDecision(["general hi", "open chrome"], {"general": recorder.handler("general")}))
+        self.assertEqual([result.kind for result in results], ["general"])
+
+
+class DispatchDecisionStreamTest(unittest.TestCase):
+
+    def test_commands_start_before_the_decision_is_complete(self):
+        recorder = Recorder()
+        first_started = threading.Event()
+        started_early = []
+
+        def automation(payload):
+            first_started.set()
+            return recorder.handler("automation")(payload)
+
+        def decision():
+            yield "open chrome"
+            # Cohere is still writing: the first command must already be running.
+            started_early.append(first_started.wait(2))
+            yield "general tell me a joke"
+
+        results = asyncio.run(DispatchDecisionStream(decision(), {"automation": automation,
+                                                                  "general": recorder.handler("general")}))
+        self.assertEqual(started_early, [True])
+        self.assertEqual([result.kind for result in results], ["automation", "general"])
+        self.assertTrue(all(result.ok for result in results))
+
+    def test_commands_run_one_after_another_in_decision_order(self):
+        recorder = Recorder()
+        durations = {"close notepad": 0.15, "open notepad": 0.0, "play afsanay": 0.05}
+
+        def automation(payload):
+            return recorder.handler("automation", durations[payload[0]])(payload)
+
+        asyncio.run(DispatchDecisionStream(iter(durations), {"automation": automation}))
+        self.assertEqual(recorder.events, [
+            ("automation", ["close notepad"], "start"), ("automation", ["close notepad"], "end"),
+            ("automation", ["open notepad"], "start"), ("automation", ["open notepad"], "end"),
+            ("automation", ["play afsanay"], "start"), ("automation", ["play afsanay"], "end"),
+        ])
+
+    def test_timeout_starts_when_the_previous_command_finished(self):
+        recorder = Recorder()
+        results = asyncio.run(DispatchDecisionStream(iter(["open chrome", "open firefox"]),
+                                                     {"automation": recorder.handler("automation", 0.15)},
+                                                     Timeouts={"automation": 0.25}))
+        self.assertEqual([result.ok for result in results], [True, True])
+
+    def test_on_decision_sees_every_task_and_may_replace_handlers(self):
+        recorder = Recorder()
+        seen = []
+
+        def on_decision(decision):
+            seen.append(decision)
+            return {"general": recorder.handler("speculated"), "image": recorder.handler("image")}
+
+        results = asyncio.run(DispatchDecisionStream(iter(["generate image lion", "general hi"]),
+                                                     {"general": recorder.handler("general"),
+                                                      "image": recorder.handler("image")},
+                                                     OnDecision=on_decision))
+        self.assertEqual(seen, [["generate image lion", "general hi"]])
+        self.assertEqual(_results(results)["general"].value, "speculated")
+
+    def test_tasks_received_before_a_stream_failure_still_run(self):
+        recorder = Recorder()
+
+        def decision():
+            yield "open chrome"
+            yield "exit"
+            raise ConnectionError("stream reset")
+
+        results = asyncio.run(DispatchDecisionStream(decision(), {"automation": recorder.handler("automation"),
+                                                                  "exit": recorder.handler("exit")}))
+        self.assertEqual([result.kind for result in results], ["automation", "exit"])
+        self.assertEqual(recorder.events[-1], ("exit", None, "end"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Scoring of Backend.FastIntent.ClassifyFast: fixed phrases, known apps and
+when a "play" command is certain enough to skip Cohere.
+
+config is swapped for an empty module while Backend.FastIntent is imported,
+so every setting keeps its default.
+
+USAGE:
+    python -m unittest discover -s tests
+"""
+
+import sys
+import types
+import unittest
+
+_saved_config = sys.modules.get("config")
+sys.modules["config"] = types.ModuleType("config")
+try:
+    from Backend.FastIntent import ClassifyFast, FreeArgumentConfidence
+finally:
+    if _saved_config is not None:
+        sys.modules["config"] = _saved_config
+    else:
+        del sys.modules["config"]
+
+
+class ClassifyFastTest(unittest.TestCase):
+
+    def assertDecision(self, query, tasks, confidence):
+        decision = ClassifyFast(query)
+        self.assertEqual(decision.tasks, tasks, query)
+        self.assertEqual(decision.confidence, confidence, query)
+
+    # ------------------------------------------------------------ commands
+
+    def test_fixed_phrases_are_certain(self):
+        self.assertDecision("Jarvis, mute the volume please.", ["system mute"], 1.0)
+        self.assertDecision("shut down my pc", ["system shutdown"], 1.0)
+
+    def test_known_app_beats_free_argument(self):
+        self.assertDecision("open chrome", ["open chrome"], 0.95)
+        self.assertDecision("quit smoking", ["close smoking"], FreeArgumentConfidence)
+
+    def test_every_clause_must_match(self):
+        self.assertDecision("open chrome and tell me a joke", [], 0.0)
+        self.assertDecision("what is the weather today", [], 0.0)
+
+    # ------------------------------------------------------------ play
+
+    def test_marked_titles_are_certain(self):
+        self.assertDecision("play afsanay by ys", ["play afsanay by ys"], 0.95)
+        self.assertDecision("play the song let her go", ["play the song let her go"], 0.95)
+        self.assertDecision("play despacito on youtube", ["play despacito"], 0.95)
+        self.assertDecision("open chrome and play rock and roll by led zeppelin",
+                            ["open chrome", "play rock and roll by led zeppelin"], 0.95)
+
+    def test_free_text_is_left_to_cohere(self):
+        for query in ["play let her go", "play something relaxing", "play the next one",
+                      "play something by queen", "play it again on youtube"]:
+            self.assertDecision(query, [query.removesuffix(" on youtube")], FreeArgumentConfidence)
+
+    def test_vague_arguments_do_not_match(self):
+        self.assertDecision("play music", [], 0.0)
+        self.assertDecision("play a game with me", [], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+"""
+Backend.Resilience: error classification, circuit breaker states, and the
+retries, failover and half-open probes of ResilientExecutor.
+
+Requests are plain functions that fail or answer on cue; backoff is turned
+off so retries run at once. config is swapped for an empty module while
+Backend.Resilience is imported, so every other setting keeps its default.
+
+USAGE:
+    python -m unittest discover -s tests
+"""
+
+import sys
+import time
+import types
+import unittest
+from unittest import mock
+
+_saved_config = sys.modules.get("config")
+sys.modules["config"] = types.ModuleType("config")
+try:
+    from Backend import Resilience
+    from Backend.Resilience import PROBE, CircuitBreaker, Classify, LLMUnavailable, Prime, ResilientExecutor
+finally:
+    if _saved_config is not None:
+        sys.modules["config"] = _saved_config
+    else:
+        del sys.modules["config"]
+
+PRIMARY = "llama-3.1-8b-instant"
+FALLBACK = "llama-3.3-70b-versatile"
+
+
+class StatusError(Exception):
+    """An API error carrying an HTTP status, like the groq client's."""
+
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+class APIConnectionError(Exception):
+    pass
+
+
+class Model:
+    """A request function that plays back scripted outcomes per model (an exception or an answer)."""
+
+    def __init__(self, **outcomes):
+        self.outcomes = {PRIMARY: list(outcomes.get("primary", [])), FALLBACK: list(outcomes.get("fallback", []))}
+        self.calls = []
+
+    def __call__(self, model, **kwargs):
+        self.calls.append(model)
+        outcome = self.outcomes[model].pop(0) if self.outcomes[model] else f"answer from {model}"
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+class ClassifyTest(unittest.TestCase):
+
+    def test_statuses(self):
+        self.assertEqual(Classify(StatusError(401)), "fatal")
+        self.assertEqual(Classify(StatusError(429)), "retry")
+        self.assertEqual(Classify(StatusError(503)), "retry")
+        self.assertEqual(Classify(StatusError(404)), "failover")
+
+    def test_exception_types(self):
+        self.assertEqual(Classify(ConnectionError("reset")), "retry")
+        self.assertEqual(Classify(APIConnectionError("reset")), "retry")
+        self.assertEqual(Classify(KeyError("choices")), "fatal")
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+
+    def open_breaker(self):
+        self.breaker.failure()
+        self.breaker.failure()
+
+    def test_opens_after_failures_in_a_row(self):
+        self.breaker.failure()
+        self.breaker.success()
+        self.breaker.failure()
+        self.assertEqual(self.breaker.state(), "closed")
+        self.assertIs(self.breaker.allow(), True)
+
+        self.breaker.failure()
+        self.assertEqual(self.breaker.state(), "open")
+        self.assertIs(self.breaker.allow(), False)
+
+    def test_one_probe_after_the_cooldown(self):
+        self.open_breaker()
+        time.sleep(0.06)
+        self.assertIs(self.breaker.allow(), PROBE)
+        self.assertEqual(self.breaker.state(), "half-open")
+        self.assertIs(self.breaker.allow(), False)
+
+        self.breaker.success()
+        self.assertEqual(self.breaker.state(), "closed")
+        self.assertIs(self.breaker.allow(), True)
+
+    def test_failed_probe_reopens(self):
+        self.open_breaker()
+        time.sleep(0.06)
+        self.assertIs(self.breaker.allow(), PROBE)
+        self.breaker.failure()
+        self.assertEqual(self.breaker.state(), "open")
+        self.assertIs(self.breaker.allow(), False)
+        self.assertEqual(self.breaker.opened, 2)
+
+    def test_released_probe_lets_the_next_request_probe(self):
+        self.open_breaker()
+        time.sleep(0.06)
+        self.assertIs(self.breaker.allow(), PROBE)
+        self.breaker.release()
+        self.assertEqual(self.breaker.state(), "open")
+        self.assertIs(self.breaker.allow(), PROBE)
+
+
+class ResilientExecutorTest(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch.object(Resilience, "BackoffBase", 0.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.executor = ResilientExecutor(retries=2, attempt_timeout=5, deadline=10,
+                                          fallbacks={PRIMARY: [FALLBACK], FALLBACK: [PRIMARY]})
+
+    def call(self, model):
+        return self.executor.Call(model, model=PRIMARY)
+
+    def open_primary(self):
+        breaker = self.executor.Breaker(PRIMARY)
+        breaker.cooldown = 0.05
+        for _ in range(breaker.threshold):
+            breaker.failure()
+
+    def test_transient_error_is_retried_on_the_same_model(self):
+        model = Model(primary=[StatusError(429)])
+        self.assertEqual(self.call(model), f"answer from {PRIMARY}")
+        self.assertEqual(model.calls, [PRIMARY, PRIMARY])
+        self.assertEqual(self.executor.counts["retries"], 1)
+        self.assertEqual(self.executor.Breaker(PRIMARY).state(), "closed")
+
+    def test_retries_are_bounded_then_fail_over(self):
+        model = Model(primary=[StatusError(503)] * 3)
+        self.assertEqual(self.call(model), f"answer from {FALLBACK}")
+        self.assertEqual(model.calls, [PRIMARY] * 3 + [FALLBACK])
+        self.assertEqual(self.executor.counts["served_by_fallback"], 1)
+        self.assertEqual(self.executor.Breaker(PRIMARY).state(), "open")
+
+    def test_model_error_fails_over_at_once(self):
+        model = Model(primary=[StatusError(404)])
+        self.assertEqual(self.call(model), f"answer from {FALLBACK}")
+        self.assertEqual(model.calls, [PRIMARY, FALLBACK])
+
+    def test_fatal_error_is_raised_without_retry(self):
+        model = Model(primary=[StatusError(401)])
+        with self.assertRaises(StatusError):
+            self.call(model)
+        self.assertEqual(model.calls, [PRIMARY])
+
+    def test_unavailable_when_every_model_failed(self):
+        model = Model(primary=[StatusError(404)], fallback=[StatusError(404)])
+        with self.assertRaises(LLMUnavailable):
+            self.call(model)
+        self.assertEqual(self.executor.counts["unavailable"], 1)
+
+    def test_open_breaker_skips_the_model(self):
+        self.open_primary()
+        model = Model()
+        self.assertEqual(self.call(model), f"answer from {FALLBACK}")
+        self.assertEqual(model.calls, [FALLBACK])
+        self.assertEqual(self.executor.counts["short_circuited"], 1)
+
+    def test_successful_probe_closes_the_breaker(self):
+        self.open_primary()
+        time.sleep(0.06)
+        model = Model()
+        self.assertEqual(self.call(model), f"answer from {PRIMARY}")
+        self.assertEqual(self.executor.Breaker(PRIMARY).state(), "closed")
+
+    def test_probe_failing_with_any_error_reopens_the_breaker(self):
+        self.open_primary()
+        time.sleep(0.06)
+        model = Model(primary=[StatusError(404)])
+        self.assertEqual(self.call(model), f"answer from {FALLBACK}")
+        self.assertEqual(self.executor.Breaker(PRIMARY).state(), "open")
+
+        time.sleep(0.06)
+        with self.assertRaises(StatusError):
+            self.call(Model(primary=[StatusError(401)]))
+        breaker = self.executor.Breaker(PRIMARY)
+        self.assertEqual(breaker.state(), "open")
+        self.assertIs(breaker.allow(), False)
+
+    def test_abandoned_probe_is_released(self):
+        self.open_primary()
+        time.sleep(0.06)
+        with self.assertRaises(KeyboardInterrupt):
+            self.call(Model(primary=[KeyboardInterrupt()]))
+        self.assertIs(self.executor.Breaker(PRIMARY).allow(), PROBE)
+
+    def test_stream_failing_before_the_first_chunk_is_retried(self):
+        streams = [StatusError(503), ["Hello", " there"]]
+
+        def send(model, **kwargs):
+            outcome = streams.pop(0)
+
+            def chunks():
+                if isinstance(outcome, Exception):
+                    raise outcome
+                yield from outcome
+            return Prime(chunks())
+
+        self.assertEqual("".join(self.executor.Call(send, model=PRIMARY)), "Hello there")
+        self.assertEqual(self.executor.counts["retries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()